@@ -0,0 +1,134 @@
+"""
+Micro-benchmarks for the parts of a release that grow with the size of a repo.
+
+Each benchmark runs over generated trees of 1,000, 10,000, and 100,000 files.
+Requires `pytest-benchmark`. Run with:
+
+    pytest benchmarks/bench_micro.py --benchmark-autosave
+
+and compare against the last saved run with:
+
+    pytest benchmarks/bench_micro.py --benchmark-autosave --benchmark-compare
+
+Set `RELEASER_BENCH_SIZES` (e.g. to "1000,10000") to limit the tree sizes.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+sys.path.insert(0, str(HERE.parent))
+
+import synthetic  # noqa: E402
+from invoke import Config, Context  # noqa: E402
+
+from minchin.releaser.make_release import sort_imports  # noqa: E402
+from minchin.releaser.util import check_configuration, check_existence  # noqa: E402
+from minchin.releaser.vendorize import (  # noqa: E402
+    copytree,
+    merge_requirements,
+    read_requirements,
+)
+
+SIZES = [
+    int(size)
+    for size in os.environ.get("RELEASER_BENCH_SIZES", "1000,10000,100000").split(",")
+]
+
+
+def rounds(size):
+    """Run the biggest trees fewer times, so the suite finishes."""
+    return max(1, 10000 // size)
+
+
+@contextlib.contextmanager
+def quiet():
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+@pytest.fixture(scope="session", params=SIZES, ids=lambda size: "{}files".format(size))
+def tree(request, tmp_path_factory):
+    """A tree of Python files; shared by all the benchmarks of the same size."""
+    size = request.param
+    root = tmp_path_factory.mktemp("tree-{}".format(size))
+    synthetic.make_tree(root / "src", size)
+    return size, root / "src"
+
+
+def test_copytree(benchmark, tree, tmp_path):
+    size, src = tree
+    counter = iter(range(1000))
+
+    def setup():
+        dst = tmp_path / "dst-{}".format(next(counter))
+        dst.mkdir()
+        return (str(src), str(dst)), {"overwrite": True, "ignore_list": ["__pycache__"]}
+
+    benchmark.pedantic(copytree, setup=setup, rounds=rounds(size))
+
+
+def test_copytree_overwrite(benchmark, tree, tmp_path):
+    """Copying over an existing copy, as happens on every re-vendorize."""
+    size, src = tree
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    copytree(str(src), str(dst))
+    benchmark.pedantic(copytree, args=(str(src), str(dst), True), rounds=rounds(size))
+
+
+def test_read_requirements(benchmark, tree, tmp_path):
+    size, src = tree
+    requirements = synthetic.make_requirements(tmp_path / "requirements.in", size)
+    result = benchmark(read_requirements, str(requirements))
+    assert len(result) == size
+
+
+def test_merge_requirements(benchmark, tree, tmp_path):
+    size, src = tree
+    requirements = read_requirements(
+        str(synthetic.make_requirements(tmp_path / "requirements.in", size))
+    )
+    # as if every package had been vendorized from several upstreams
+    requirements = requirements * 3
+    vendored = tuple("package-{:05}".format(i) for i in range(0, size, 10))
+    result = benchmark(merge_requirements, requirements, vendored)
+    assert len(result) < size
+
+
+def test_sort_imports(benchmark, tree, tmp_path):
+    size, src = tree
+    dst = tmp_path / "isort"
+    shutil.copytree(str(src), str(dst))
+    with quiet():
+        sort_imports(str(dst))  # first pass actually changes files
+    with quiet():
+        benchmark.pedantic(sort_imports, args=(str(dst), None), rounds=1)
+
+
+def test_check_existence(benchmark, tree):
+    size, src = tree
+    paths = [str(p) for p in src.iterdir()]
+
+    def check_all():
+        for path in paths:
+            check_existence(path, "path", relative_to=src.parent)
+
+    with quiet():
+        benchmark(check_all)
+
+
+def test_check_configuration(benchmark, tree):
+    size, src = tree
+    keys = ["key_{}".format(i) for i in range(size)]
+    ctx = Context(Config(overrides={"releaser": {key: "value" for key in keys}}))
+    benchmark(check_configuration, ctx, "releaser", keys)
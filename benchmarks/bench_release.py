@@ -0,0 +1,292 @@
+"""
+Benchmark `make_release`, end to end, against a local package index.
+
+A synthetic project is generated, and then released (repeatedly) with the
+"test PyPI" server pointed at a package index running on localhost. Nothing
+touches the network, except (once) to download the wheels of `setuptools`
+and `wheel` that the local index needs to serve. Pass `--seed-dir` to use
+wheels you already have.
+
+Timings for each stage of the release are reported, and can be saved as JSON
+to compare between commits.
+
+Usage:
+
+    python benchmarks/bench_release.py --modules 200 --vendored 2 --extra-deps 3
+
+Requires `twine`, `wheel`, and `setuptools` (and optionally `pypiserver`)
+to be installed alongside `minchin.releaser`.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.request import urlopen
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+sys.path.insert(0, str(HERE.parent))
+
+import synthetic  # noqa: E402
+from invoke import Config, Context  # noqa: E402
+
+from minchin.releaser.make_release import release  # noqa: E402
+from minchin.releaser.test.fake_index import FakeIndex  # noqa: E402
+from minchin.releaser.timing import StageTimer  # noqa: E402
+
+
+class PypiServer:
+    """Run `pypiserver` on localhost, with the same interface as `FakeIndex`."""
+
+    def __init__(self, packages_dir):
+        self.packages_dir = Path(packages_dir)
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        self._process = None
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:{}".format(self.port)
+
+    @property
+    def upload_url(self):
+        return self.url + "/"
+
+    @property
+    def simple_url(self):
+        return self.url + "/simple/"
+
+    def start(self):
+        self._process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "pypiserver",
+                "run",
+                "-i",
+                "127.0.0.1",
+                "-p",
+                str(self.port),
+                "-a",
+                ".",
+                "-P",
+                ".",
+                str(self.packages_dir),
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                urlopen(self.simple_url, timeout=1)
+                return self
+            except OSError:
+                time.sleep(0.1)
+        raise RuntimeError("pypiserver didn't start")
+
+    def stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait()
+
+
+def seed_wheels(seed_dir):
+    """Make sure we have wheels for `setuptools` and `wheel` to serve."""
+    seed_dir = Path(seed_dir)
+    seed_dir.mkdir(parents=True, exist_ok=True)
+    if not list(seed_dir.glob("*.whl")):
+        print("Downloading seed wheels to {} (one time only)".format(seed_dir))
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "pip",
+                "download",
+                "--only-binary",
+                ":all:",
+                "--dest",
+                str(seed_dir),
+                "setuptools",
+                "wheel",
+            ],
+            check=True,
+        )
+    return list(seed_dir.glob("*.whl"))
+
+
+def run(args):
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="releaser-bench-"))
+    project_dir = workdir / "project"
+    packages_dir = workdir / "index"
+    packages_dir.mkdir(parents=True, exist_ok=True)
+
+    # the index serves the seed wheels and our extra dependencies
+    for wheel in seed_wheels(args.seed_dir):
+        shutil.copy2(str(wheel), str(packages_dir))
+    extra_deps = ["synthetic-dep-{:03}".format(i) for i in range(args.extra_deps)]
+    for dep in extra_deps:
+        synthetic.build_wheel(
+            synthetic.make_dependency(workdir / "deps", dep), packages_dir
+        )
+
+    config = synthetic.make_project(
+        project_dir,
+        modules=args.modules,
+        vendored=args.vendored,
+        vendored_modules=args.vendored_modules,
+        extra_deps=extra_deps,
+    )
+
+    if args.index == "pypiserver":
+        index = PypiServer(packages_dir)
+    else:
+        index = FakeIndex(packages_dir)
+    index.start()
+
+    config["servers"] = {
+        "testpypi": {"upload_url": index.upload_url, "download_url": index.simple_url}
+    }
+    config["policy"] = {"interactive": False}
+    config["remote_verify"] = args.remote_verify
+    config["reproducible"] = args.reproducible
+    config["installer"] = args.installer
+    config["pythons"] = args.pythons
+    os.environ.update(
+        {
+            "PIP_INDEX_URL": index.simple_url,
+            "PIP_DISABLE_PIP_VERSION_CHECK": "1",
+            "TWINE_USERNAME": "benchmark",
+            "TWINE_PASSWORD": "benchmark",
+            "TWINE_NON_INTERACTIVE": "1",
+        }
+    )
+
+    runs = []
+    old_cwd = os.getcwd()
+    try:
+        os.chdir(str(project_dir))
+        for i in range(args.repeat):
+            print("--- Run {} of {} ---".format(i + 1, args.repeat))
+            timer = StageTimer()
+            ctx = Context(Config(overrides={"releaser": config}))
+            status = "ok"
+            try:
+                release(ctx, yes=True, skip_pypi=True, timer=timer)
+            except SystemExit as e:
+                if e.code not in [None, 0]:
+                    status = "exit {}".format(e.code)
+            finally:
+                timer.stop()
+            synthetic.commit_all(project_dir, "Release run {}".format(i + 1))
+            runs.append({"status": status, "stages": timer.timings})
+    finally:
+        os.chdir(old_cwd)
+        index.stop()
+        if not args.keep and not args.workdir:
+            shutil.rmtree(str(workdir), ignore_errors=True)
+
+    return runs
+
+
+def summarize(runs):
+    stage_times = {}
+    for run_ in runs:
+        for name, seconds in run_["stages"]:
+            stage_times.setdefault(name, []).append(seconds)
+    return {
+        name: {
+            "mean": statistics.mean(times),
+            "min": min(times),
+            "max": max(times),
+            "runs": len(times),
+        }
+        for name, times in stage_times.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", type=int, default=20)
+    parser.add_argument("--vendored", type=int, default=1)
+    parser.add_argument("--vendored-modules", type=int, default=10)
+    parser.add_argument("--extra-deps", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--index", choices=["builtin", "pypiserver"], default="builtin")
+    parser.add_argument(
+        "--remote-verify",
+        choices=["install", "hash"],
+        default="install",
+        help="how to check uploaded files (releaser.remote_verify)",
+    )
+    parser.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="build reproducibly (releaser.reproducible)",
+    )
+    parser.add_argument(
+        "--installer",
+        choices=["auto", "uv", "virtualenv", "pip"],
+        default="auto",
+        help="how to create test environments (releaser.installer)",
+    )
+    parser.add_argument(
+        "--pythons",
+        nargs="+",
+        help="Python interpreters to test installs on (releaser.pythons)",
+    )
+    parser.add_argument(
+        "--seed-dir",
+        default=str(HERE / ".seed"),
+        help="folder of setuptools and wheel wheels for the local index",
+    )
+    parser.add_argument("--workdir", help="where to create the project")
+    parser.add_argument("--keep", action="store_true", help="keep the workdir")
+    parser.add_argument("--output", help="save results to this JSON file")
+    args = parser.parse_args()
+
+    runs = run(args)
+    summary = summarize(runs)
+
+    print()
+    print("Stage timings (seconds), over {} run(s):".format(len(runs)))
+    width = max([len(name) for name in summary] + [5])
+    print(
+        "{: <{}}  {: >8}  {: >8}  {: >8}".format("Stage", width, "mean", "min", "max")
+    )
+    for name, stats in summary.items():
+        print(
+            "{: <{}}  {: >8.2f}  {: >8.2f}  {: >8.2f}".format(
+                name, width, stats["mean"], stats["min"], stats["max"]
+            )
+        )
+    failed = [run_["status"] for run_ in runs if run_["status"] != "ok"]
+    if failed:
+        print("Failed runs: {}".format(", ".join(failed)))
+
+    if args.output:
+        Path(args.output).write_text(
+            json.dumps(
+                {
+                    "parameters": vars(args),
+                    "python": sys.version,
+                    "runs": runs,
+                    "summary": summary,
+                },
+                indent=2,
+            )
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""
+Generate synthetic Python projects (and file trees) to benchmark against.
+"""
+
+import json
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+MODULE_TEMPLATE = '''\
+import sys
+import os
+from pathlib import Path
+import re, json
+from collections import OrderedDict
+
+
+def function_{n}(value):
+    """Return something, slowly."""
+    data = OrderedDict(value=value, path=str(Path(os.sep)))
+    return json.dumps(data) + re.escape(sys.platform)
+'''
+
+SETUP_TEMPLATE = """\
+import re
+
+import setuptools
+
+VERSION = re.search(
+    r'^__version__ = "([^"]*)"',
+    open("{module}/__init__.py").read(),
+    re.M,
+).group(1)
+
+setuptools.setup(
+    name="{name}",
+    version=VERSION,
+    description="A synthetic package, for benchmarking.",
+    long_description=open("readme.rst").read(),
+    long_description_content_type="text/x-rst",
+    packages=setuptools.find_packages(exclude=("tests", "vendor_src")),
+    install_requires={install_requires!r},
+)
+"""
+
+
+def write(path, content):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def make_tree(root, n_files, per_dir=100, suffix=".py"):
+    """
+    Create a tree of `n_files` small files under `root`.
+
+    Files are spread `per_dir` to a directory, and directories are nested so
+    no directory holds more than `per_dir` entries.
+    """
+    root = Path(root)
+    for i in range(n_files):
+        parts = []
+        j = i // per_dir
+        while j:
+            parts.append("d{:03}".format(j % per_dir))
+            j //= per_dir
+        directory = root.joinpath(*reversed(parts))
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / "m{:06}{}".format(i, suffix)).write_text(
+            MODULE_TEMPLATE.format(n=i)
+        )
+    return root
+
+
+def make_requirements(path, n, comment_every=5):
+    """Write a requirements file with `n` requirements, and some comments."""
+    lines = ["# synthetic requirements", ""]
+    for i in range(n):
+        line = "package-{:05} >= 1.{}".format(i, i % 10)
+        if i % comment_every == 0:
+            line += "  # via something"
+        lines.append(line)
+    write(path, "\n".join(lines) + "\n")
+    return path
+
+
+def make_dependency(root, name, version="1.0.0"):
+    """Create a tiny, installable, dependency package."""
+    root = Path(root) / name
+    module = name.replace("-", "_")
+    write(root / module / "__init__.py", '__version__ = "{}"\n'.format(version))
+    write(root / "readme.rst", "{}\n{}\n".format(name, "=" * len(name)))
+    write(root / "MANIFEST.in", "include *.rst\n")
+    write(
+        root / "setup.py",
+        SETUP_TEMPLATE.format(name=name, module=module, install_requires=[]),
+    )
+    return root
+
+
+def build_wheel(project_dir, dest_dir):
+    """Build a wheel of `project_dir` into `dest_dir`, without touching the network."""
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "pip",
+            "wheel",
+            "--no-deps",
+            "--no-build-isolation",
+            "--wheel-dir",
+            str(dest_dir),
+            str(project_dir),
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+
+def make_project(
+    root,
+    name="synthetic_pkg",
+    modules=10,
+    vendored=0,
+    vendored_modules=10,
+    extra_deps=(),
+    version="0.1.0",
+):
+    """
+    Create a synthetic project, ready to be released by `make_release`.
+
+    Args:
+        root (Path): where to create the project. Vendored packages are
+            created next to it, in `<root>-upstream`.
+        name (str): the module (and PyPI) name.
+        modules (int): the number of modules in the package.
+        vendored (int): the number of packages to vendorize.
+        vendored_modules (int): the number of modules in each vendored
+            package.
+        extra_deps (list): names of packages the project requires.
+        version (str): the starting version.
+
+    Returns
+    -------
+        dict: the `releaser` configuration for the project (also written to
+        `invoke.json`).
+
+    """
+    root = Path(root)
+    upstream = root.parent / (root.name + "-upstream")
+
+    write(
+        root / "readme.rst", "{}\n{}\n\nA synthetic package.\n".format(name, "=" * 20)
+    )
+    write(root / "changelog.rst", "Changelog\n=========\n\n")
+    write(root / "MANIFEST.in", "include *.rst\n")
+    write(
+        root / "setup.py",
+        SETUP_TEMPLATE.format(
+            name=name, module=name, install_requires=list(extra_deps)
+        ),
+    )
+    write(root / name / "__init__.py", '__version__ = "{}"\n'.format(version))
+    for i in range(modules):
+        write(root / name / "module_{:05}.py".format(i), MODULE_TEMPLATE.format(n=i))
+    write(
+        root / "tests" / "test_basic.py",
+        textwrap.dedent("""\
+            import unittest
+
+            import {name}
+
+
+            class TestBasic(unittest.TestCase):
+                def test_version(self):
+                    self.assertIsNotNone({name}.__version__)
+            """).format(name=name),
+    )
+    write(root / "vendor_src" / "__init__.py", "")
+    write(root / ".gitignore", "env/\ndist/\nbuild/\n*.egg-info/\n__pycache__/\n")
+
+    vendor_packages = {}
+    for i in range(vendored):
+        vendor_name = "vendored_{:03}".format(i)
+        src = upstream / vendor_name
+        write(src / vendor_name / "__init__.py", "")
+        for j in range(vendored_modules):
+            write(
+                src / vendor_name / "module_{:05}.py".format(j),
+                MODULE_TEMPLATE.format(n=j),
+            )
+        make_requirements(src / "requirements.in", 5)
+        vendor_packages[vendor_name] = {"src": str(src), "dest": "."}
+
+    config = {
+        "module_name": name,
+        "here": ".",
+        "docs": "None",
+        "test": "tests",
+        "source": name,
+        "changelog": "changelog.rst",
+        "version": "{}/__init__.py".format(name),
+        "test_command": "{} -m unittest discover -s tests -q".format(sys.executable),
+        "version_bump": "patch",
+        "extra_packages": {"test": ["setuptools", "wheel"]},
+    }
+    if vendor_packages:
+        config.update(
+            {
+                "vendor_dest": "{}/_vendor".format(name),
+                "vendor_packages": vendor_packages,
+                "vendor_override_src": "vendor_src",
+            }
+        )
+    write(root / "invoke.json", json.dumps({"releaser": config}, indent=2))
+
+    subprocess.run(["git", "init", "-q"], cwd=str(root), check=True)
+    commit_all(root, "Initial commit")
+    return config
+
+
+def commit_all(root, message):
+    """Commit everything in the synthetic project."""
+    env_args = [
+        "-c",
+        "user.name=Benchmark",
+        "-c",
+        "user.email=benchmark@example.com",
+    ]
+    subprocess.run(["git", "add", "-A"], cwd=str(root), check=True)
+    subprocess.run(
+        ["git"] + env_args + ["commit", "-q", "--allow-empty", "-m", message],
+        cwd=str(root),
+        check=True,
+    )
@@ -12,6 +12,7 @@ from .constants import (
 
 try:
     from .make_release import make_release
+    from .monorepo import make_releases
 except ImportError:
     pass
 from .vendorize import vendorize
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .vcs import tracked_files
+
+CHUNK_SIZE = 1024 * 1024
+
+# lockfiles to include when deciding if anything has changed, if
+# `releaser.lockfile` isn't set
+LOCKFILES = [
+    "requirements.txt",
+    "poetry.lock",
+    "Pipfile.lock",
+    "pdm.lock",
+    "uv.lock",
+]
+
+
+def cache_dir(ctx):
+    """
+    Return the folder we keep our cache in, creating it if needed.
+
+    This is `releaser.cache_dir` if set, or `.releaser_cache` in the base
+    directory otherwise. The folder ignores itself for git.
+    """
+    if "cache_dir" in ctx.releaser and ctx.releaser.cache_dir is not None:
+        my_dir = Path(ctx.releaser.cache_dir).resolve()
+    else:
+        my_dir = Path(ctx.releaser.here).resolve() / ".releaser_cache"
+    if not my_dir.exists():
+        my_dir.mkdir(parents=True)
+        (my_dir / ".gitignore").write_text("# created by minchin.releaser\n*\n")
+    return my_dir
+
+
+def load_cache(ctx, name):
+    """Load the named cache. An unreadable cache is an empty one."""
+    try:
+        return json.loads((cache_dir(ctx) / "{}.json".format(name)).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(ctx, name, data):
+    """Save the named cache (atomically, so a crash can't leave it half written)."""
+    write_atomic(cache_dir(ctx) / "{}.json".format(name), json.dumps(data, indent=2))
+
+
+def write_atomic(path, content, encoding="utf-8"):
+    """Write `content` to `path` via a temporary file, so it's never half written."""
+    path = Path(path)
+    fd, temp_name = tempfile.mkstemp(dir=str(path.parent), prefix="~" + path.name)
+    try:
+        with os.fdopen(fd, mode="w", encoding=encoding, newline="") as f:
+            f.write(content)
+        os.replace(temp_name, str(path))
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+
+
+def replace_with(path, write):
+    """
+    Call `write` with the name of a temporary file, then move it over `path`.
+
+    The new file keeps the permissions of the one it replaces.
+    """
+    path = Path(path)
+    fd, temp_name = tempfile.mkstemp(dir=str(path.parent), prefix="~" + path.name)
+    os.close(fd)
+    try:
+        write(temp_name)
+        if path.exists():
+            shutil.copymode(str(path), temp_name)
+        os.replace(temp_name, str(path))
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+
+
+def now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def file_sha256(path):
+    """Hash a file, reading it once in chunks."""
+    digest = hashlib.sha256()
+    with open(str(path), mode="rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def tree_digest(directories, git_state=None, exclude=()):
+    """
+    Hash the (tracked) files in `directories`.
+
+    In a git repo, this uses the hashes git already has for every file, so
+    only files with uncommitted changes are read. Outside of git, every file
+    is read, except those in `exclude` (e.g. build output).
+
+    Directories given as None are skipped.
+    """
+    directories = [Path(d).resolve() for d in directories if d is not None]
+    exclude = [Path(d).resolve() for d in exclude if d is not None]
+    digest = hashlib.sha256()
+    if git_state is not None:
+        files = tracked_files(git_state, directories)
+        dirty = set(git_state["dirty_paths"])
+        for path in sorted(files):
+            file_hash = files[path]
+            if path in dirty:
+                full_path = git_state["root"] / path
+                file_hash = file_sha256(full_path) if full_path.exists() else "deleted"
+            digest.update("{} {}\n".format(path, file_hash).encode("utf-8"))
+    else:
+        for directory in directories:
+            if not directory.exists():
+                continue
+            for path in sorted(p for p in directory.glob("**/*") if p.is_file()):
+                if "__pycache__" in path.parts or any(
+                    excluded in path.parents for excluded in exclude
+                ):
+                    continue
+                digest.update(
+                    "{} {}\n".format(path.as_posix(), file_sha256(path)).encode("utf-8")
+                )
+    return digest.hexdigest()
+
+
+def _in_here(ctx, *directories):
+    """Resolve `directories` (which may be None) relative to `releaser.here`."""
+    here = Path(ctx.releaser.here).resolve()
+    return [here / d if d is not None else None for d in directories]
+
+
+def lockfiles(ctx):
+    """Return the lockfiles of the project."""
+    here = Path(ctx.releaser.here).resolve()
+    if "lockfile" in ctx.releaser and ctx.releaser.lockfile is not None:
+        names = ctx.releaser.lockfile
+        if isinstance(names, str):
+            names = [names]
+    else:
+        names = LOCKFILES
+    return [here / name for name in names if (here / name).exists()]
+
+
+def test_cache_key(ctx, git_state=None):
+    """
+    Determine the key for a test run.
+
+    The key changes if the tracked source or test files change, if a
+    lockfile changes, or if the test command changes.
+    """
+    digest = hashlib.sha256()
+    digest.update(str(ctx.releaser.test_command).encode("utf-8"))
+    digest.update(
+        tree_digest(
+            _in_here(ctx, ctx.releaser.source, ctx.releaser.test),
+            git_state,
+            exclude=[cache_dir(ctx)],
+        ).encode("utf-8")
+    )
+    for lockfile in lockfiles(ctx):
+        digest.update("{} {}\n".format(lockfile.name, file_sha256(lockfile)).encode())
+    return digest.hexdigest()
+
+
+def passed_tests(ctx, key):
+    """Return the record of a successful test run with `key`, or None."""
+    return load_cache(ctx, "tests").get(key, None)
+
+
+def record_passed_tests(ctx, key, duration, keep=20):
+    """Remember a successful test run. Only the latest `keep` runs are kept."""
+    cache = load_cache(ctx, "tests")
+    cache[key] = {"passed_at": now(), "duration": duration}
+    if len(cache) > keep:
+        oldest = sorted(cache, key=lambda k: cache[k]["passed_at"])
+        for old_key in oldest[: len(cache) - keep]:
+            del cache[old_key]
+    save_cache(ctx, "tests", cache)
+
+
+def doc_output(ctx):
+    """Return the folder the documentation is built into, or None if not set."""
+    if "doc_output" in ctx.releaser and ctx.releaser.doc_output is not None:
+        return _in_here(ctx, ctx.releaser.doc_output)[0].resolve()
+    return None
+
+
+def doc_cache_key(ctx, version, git_state=None):
+    """
+    Determine the key for a documentation build.
+
+    The key changes if the documentation or source files change (the latter
+    for autodoc), if the version changes, or if the doc command changes.
+    """
+    digest = hashlib.sha256()
+    digest.update("{}\n{}\n".format(ctx.releaser.doc_command, version).encode())
+    digest.update(
+        tree_digest(
+            _in_here(ctx, ctx.releaser.docs, ctx.releaser.source),
+            git_state,
+            exclude=[cache_dir(ctx), doc_output(ctx)],
+        ).encode("utf-8")
+    )
+    return digest.hexdigest()
+
+
+def restore_docs(ctx, key):
+    """
+    Restore the documentation built with `key`, if we have it.
+
+    Returns
+    -------
+        dict: the record of the build restored, or None.
+
+    """
+    record = load_cache(ctx, "docs").get(key, None)
+    saved = cache_dir(ctx) / "docs" / key
+    output = doc_output(ctx)
+    if record is None or output is None or not saved.is_dir():
+        return None
+    if output.exists():
+        shutil.rmtree(str(output))
+    shutil.copytree(str(saved), str(output))
+    return record
+
+
+def save_docs(ctx, key, duration):
+    """
+    Keep a copy of the documentation just built with `key`.
+
+    Only the latest build is kept.
+    """
+    output = doc_output(ctx)
+    if output is None or not output.is_dir():
+        return
+    docs_dir = cache_dir(ctx) / "docs"
+    if docs_dir.exists():
+        shutil.rmtree(str(docs_dir))
+    shutil.copytree(str(output), str(docs_dir / key))
+    save_cache(ctx, "docs", {key: {"built_at": now(), "duration": duration}})
+
+
+def artifact_state(ctx, server):
+    """
+    Return what earlier releases did with distribution files on `server`.
+
+    Returns
+    -------
+        dict: of filename to a dict with the keys "sha256", and (if they
+        happened) "uploaded" and "verified".
+
+    """
+    return load_cache(ctx, "artifacts").get(server, {})
+
+
+def record_artifact(ctx, server, filename, sha256, **done):
+    """
+    Record that a distribution file was uploaded to, or verified on, `server`.
+
+    Records of a file with the same name but a different hash are replaced.
+    """
+    cache = load_cache(ctx, "artifacts")
+    files = cache.setdefault(server, {})
+    if files.get(filename, {}).get("sha256", None) != sha256:
+        files[filename] = {"sha256": sha256}
+    files[filename].update(done)
+    save_cache(ctx, "artifacts", cache)
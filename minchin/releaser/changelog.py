@@ -0,0 +1,178 @@
+import re
+import shutil
+import textwrap
+from datetime import date
+
+from .cache import load_cache, replace_with, save_cache
+from .vcs import commit_messages, commits_since
+
+# Changelogs are in the format used by `releases`
+# (https://releases.readthedocs.io/): a list of entries, newest first, with
+# ":release:" entries marking where each release starts. Entries above the
+# first ":release:" are unreleased.
+list_match_re = re.compile(r"(?P<leading>[ \t]*)(?P<mark>[-\*+]) +:\w+:")
+release_match_re = re.compile(r"[ \t]*[-\*+] +:release:")
+# "Conventional commits" (https://www.conventionalcommits.org/), e.g.
+# "feat(parser): add an option" or "fix!: drop support for..."
+conventional_re = re.compile(
+    r"^(?P<type>[A-Za-z]+)(?:\((?P<scope>[^)]*)\))?(?P<breaking>!)?"
+    r": *(?P<description>.+)"
+)
+breaking_re = re.compile(r"^BREAKING[ -]CHANGE: ", re.MULTILINE)
+
+# commit types, and the `releases` role they're listed under; other types
+# (e.g. "chore", "ci", "test", "style", "refactor") aren't listed
+ROLES = {
+    "feat": "feature",
+    "feature": "feature",
+    "fix": "bug",
+    "bugfix": "bug",
+    "perf": "bug",
+    "docs": "support",
+    "doc": "support",
+    "build": "support",
+    "deps": "support",
+}
+
+WIDTH = 79
+
+
+def classify(message):
+    """
+    Classify a commit, by its message.
+
+    Returns
+    -------
+        dict: with keys "type" (the conventional commit type, lower case, or
+        None), "breaking" (bool), "role" (the `releases` role, or None if
+        it's not listed in the changelog), and "description".
+
+    """
+    subject = message.strip().splitlines()[0] if message.strip() else ""
+    match = conventional_re.match(subject)
+    if match is None:
+        return {"type": None, "breaking": False, "role": None, "description": subject}
+    kind = match.group("type").lower()
+    return {
+        "type": kind,
+        "breaking": bool(match.group("breaking") or breaking_re.search(message)),
+        "role": ROLES.get(kind, None),
+        "description": match.group("description").strip(),
+    }
+
+
+def scan_commits(ctx, git_state, since=None):
+    """
+    Classify the commits since the tag `since` that change something in
+    `releaser.here`.
+
+    Commits are immutable, so each is only read and classified once; the
+    results are kept in the "commits" cache. Only the commit hashes are
+    listed for commits seen before.
+
+    Returns
+    -------
+        list: of dicts (see `classify()`), newest first.
+
+    """
+    cache = load_cache(ctx, "commits")
+    commits = commits_since(git_state, since, path=ctx.releaser.here)
+    new = [sha for sha in commits if sha not in cache]
+    for sha, message in commit_messages(git_state, new).items():
+        cache[sha] = classify(message)
+    # only remember the commits since the last release
+    current = {sha: cache[sha] for sha in commits if sha in cache}
+    if new or len(current) != len(cache):
+        save_cache(ctx, "commits", current)
+    return [current[sha] for sha in commits if sha in current]
+
+
+def format_entry(role, description):
+    """Format a changelog entry, wrapped to fit the file."""
+    description = description[:1].lower() + description[1:]
+    if not description.endswith("."):
+        description += "."
+    return textwrap.fill(
+        "- :{}:`-` {}".format(role, description),
+        width=WIDTH,
+        subsequent_indent="  ",
+        break_on_hyphens=False,
+    )
+
+
+def changelog_entries(commits):
+    """Turn classified commits into changelog entries, oldest first."""
+    return [
+        format_entry(commit["role"], commit["description"])
+        for commit in reversed(commits)
+        if commit["role"] is not None
+    ]
+
+
+def bump_level(commits):
+    """
+    Determine the bump level implied by `commits`.
+
+    Any breaking change means a "major" bump, any new feature a "minor" one,
+    and any other commit a "patch". With no commits, there's nothing to
+    release ("none").
+    """
+    if any(commit["breaking"] for commit in commits):
+        return "major"
+    elif any(commit["role"] == "feature" for commit in commits):
+        return "minor"
+    elif commits:
+        return "patch"
+    return "none"
+
+
+def add_release(path, version, entries=(), release_date=None):
+    """
+    Add a release (and `entries`) to the top of the changelog at `path`.
+
+    The file is streamed: only the lines before the last release are looked
+    at, and the rest is copied over as is. Entries already in the changelog
+    (but not yet released) are left where they are, and not added again.
+
+    Returns
+    -------
+        list: the entries added.
+
+    """
+    release_date = release_date or date.today()
+    release = "- :release:`{} <{}>`".format(version, release_date.isoformat())
+    added = []
+
+    def write(temp_name):
+        with open(str(path), encoding="utf-8", newline="") as src, open(
+            temp_name, mode="w", encoding="utf-8", newline=""
+        ) as dst:
+            header = []
+            unreleased = []
+            for line in src:
+                if release_match_re.match(line):
+                    break
+                elif unreleased or list_match_re.match(line):
+                    unreleased.append(line)
+                else:
+                    header.append(line)
+            else:
+                line = ""
+            for lines in [header, unreleased]:
+                if lines and not lines[-1].endswith("\n"):
+                    lines[-1] += "\n"
+            newline = "\r\n" if (header or ["\n"])[0].endswith("\r\n") else "\n"
+            existing = " ".join("".join(unreleased).split())
+            for entry in entries:
+                if " ".join(entry.split()) not in existing:
+                    added.append(entry)
+
+            dst.writelines(header)
+            for block in [release] + added:
+                dst.write(block.replace("\n", newline) + newline)
+            dst.writelines(unreleased)
+            dst.write(line)
+            shutil.copyfileobj(src, dst)
+
+    replace_with(path, write)
+    return added
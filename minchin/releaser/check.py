@@ -0,0 +1,233 @@
+import email.message
+import email.parser
+import fnmatch
+import io
+from pathlib import Path
+
+from .cache import file_sha256, load_cache, save_cache
+
+# This does what `twine check` does, without starting `twine`, and reading
+# only the metadata file out of each distribution.
+
+REQUIRED_FIELDS = ["Metadata-Version", "Name", "Version"]
+
+
+def read_metadata(path):
+    """
+    Read the metadata (``PKG-INFO`` or ``METADATA``) out of a distribution.
+
+    The archive is read only as far as the metadata file; nothing is
+    extracted.
+
+    Returns
+    -------
+        email.message.Message: the metadata, or None if there isn't any.
+
+    """
+    import tarfile
+    import zipfile
+
+    path = str(path)
+    raw = None
+    if path.endswith(".whl"):
+        with zipfile.ZipFile(path) as zf:
+            for name in zf.namelist():
+                parts = name.split("/")
+                if len(parts) == 2 and parts[0].endswith(".dist-info"):
+                    if parts[1] == "METADATA":
+                        raw = zf.read(name)
+                        break
+    elif path.endswith(".tar.gz"):
+        # a stream, so we stop reading as soon as we find it
+        with tarfile.open(path, "r|gz") as tf:
+            for member in tf:
+                parts = member.name.split("/")
+                if len(parts) == 2 and parts[1] == "PKG-INFO" and member.isfile():
+                    raw = tf.extractfile(member).read()
+                    break
+    if raw is None:
+        return None
+    return email.parser.Parser().parsestr(raw.decode("utf-8", "replace"))
+
+
+def _content_type(value):
+    message = email.message.EmailMessage()
+    message["content-type"] = value
+    return message.get_content_type(), dict(message["content-type"].params)
+
+
+def check_metadata(metadata):
+    """
+    Check distribution metadata, as `twine check` would.
+
+    Returns
+    -------
+        tuple: (bool, list), whether the metadata passes, and a list of
+        warnings and errors (as strings).
+
+    """
+    if metadata is None:
+        return False, ["no PKG-INFO or METADATA file found."]
+
+    messages = []
+    missing = [field for field in REQUIRED_FIELDS if not metadata.get(field)]
+    if missing:
+        return False, ["missing {}.".format(", ".join(missing))]
+
+    description = metadata.get_payload()
+    if not description:
+        # older metadata versions keep it in a header, indented by 8 spaces
+        lines = metadata.get("Description", "").splitlines()
+        description = "\n".join(
+            lines[:1]
+            + [line[8:] if line.startswith(" " * 8) else line for line in lines[1:]]
+        )
+    content_type = metadata.get("Description-Content-Type", None)
+    if content_type is None:
+        messages.append(
+            "`long_description_content_type` missing. defaulting to `text/x-rst`."
+        )
+        content_type = "text/x-rst"
+    content_type, params = _content_type(content_type)
+
+    if not description or description.rstrip() == "UNKNOWN":
+        messages.append("`long_description` missing.")
+    elif content_type not in ["text/plain", "text/markdown"]:
+        import readme_renderer.rst
+
+        stream = io.StringIO()
+        if readme_renderer.rst.render(description, stream=stream, **params) is None:
+            messages.append(
+                "`long_description` has syntax errors in markup and would not "
+                "be rendered on PyPI.\n{}".format(stream.getvalue().strip())
+            )
+            return False, messages
+    return True, messages
+
+
+def check_distributions(ctx, files, hashes=None):
+    """
+    Check the metadata (and long description) of each distribution file.
+
+    Results are cached by the file's hash, so an identical file is only
+    checked once. This is safe to run in a background thread.
+
+    Args:
+        ctx (invoke.context):
+        files (list): of Paths to distribution files.
+        hashes (dict): of filename to sha256 hash, if already known.
+
+    Returns
+    -------
+        dict: of filename to (bool, list), whether it passed, and any
+        warnings or errors.
+
+    """
+    hashes = hashes or {}
+    cache = load_cache(ctx, "dist_checks")
+    current = {}
+    results = {}
+    for f in files:
+        name = Path(f).name
+        sha256 = hashes.get(name, None) or file_sha256(f)
+        if sha256 in cache:
+            current[sha256] = cache[sha256]
+        else:
+            ok, messages = check_metadata(read_metadata(f))
+            current[sha256] = {"ok": ok, "messages": messages}
+        results[name] = (current[sha256]["ok"], current[sha256]["messages"])
+    # only remember the current files
+    save_cache(ctx, "dist_checks", current)
+    return results
+
+
+def archive_members(path):
+    """
+    List the files in a distribution, without extracting (or decompressing) them.
+
+    Returns
+    -------
+        set: of paths within the archive, in posix form.
+
+    """
+    import tarfile
+    import zipfile
+
+    path = str(path)
+    if path.endswith(".whl"):
+        with zipfile.ZipFile(path) as zf:
+            return {name for name in zf.namelist() if not name.endswith("/")}
+    with tarfile.open(path, "r|gz") as tf:
+        return {member.name for member in tf if member.isfile()}
+
+
+def _wheel_prefix(source, members):
+    """
+    Determine where the source folder ends up in a wheel.
+
+    For a "flat" layout, this is the source folder itself; for a "src" layout
+    (say, ``src/example``), the leading folders are dropped (``example``).
+    """
+    parts = source.split("/")
+    for i in range(len(parts)):
+        prefix = "/".join(parts[i:]) + "/"
+        if any(member.startswith(prefix) for member in members):
+            return prefix
+    return None
+
+
+def check_contents(files, tracked, source, ignore=()):
+    """
+    Compare what's in each distribution file against the tracked source files.
+
+    Args:
+        files (list): of Paths to the distribution files (sdists and wheels).
+        tracked (iterable): the source files tracked by git, relative to
+            the base folder (i.e. `releaser.here`) and in posix form.
+        source (str): the source folder, relative to the base folder (and
+            not the base folder itself).
+        ignore (list): glob patterns of files not to check either way (e.g.
+            tests, or generated files). Hidden files are always ignored.
+
+    Returns
+    -------
+        dict: of filename to (missing, unexpected), both sorted lists of
+        paths relative to the base folder. "Missing" files are tracked but
+        not in the distribution; "unexpected" files are in the distribution's
+        copy of the source folder, but aren't tracked.
+
+    """
+    source = source.strip("/")
+
+    def checked(path):
+        return not (
+            any(part.startswith(".") for part in path.split("/"))
+            or any(fnmatch.fnmatch(path, pattern) for pattern in ignore)
+        )
+
+    expected = {path for path in tracked if checked(path)}
+
+    results = {}
+    for f in files:
+        members = archive_members(f)
+        if str(f).endswith(".whl"):
+            prefix = _wheel_prefix(source, members)
+        else:
+            # sdists have everything in one top folder
+            prefix = "{}/{}/".format(sorted(members)[0].split("/")[0], source)
+        present = set()
+        if prefix is not None:
+            present = {
+                source + "/" + member[len(prefix) :]
+                for member in members
+                if member.startswith(prefix) and "__pycache__" not in member
+            }
+        results[Path(f).name] = (
+            sorted(expected - present),
+            sorted(
+                path
+                for path in present - set(tracked)
+                if checked(path) and not path.endswith(".pyc")
+            ),
+        )
+    return results
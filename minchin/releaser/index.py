@@ -0,0 +1,137 @@
+import html
+import random
+import re
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from .cache import file_sha256
+from .constants import ERROR_COLOR, GOOD_COLOR, RESET_COLOR, WARNING_COLOR
+from .util import normalize_name
+
+# seconds to wait for uploads to appear, if not set by `releaser.index_timeout`
+INDEX_TIMEOUT = 300
+# the longest to wait between checks, in seconds
+MAX_DELAY = 30
+
+LINK_RE = re.compile(r"""<a\s[^>]*href=["']([^"']+)["']""", re.IGNORECASE)
+
+
+def simple_index_files(session, index_url, project):
+    """
+    List the files the simple index (PEP 503) has for `project`.
+
+    Returns
+    -------
+        dict: of filename to sha256 hash (None if the index doesn't give one).
+        Empty if the project isn't (yet) listed.
+
+    """
+    url = "{}/{}/".format(index_url.rstrip("/"), normalize_name(project))
+    # ask to skip any cache between us and the index, as it may be stale
+    response = session.get(url, headers={"Cache-Control": "max-age=0"}, timeout=30)
+    if response.status_code == 404:
+        return {}
+    response.raise_for_status()
+
+    files = {}
+    for link in LINK_RE.findall(response.text):
+        link = html.unescape(link)
+        path, _, fragment = link.partition("#")
+        filename = Path(urlsplit(path).path).name
+        sha256 = None
+        if fragment.startswith("sha256="):
+            sha256 = fragment[len("sha256=") :]
+        files[filename] = sha256
+    return files
+
+
+def wait_for_files(
+    index_url, project, files, timeout=INDEX_TIMEOUT, delay=1.0, session=None
+):
+    """
+    Wait until the index lists every one of `files`, with the right hash.
+
+    Checks are made with an exponential backoff (with jitter), and stop as
+    soon as every file is listed, a file is listed with the wrong hash
+    (waiting won't fix that), or `timeout` seconds have passed.
+
+    Args:
+        index_url (str): the base URL of the simple index.
+        project (str): the project's name on the index.
+        files (list): of Paths to the local copies of the files.
+        timeout (float): the most seconds to wait for.
+        delay (float): seconds to wait after the first check.
+        session (requests.Session): to make the checks with.
+
+    Returns
+    -------
+        dict: of filename to the hash given by the index, or None if the
+        file isn't listed (yet). If the index doesn't give hashes, the
+        filename maps to an empty string.
+
+    """
+    if session is None:
+        import requests
+
+        session = requests.Session()
+
+    expected = {Path(f).name: file_sha256(f) for f in files}
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            listed = simple_index_files(session, index_url, project)
+        except OSError:
+            # includes requests' errors; the index may be having a moment
+            listed = {}
+        found = {
+            name: (listed[name] or "") if name in listed else None for name in expected
+        }
+        if all(sha256 is not None for sha256 in found.values()) or any(
+            sha256 and sha256 != expected[name] for name, sha256 in found.items()
+        ):
+            return found
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return found
+        time.sleep(min(delay * random.uniform(0.5, 1.5), remaining))
+        delay = min(delay * 2, MAX_DELAY)
+
+
+def report_files(found, files):
+    """
+    Print how the index's copy of each file compares to ours.
+
+    Returns
+    -------
+        bool: True if the index has every file, and no hashes differ.
+
+    """
+    all_ok = True
+    for f in files:
+        name = Path(f).name
+        sha256 = found.get(name, None)
+        if sha256 is None:
+            print(
+                "[{}ERROR{}] {}: not on the index.".format(
+                    ERROR_COLOR, RESET_COLOR, name
+                )
+            )
+            all_ok = False
+        elif not sha256:
+            print(
+                "[{}WARN{}] {}: on the index (without a hash).".format(
+                    WARNING_COLOR, RESET_COLOR, name
+                )
+            )
+        elif sha256 != file_sha256(f):
+            print(
+                "[{}ERROR{}] {}: the index's copy differs from ours.".format(
+                    ERROR_COLOR, RESET_COLOR, name
+                )
+            )
+            all_ok = False
+        else:
+            print("[{}GOOD{}] {}: on the index.".format(GOOD_COLOR, RESET_COLOR, name))
+    return all_ok
@@ -0,0 +1,137 @@
+import importlib.util
+import os
+import shutil
+import sys
+
+from .constants import PIP_EXT, RESET_COLOR, VENV_BIN, WARNING_COLOR
+from .runner import run
+
+# Ways of creating the virtual environments we test installing the
+# distributions into, and installing packages into them. Each takes the same
+# arguments as `pip install`, and returns a `runner.RunResult`, with the
+# command's output appended to `log`.
+
+INSTALLERS = ["auto", "uv", "virtualenv", "pip"]
+# environment variables `pip` reads, and `uv`'s equivalent
+PIP_TO_UV = {
+    "PIP_INDEX_URL": "UV_INDEX_URL",
+    "PIP_EXTRA_INDEX_URL": "UV_EXTRA_INDEX_URL",
+    "PIP_FIND_LINKS": "UV_FIND_LINKS",
+}
+
+
+def env_script(environment, name):
+    """Return the path to the script `name` (e.g. "pip") in `environment`."""
+    return "{1}{0}{2}{0}{3}{4}".format(os.sep, environment, VENV_BIN, name, PIP_EXT)
+
+
+class PipInstaller:
+    """The standard library's `venv`, and the environment's own `pip`."""
+
+    name = "pip"
+
+    @staticmethod
+    def available():
+        return True
+
+    def create(self, environment, python="python", log=None):
+        return run("{} -m venv {}".format(python, environment), log=log)
+
+    def install(self, environment, args, log=None):
+        return run(
+            "{} install {}".format(env_script(environment, "pip"), args),
+            log=log,
+        )
+
+
+class UvInstaller:
+    """
+    `uv venv` and `uv pip install`.
+
+    The environments don't get a copy of `pip`; `uv` installs into them from
+    the outside, using its own (shared) cache of downloaded wheels.
+    """
+
+    name = "uv"
+
+    @staticmethod
+    def available():
+        return shutil.which("uv") is not None
+
+    def create(self, environment, python="python", log=None):
+        return run(
+            "uv venv --quiet --python {} {}".format(python, environment),
+            log=log,
+        )
+
+    def install(self, environment, args, log=None):
+        # `uv` doesn't read pip's settings, so pass on any set for this run
+        env = {
+            uv_key: os.environ[pip_key]
+            for pip_key, uv_key in PIP_TO_UV.items()
+            if pip_key in os.environ and uv_key not in os.environ
+        }
+        return run(
+            "uv pip install --python {} {}".format(
+                env_script(environment, "python"), args
+            ),
+            log=log,
+            env=env,
+        )
+
+
+class VirtualenvInstaller(PipInstaller):
+    """
+    `virtualenv`, which seeds `pip` from its own cache of wheels.
+
+    This is quicker than `venv`, which runs `ensurepip` (and so unpacks
+    `pip`) for every environment. `virtualenv` is run from our own Python,
+    so it needn't be installed for the Pythons we test on.
+    """
+
+    name = "virtualenv"
+
+    @staticmethod
+    def available():
+        return importlib.util.find_spec("virtualenv") is not None
+
+    def create(self, environment, python="python", log=None):
+        return run(
+            '"{}" -m virtualenv --quiet --seeder app-data --no-periodic-update '
+            "--python {} {}".format(sys.executable, python, environment),
+            log=log,
+        )
+
+
+BACKENDS = [UvInstaller, VirtualenvInstaller, PipInstaller]
+
+
+def get_installer(ctx):
+    """
+    Pick the installer to use, per `releaser.installer`.
+
+    With "auto" (the default), the fastest one available is used: `uv`, then
+    `virtualenv`, then `venv` and `pip`. If the requested installer isn't
+    available, we fall back to "auto".
+    """
+    requested = str(ctx.releaser.get("installer", None) or "auto").lower()
+    if requested not in INSTALLERS:
+        print(
+            "[{}WARN{}] unknown installer '{}' for 'releaser.installer'. Valid "
+            "values are {}.".format(
+                WARNING_COLOR, RESET_COLOR, requested, ", ".join(INSTALLERS)
+            )
+        )
+        requested = "auto"
+    for backend in BACKENDS:
+        if requested == backend.name:
+            if backend.available():
+                return backend()
+            print(
+                "[{}WARN{}] installer '{}' isn't available.".format(
+                    WARNING_COLOR, RESET_COLOR, requested
+                )
+            )
+    for backend in BACKENDS:
+        if backend.available():
+            return backend()
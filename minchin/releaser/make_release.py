@@ -1,23 +1,33 @@
 import os
 import re
-import shutil
 import sys
 import textwrap
+import threading
+import time
 from pathlib import Path
 
 import colorama
-import git  # packaged as 'gitpython'
 import invoke
-import isort
-import semantic_version
 from invoke import task
-from semantic_version import Version
 
 # try:
 #     from minchin import text
 # except ImportError:
 #     from ._vendor import text
 from ._vendor import text
+from .cache import (
+    artifact_state,
+    doc_cache_key,
+    doc_output,
+    passed_tests,
+    record_artifact,
+    record_passed_tests,
+    restore_docs,
+    save_docs,
+    test_cache_key,
+)
+from .changelog import add_release, bump_level, changelog_entries, scan_commits
+from .check import check_contents, check_distributions
 from .constants import (
     ERROR_COLOR,
     GOOD_COLOR,
@@ -27,20 +37,56 @@ from .constants import (
     WARNING_COLOR,
     __version__,
 )
+from .index import INDEX_TIMEOUT, report_files, wait_for_files
+from .installers import get_installer
+from .policy import ask, is_interactive, require_interactive, warn_unknown_policies
+from .pythons import find_pythons
+from .reproducible import normalize, read_manifest, write_manifest
+from .runner import print_tail, run, stage_log
+from .scratch import new_environment, start_cleanup
+from .shards import run_sharded, shard_count
+from .sizes import (
+    archive_sizes,
+    baseline,
+    compare_sizes,
+    human_size,
+    record_sizes,
+    report_sizes,
+    size_limits,
+)
+from .timing import StageTimer
+from .upload import ALREADY_UPLOADED, upload_distributions
 from .util import check_configuration, check_existence
+from .vcs import (
+    commit_timestamp,
+    create_tag,
+    has_tag,
+    is_dirty_below,
+    latest_tag,
+    scan_status,
+    tracked_files,
+    untracked_below,
+)
 from .vendorize import vendorize
 
 # also requires `twine`
 
+# `git` (packaged as 'gitpython'), `isort`, and `semantic_version` are slow to
+# import, so they are imported when they're first needed, rather than here.
+# The same goes for `twine`, `requests`, `readme_renderer`, and the archive
+# modules, throughout the package. Importing this module is thus cheap, which
+# keeps `invoke --list` (and every other invoke task) fast.
+
 # assumed Invoke configuration file points to Windows Shell
 
 version_re = re.compile(
     r"__version__ = [\"\']{1,3}(?P<major>\d+)\.(?P<minor>\d+).(?P<patch>\d+)(?:-(?P<prerelease>[0-9A-Za-z\.]+))?(?:\+[0-9A-Za-z-\.]+)?[\"\']{1,3}"
 )
-bare_version_re = re.compile(r"__version__ = [\"\']{1,3}([\.\dA-Za-z+-]*)[\"\']{1,3}")
-list_match_re = re.compile(r"(?P<leading>[ \t]*)(?P<mark>[-\*+]) +:\w+:")
 
 
+# install checks can run at the same time; this keeps their messages whole
+_print_lock = threading.Lock()
+
 VALID_BUMPS = [
     # none
     "none",
@@ -57,14 +103,31 @@ VALID_BUMPS = [
     # major/breaking changes
     "major",
     "breaking",
+    # inferred from the commits since the last release
+    "auto",
 ]
 VALID_BUMPS_STR = ", & ".join([", ".join(VALID_BUMPS[:-1]), VALID_BUMPS[-1]])
 
 
-def server_url(server_name, download=False):
-    """Determine the server URL to download packages from."""
+def server_config(ctx, server_name):
+    """
+    Return the configuration for a server, as set under `releaser.servers`.
+
+    This allows the URLs for a server to be overridden (e.g. to point at a
+    local stand-in of the package index).
+    """
+    if ctx is None or "servers" not in ctx.releaser or ctx.releaser.servers is None:
+        return {}
+    return ctx.releaser.servers.get(server_name.lower(), None) or {}
+
+
+def server_url(server_name, download=False, ctx=None):
+    """Determine the server URL to upload to, or download packages from."""
     server_name = server_name.lower()
-    if server_name in ["testpypi", "pypitest"]:
+    url_key = "download_url" if download else "upload_url"
+    if url_key in server_config(ctx, server_name):
+        return server_config(ctx, server_name)[url_key]
+    elif server_name in ["testpypi", "pypitest"]:
         if download:
             return r"https://test.pypi.org/simple"
         else:
@@ -75,6 +138,15 @@ def server_url(server_name, download=False):
         return r"https://pypi.org/pypi"
 
 
+def simple_index_url(server_name, ctx=None):
+    """Determine the URL of the simple index (PEP 503) of a server."""
+    if server_name.lower() == "pypi" and "download_url" not in server_config(
+        ctx, server_name
+    ):
+        return r"https://pypi.org/simple"
+    return server_url(server_name, download=True, ctx=ctx)
+
+
 def pypi_name(ctx):
     """
     Determine name of package to install from (test)PyPI server.
@@ -87,7 +159,43 @@ def pypi_name(ctx):
         return ctx.releaser.module_name
 
 
-def update_version_number(ctx, bump=None, ignore_prerelease=False):
+def wheelhouse_args(ctx):
+    """
+    Point pip at our local wheelhouse, if we have one.
+
+    The wheelhouse is set by `releaser.wheelhouse`, and is a folder of
+    pre-built wheels shared by all the environments we create.
+    """
+    if "wheelhouse" in ctx.releaser and ctx.releaser.wheelhouse is not None:
+        return " --find-links {}".format(Path(ctx.releaser.wheelhouse).resolve())
+    return ""
+
+
+def infer_bump_level(ctx, git_state, old_version):
+    """
+    Determine the bump level from the commits since the last release.
+
+    See `changelog.bump_level()`.
+    """
+    if git_state is None:
+        exit(
+            "[{}ERROR{}] can't infer the bump level, as the base directory "
+            "isn't a git repo.".format(ERROR_COLOR, RESET_COLOR)
+        )
+    since = previous_release(ctx, git_state, old_version)
+    commits = scan_commits(ctx, git_state, since)
+    level = bump_level(commits)
+    print(
+        "{}Bump level '{}', from {} commit(s) since {}".format(
+            " " * 4, level, len(commits), since or "the first commit"
+        )
+    )
+    return level
+
+
+def update_version_number(
+    ctx, bump=None, ignore_prerelease=False, assume_yes=False, git_state=None
+):
     """
     Update version number.
 
@@ -96,6 +204,10 @@ def update_version_number(ctx, bump=None, ignore_prerelease=False):
         bump (str): bump level
         ignore_prerelease (bool): ignore the fact that our new version is a
             prerelease, or issue a warning
+        assume_yes (bool): answer "yes" to questions not otherwise answered
+            by `releaser.policy`, and never read from stdin
+        git_state (dict): from `vcs.scan_status()`; needed to infer the bump
+            level (i.e. if it is "auto")
 
     Returns
     -------
@@ -103,6 +215,11 @@ def update_version_number(ctx, bump=None, ignore_prerelease=False):
         version).
 
     """
+    import semantic_version
+    from semantic_version import Version
+
+    from .versions import read_text, read_version, update_versions, version_files
+
     if bump is not None and bump.lower() not in VALID_BUMPS:
         print(
             textwrap.fill(
@@ -120,116 +237,152 @@ def update_version_number(ctx, bump=None, ignore_prerelease=False):
         update_level = bump
 
     # Find current version
-    temp_file = Path(ctx.releaser.version).resolve().parent / (
-        "~" + Path(ctx.releaser.version).name
-    )
-    with temp_file.open(mode="w", encoding="utf-8") as g:
-        with Path(ctx.releaser.version).resolve().open(mode="r", encoding="utf-8") as f:
-            for line in f:
-                version_matches = bare_version_re.match(line)
-                if version_matches:
-                    bare_version_str = version_matches.groups(0)[0]
-                    if semantic_version.validate(bare_version_str):
-                        old_version = Version(bare_version_str)
-                        print("{}Current version is {}".format(" " * 4, old_version))
-                    else:
-                        old_version = Version.coerce(bare_version_str)
-                        ans = text.query_yes_quit(
-                            "{}I think the version is {}."
-                            " Use it?".format(" " * 4, old_version),
-                            default="yes",
-                        )
-                        if ans == text.Answers.QUIT:
-                            exit(
-                                "[{}ERROR{}] Please set an initial version "
-                                "number to continue.".format(ERROR_COLOR, RESET_COLOR)
-                            )
-
-                    # if bump level not defined by command line options
-                    if bump is None:
-                        try:
-                            update_level = ctx.releaser.version_bump
-                        except AttributeError:
-                            print(
-                                "[{}WARN{}] bump level not defined in "
-                                "configuration. Use key "
-                                "'releaser.version_bump'".format(
-                                    WARNING_COLOR, RESET_COLOR
-                                )
-                            )
-                            print(
-                                textwrap.fill(
-                                    "{}Valid bump levels are: "
-                                    "{}. Or use 'quit' to exit.".format(
-                                        " " * 7, VALID_BUMPS_STR
-                                    ),
-                                    width=text.get_terminal_size().columns - 1,
-                                    subsequent_indent=" " * 7,
-                                )
-                            )
-                            my_input = input("What bump level to use? ")
-                            if my_input.lower() in ["quit", "q", "exit", "y"]:
-                                sys.exit(0)
-                            elif my_input.lower() not in VALID_BUMPS:
-                                exit(
-                                    "[{}ERROR{}] invalid bump level provided. "
-                                    "Exiting...".format(ERROR_COLOR, RESET_COLOR)
-                                )
-                            else:
-                                update_level = my_input
-
-                    # Determine new version number
-                    if update_level is None or update_level.lower() in ["none"]:
-                        update_level = None
-                    elif update_level is not None:
-                        update_level = update_level.lower()
-
-                    if update_level in ["breaking", "major"]:
-                        current_version = old_version.next_major()
-                    elif update_level in ["feature", "minor"]:
-                        current_version = old_version.next_minor()
-                    elif update_level in ["bugfix", "patch"]:
-                        current_version = old_version.next_patch()
-                    elif update_level in ["dev", "development", "prerelease"]:
-                        if not old_version.prerelease:
-                            current_version = old_version.next_patch()
-                            current_version.prerelease = ("dev",)
-                        else:
-                            current_version = old_version
-                    elif update_level is None:
-                        # don't update version
-                        current_version = old_version
-                    else:
-                        exit(
-                            "[{}ERROR{}] Cannot update version in {} mode".format(
-                                ERROR_COLOR, RESET_COLOR, update_level
-                            )
-                        )
+    here = Path(ctx.releaser.here).resolve()
+    files = version_files(ctx, here)
+    version_text = read_text(files[0][0])
+    bare_version_str = read_version(*files[0], content=version_text)
+    if bare_version_str is None:
+        exit(
+            "[{}ERROR{}] can't find the version (a '__version__ = \"...\"' "
+            "line) in {}.".format(ERROR_COLOR, RESET_COLOR, files[0][0])
+        )
+    if semantic_version.validate(bare_version_str):
+        old_version = Version(bare_version_str)
+        print("{}Current version is {}".format(" " * 4, old_version))
+    else:
+        old_version = Version.coerce(bare_version_str)
+        ans = ask(
+            ctx,
+            "on_version_guess",
+            "{}I think the version is {}." " Use it?".format(" " * 4, old_version),
+            assume_yes=assume_yes,
+        )
+        if ans == text.Answers.QUIT:
+            exit(
+                "[{}ERROR{}] Please set an initial version "
+                "number to continue.".format(ERROR_COLOR, RESET_COLOR)
+            )
 
-                    # warn on pre-release versions
-                    if current_version.prerelease and not ignore_prerelease:
-                        ans = text.query_yes_quit(
-                            "[{}WARN{}] Current version "
-                            "is a pre-release version. "
-                            "Continue anyway?".format(WARNING_COLOR, RESET_COLOR),
-                            default="quit",
-                        )
-                        if ans == text.Answers.QUIT:
-                            sys.exit(1)
+    # if bump level not defined by command line options
+    if bump is None:
+        try:
+            update_level = ctx.releaser.version_bump
+        except AttributeError:
+            print(
+                "[{}WARN{}] bump level not defined in "
+                "configuration. Use key "
+                "'releaser.version_bump'".format(WARNING_COLOR, RESET_COLOR)
+            )
+            if git_state is not None and not is_interactive(ctx, assume_yes):
+                print(
+                    "{}Inferring it from the commits since "
+                    "the last release.".format(" " * 7)
+                )
+                update_level = "auto"
+            else:
+                print(
+                    textwrap.fill(
+                        "{}Valid bump levels are: "
+                        "{}. Or use 'quit' to exit.".format(" " * 7, VALID_BUMPS_STR),
+                        width=text.get_terminal_size().columns - 1,
+                        subsequent_indent=" " * 7,
+                    )
+                )
+                require_interactive(ctx, assume_yes, "No bump level given.")
+                my_input = input("What bump level to use? ")
+                if my_input.lower() in ["quit", "q", "exit", "y"]:
+                    sys.exit(0)
+                elif my_input.lower() not in VALID_BUMPS:
+                    exit(
+                        "[{}ERROR{}] invalid bump level provided. "
+                        "Exiting...".format(ERROR_COLOR, RESET_COLOR)
+                    )
+                else:
+                    update_level = my_input
+
+    if update_level is not None and update_level.lower() == "auto":
+        update_level = infer_bump_level(ctx, git_state, old_version)
+
+    # Determine new version number
+    if update_level is None or update_level.lower() in ["none"]:
+        update_level = None
+    elif update_level is not None:
+        update_level = update_level.lower()
+
+    if update_level in ["breaking", "major"]:
+        current_version = old_version.next_major()
+    elif update_level in ["feature", "minor"]:
+        current_version = old_version.next_minor()
+    elif update_level in ["bugfix", "patch"]:
+        current_version = old_version.next_patch()
+    elif update_level in ["dev", "development", "prerelease"]:
+        if not old_version.prerelease:
+            current_version = old_version.next_patch()
+            current_version.prerelease = ("dev",)
+        else:
+            current_version = old_version
+    elif update_level is None:
+        # don't update version
+        current_version = old_version
+    else:
+        exit(
+            "[{}ERROR{}] Cannot update version in {} mode".format(
+                ERROR_COLOR, RESET_COLOR, update_level
+            )
+        )
+
+    # warn on pre-release versions
+    if current_version.prerelease and not ignore_prerelease:
+        ans = ask(
+            ctx,
+            "on_prerelease",
+            "[{}WARN{}] Current version "
+            "is a pre-release version. "
+            "Continue anyway?".format(WARNING_COLOR, RESET_COLOR),
+            assume_yes=assume_yes,
+        )
+        if ans == text.Answers.QUIT:
+            sys.exit(1)
 
-                    print("{}New version is     {}".format(" " * 4, current_version))
+    print("{}New version is     {}".format(" " * 4, current_version))
 
-                    # Update version number
-                    line = '__version__ = "{}"\n'.format(current_version)
-                print(line, file=g, end="")
-        # print('', file=g)  # add a blank line at the end of the file
-    shutil.copyfile(str(temp_file), str(Path(ctx.releaser.version).resolve()))
-    os.remove(str(temp_file))
+    # Update version number, in every file that needs it
+    try:
+        changed = update_versions(files, current_version, {files[0][0]: version_text})
+    except ValueError as e:
+        exit("[{}ERROR{}] {}.".format(ERROR_COLOR, RESET_COLOR, e))
+    if len(files) > 1:
+        for path in changed:
+            print("{}Updated {}".format(" " * 4, os.path.relpath(str(path), str(here))))
     return (old_version, current_version)
 
 
-def build_distribution(build_setup_py=True, build_pyproject=None):
-    """Build distributions of the code."""
+def sort_imports(*directories):
+    """
+    Apply isort to every Python file in the given directories.
+
+    Directories given as None are skipped.
+    """
+    import isort
+
+    for directory in directories:
+        if directory is None:
+            continue
+        for f in Path(directory).resolve().glob("**/*.py"):
+            isort.file(f)
+            print(".", end="")
+
+
+def build_distribution(
+    build_setup_py=True, build_pyproject=None, source_date_epoch=None, log=None
+):
+    """
+    Build distributions of the code.
+
+    If `source_date_epoch` is given, it is passed to the build (as
+    ``SOURCE_DATE_EPOCH``) as the time to date the files in the
+    distributions. The build's output is written to `log`.
+    """
     build_command = ""
     if build_setup_py:
         build_command = "python setup.py sdist bdist_wheel"
@@ -237,7 +390,10 @@ def build_distribution(build_setup_py=True, build_pyproject=None):
         # default is to build an sdist, and then a wheel from that
         build_command = "python -m build"
 
-    result = invoke.run(build_command, warn=True, hide=True)
+    env = {}
+    if source_date_epoch is not None:
+        env["SOURCE_DATE_EPOCH"] = str(source_date_epoch)
+    result = run(build_command, log=log, env=env)
     if result.ok:
         print(
             "[{}GOOD{}] Distribution built without errors.".format(
@@ -249,12 +405,23 @@ def build_distribution(build_setup_py=True, build_pyproject=None):
             "[{}ERROR{}] Something broke trying to package your "
             "code...".format(ERROR_COLOR, RESET_COLOR)
         )
-        print(result.stderr)
+        print_tail(result)
         sys.exit(3)
 
 
-def other_dependencies(ctx, server, environment):
-    """Install things that need to be in place before installing the main package."""
+def other_dependencies(
+    ctx, server, environment, installer=None, log=None, exit_on_error=True
+):
+    """
+    Install things that need to be in place before installing the main package.
+
+    Returns
+    -------
+        bool: whether everything installed. If `exit_on_error` is set (the
+        default), the release is stopped instead.
+
+    """
+    installer = installer or get_installer(ctx)
     if "extra_packages" in ctx.releaser:
         server = server.lower()
         extra_pkgs = []
@@ -282,163 +449,610 @@ def other_dependencies(ctx, server, environment):
             print("** Other Dependencies, based on server", server, "**")
 
         for pkg in extra_pkgs:
-            result = invoke.run(
-                ".{0}env{0}{1}{0}{2}{0}pip{3} install {4}".format(
-                    os.sep, environment, VENV_BIN, PIP_EXT, pkg
-                ),
-                hide=True,
-            )
+            result = installer.install(environment, pkg + wheelhouse_args(ctx), log)
             if result.ok:
                 print(
                     "{}[{}GOOD{}] Installed {}".format("", GOOD_COLOR, RESET_COLOR, pkg)
                 )
             else:
-                print(
-                    "{}[{}ERROR{}] Something broke trying to install "
-                    "package: {}".format("", ERROR_COLOR, RESET_COLOR, pkg)
+                with _print_lock:
+                    print(
+                        "{}[{}ERROR{}] Something broke trying to install "
+                        "package: {}".format("", ERROR_COLOR, RESET_COLOR, pkg)
+                    )
+                    print_tail(result)
+                if exit_on_error:
+                    sys.exit(1)
+                return False
+    return True
+
+
+def report_readme_check(ctx, results, assume_yes=False):
+    """
+    Print the results of `check.check_distributions()`, as `twine check` would.
+
+    If any distribution failed, ask whether to continue.
+    """
+    for name, (ok, messages) in sorted(results.items()):
+        if not ok:
+            status = "{}FAILED{}".format(ERROR_COLOR, RESET_COLOR)
+        elif messages:
+            status = "{}PASSED with warnings{}".format(WARNING_COLOR, RESET_COLOR)
+        else:
+            status = "{}PASSED{}".format(GOOD_COLOR, RESET_COLOR)
+        print("Checking {}: {}".format(name, status))
+        for message in messages:
+            print(textwrap.indent(message, " " * 7))
+
+    if not all(ok for ok, messages in results.values()):
+        print(
+            "[{}WARN{}] Readme reported ReST rendering errors.".format(
+                WARNING_COLOR, RESET_COLOR
+            )
+        )
+        ans = ask(
+            ctx,
+            "on_readme_failure",
+            " " * 7 + "Continue anyway or quit?",
+            assume_yes=assume_yes,
+        )
+        if ans == text.Answers.QUIT:
+            sys.exit(1)
+    else:
+        print("[{}GOOD{}] Readme renders.".format(GOOD_COLOR, RESET_COLOR))
+    print()
+
+
+def tag_name(ctx, version):
+    """
+    Return the git tag for `version`, per `releaser.tag_format`.
+
+    The format may use ``{version}`` and ``{name}`` (see `pypi_name()`), and
+    defaults to just the version.
+    """
+    tag_format = ctx.releaser.get("tag_format", None) or "{version}"
+    return tag_format.format(version=version, name=pypi_name(ctx))
+
+
+def previous_release(ctx, git_state, old_version):
+    """
+    Return the tag of the last release.
+
+    This is the tag for `old_version`, or else the latest tag in the same
+    format (see `tag_name()`).
+    """
+    if has_tag(git_state, tag_name(ctx, old_version)):
+        return tag_name(ctx, old_version)
+    return latest_tag(git_state, match=tag_name(ctx, "*"))
+
+
+def update_changelog(ctx, here, git_state, old_version, new_version):
+    """
+    Add the new release to the changelog (`releaser.changelog`).
+
+    Commits since the last release that follow the "conventional commits"
+    style (e.g. "feat: add an option") are added as entries.
+    """
+    changelog = here / ctx.releaser.changelog
+    if not changelog.exists():
+        print(
+            "[{}WARN{}] {} doesn't exist. Not updating Changelog.".format(
+                WARNING_COLOR, RESET_COLOR, changelog
+            )
+        )
+        return
+
+    entries = []
+    if git_state is None:
+        print(
+            "[{}WARN{}] not a git repo, so only adding the release.".format(
+                WARNING_COLOR, RESET_COLOR
+            )
+        )
+    else:
+        since = previous_release(ctx, git_state, old_version)
+        commits = scan_commits(ctx, git_state, since)
+        entries = changelog_entries(commits)
+        print(
+            "{} commit(s) since {}; {} to add to the changelog.".format(
+                len(commits), since or "the first commit", len(entries)
+            )
+        )
+    added = add_release(changelog, new_version, entries)
+    for entry in added:
+        print(entry)
+    print(
+        "[{}GOOD{}] Added release {} to {}.".format(
+            GOOD_COLOR, RESET_COLOR, new_version, ctx.releaser.changelog
+        )
+    )
+
+
+def check_dist_contents(ctx, here, git_state, dist_files, assume_yes=False):
+    """
+    Compare the distributions' contents against the files git tracks.
+
+    Tracked files under `releaser.source` missing from a distribution are
+    errors (ask whether to continue); untracked files that made it in are
+    warnings. Tests (`releaser.test`), vendorized packages
+    (`releaser.vendor_dest`), and anything matching
+    `releaser.dist_check_ignore` aren't checked.
+    """
+    source = Path(ctx.releaser.source)
+    if (here / source).resolve() == here:
+        print(
+            "[{}WARN{}] 'releaser.source' is the base directory; skipping "
+            "the distribution contents check.".format(WARNING_COLOR, RESET_COLOR)
+        )
+        print()
+        return
+
+    prefix = here.relative_to(git_state["root"]).as_posix()
+    prefix = "" if prefix == "." else prefix + "/"
+    tracked = [
+        path[len(prefix) :] for path in tracked_files(git_state, [here / source])
+    ]
+    ignore = ctx.releaser.get("dist_check_ignore", None) or []
+    if isinstance(ignore, str):
+        ignore = [ignore]
+    # tests needn't be shipped, and vendorized packages are generated
+    ignore = list(ignore)
+    for key in ["test", "vendor_dest"]:
+        if ctx.releaser.get(key, None):
+            folder = (here / ctx.releaser.get(key)).resolve()
+            if here in folder.parents:
+                ignore.append(folder.relative_to(here).as_posix() + "/*")
+    results = check_contents(
+        dist_files, tracked, (here / source).relative_to(here).as_posix(), ignore
+    )
+
+    incomplete = False
+    for name, (missing, unexpected) in sorted(results.items()):
+        for path in missing:
+            print(
+                "[{}ERROR{}] {} is missing {}".format(
+                    ERROR_COLOR, RESET_COLOR, name, path
                 )
-                print(result.stderr)
-                sys.exit(1)
+            )
+        for path in unexpected:
+            print(
+                "[{}WARN{}] {} includes untracked file {}".format(
+                    WARNING_COLOR, RESET_COLOR, name, path
+                )
+            )
+        incomplete = incomplete or bool(missing)
+
+    if incomplete:
+        ans = ask(
+            ctx,
+            "on_incomplete_dist",
+            " " * 7 + "Continue anyway or quit?",
+            assume_yes=assume_yes,
+        )
+        if ans == text.Answers.QUIT:
+            sys.exit(1)
+    else:
+        print(
+            "[{}GOOD{}] Distributions include every tracked source "
+            "file.".format(GOOD_COLOR, RESET_COLOR)
+        )
+    print()
 
 
-def check_local_install(ctx, version, ext, server="local"):
+def check_dist_sizes(ctx, dist_dir, dist_files, assume_yes=False):
     """
-    Upload and check if install works.
+    Compare the size of each distribution to the last release's.
 
-    Uploads a distribution to PyPI, and then tests to see if I can download and
-    install it.
+    The last release's distribution is the one recorded by the last build of
+    a different version, or else the newest other one in `dist_dir` or the
+    wheelhouse. If the distribution grows by more than `releaser.size_limits`
+    allows, or adds a large file, ask whether to continue.
+
+    Args:
+        dist_files (dict): the new distributions, keyed by format.
 
     Returns
     -------
-        str: string summazing operation
+        dict: the file sizes of each distribution, keyed by format, to be
+        recorded (with `record_sizes()`) once it has been uploaded.
 
     """
-    here = Path(ctx.releaser.here).resolve()
-    dist_dir = here / "dist"
+    limits = size_limits(ctx)
+    wheelhouse = ctx.releaser.get("wheelhouse", None)
+    bloated = False
+    dist_sizes = {}
+    for ext, dist_file in sorted(dist_files.items()):
+        sizes = dist_sizes[ext] = archive_sizes(dist_file)
+        previous = baseline(ctx, ext, dist_file.name, [dist_dir, wheelhouse])
+        if previous is None:
+            print(
+                "{}: {} unpacked, {} files. Nothing to compare to.".format(
+                    dist_file.name, human_size(sum(sizes.values())), len(sizes)
+                )
+            )
+        else:
+            result = compare_sizes(previous["sizes"], sizes, limits)
+            report_sizes(dist_file.name, result, previous["name"])
+            bloated = bloated or bool(result["problems"])
+
+    if bloated:
+        ans = ask(
+            ctx,
+            "on_dist_bloat",
+            " " * 7 + "Continue anyway or quit?",
+            assume_yes=assume_yes,
+        )
+        if ans == text.Answers.QUIT:
+            sys.exit(1)
+    print()
+    return dist_sizes
+
+
+def preflight(ctx, servers, assume_yes=False):
+    """
+    Check everything the release needs from outside the package, all at once.
 
-    all_files = list(dist_dir.glob("*.{}".format(ext)))
+    That is: `twine`, credentials for, and the upload and download URLs of,
+    each of `servers`, and the program `releaser.test_command` runs. The
+    results are printed as one report, and the release stops if any fail.
+    """
+    # only needed here, so not imported (along with `configparser`) up front
+    from .preflight import (
+        PREFLIGHT_TIMEOUT,
+        check_command,
+        check_credentials,
+        check_twine,
+        check_url,
+        report,
+        run_checks,
+    )
+
+    timeout = float(ctx.releaser.get("preflight_timeout", None) or PREFLIGHT_TIMEOUT)
+    checks = []
+    test_command = ctx.releaser.get("test_command", None)
+    if test_command and str(test_command).lower() != "none":
+        checks.append(("test command", check_command, [test_command]))
+    if servers:
+        checks.append(("twine", check_twine, []))
+    for server in servers:
+        # `twine` only reads `.pypirc` for servers it knows the URL of
+        section = None if "upload_url" in server_config(ctx, server) else server
+        interactive = is_interactive(ctx, assume_yes)
+        upload_url = server_url(server, ctx=ctx)
+        index_url = simple_index_url(server, ctx=ctx)
+        checks += [
+            (
+                "{} login".format(server),
+                check_credentials,
+                [section, None, interactive],
+            ),
+            ("{} upload".format(server), check_url, [upload_url, timeout]),
+            ("{} index".format(server), check_url, [index_url, timeout]),
+        ]
+    if not checks:
+        print("Nothing to check.")
+    elif not report(run_checks(checks)):
+        exit(
+            "[{}ERROR{}] the release can't succeed as is. Fix the errors "
+            "above and try again.".format(ERROR_COLOR, RESET_COLOR)
+        )
+    print()
+
+
+def remote_verify_mode(ctx):
+    """
+    Determine how to check uploaded distributions, per `releaser.remote_verify`.
+
+    Either "install" (install each from the server; the default) or "hash"
+    (compare the server's hash of each to the local file, and only install
+    if they differ or the local file wasn't installed).
+    """
+    mode = str(ctx.releaser.get("remote_verify", None) or "install").lower()
+    if mode not in ["install", "hash"]:
+        print(
+            "[{}WARN{}] unknown 'releaser.remote_verify' value '{}'. "
+            "Using 'install'.".format(WARNING_COLOR, RESET_COLOR, mode)
+        )
+        mode = "install"
+    return mode
+
+
+def latest_distribution(dist_dir, ext):
+    """Return the most recently built distribution file with extension `ext`."""
+    all_files = list(Path(dist_dir).glob("*.{}".format(ext)))
     the_file = all_files[0]
     for f in all_files[1:]:
         if f.stat().st_mtime > the_file.stat().st_mtime:
             the_file = f
             # this is the latest generated file of the given version
+    return the_file
 
-    environment = "env-{}-{}-{}".format(version, ext, server)
-    if server == "local":
-        pass
+
+def upload(ctx, server, files, assume_yes=False):
+    """
+    Upload the distribution `files` to `server`.
+
+    If any upload fails (other than because the server already has the
+    file), the release stops here, rather than waiting for the file to show
+    up on the server.
+
+    Returns
+    -------
+        dict: of filename to a (bool, str) tuple: whether it uploaded, and
+        how it went.
+
+    """
+    if "upload_url" in server_config(ctx, server):
+        repository_url = server_url(server, ctx=ctx)
     else:
-        # upload to server
-        print("** Uploading to server **")
-        cmd = "twine upload {}".format(the_file)
-        # for PyPI, let twine pick the server
-        if server != "pypi":
-            cmd = cmd + " -r {}".format(server)
-        result = invoke.run(cmd, warn=True)
-        if result.failed:
+        repository_url = None
+    results = upload_distributions(ctx, server, files, repository_url, assume_yes)
+    if any(message == ALREADY_UPLOADED for ok, message in results.values()):
+        print(
+            textwrap.fill(
+                "[{}WARN{}] The server already has some of these files. If "
+                "they're from an earlier build, they won't match, so use a "
+                "different version number (or a different build by "
+                "including a '+' suffix to your version number).".format(
+                    WARNING_COLOR, RESET_COLOR
+                ),
+                width=text.get_terminal_size().columns - 1,
+                subsequent_indent=" " * 7,
+            )
+        )
+    if not all(ok or message == ALREADY_UPLOADED for ok, message in results.values()):
+        exit(
+            "[{}ERROR{}] Something broke trying to upload your package to "
+            "{}.".format(ERROR_COLOR, RESET_COLOR, server)
+        )
+    return results
+
+
+def check_local_install(
+    ctx, version, ext, server="local", installer=None, python=None, exit_on_error=True
+):
+    """
+    Check if install works.
+
+    Tests to see if I can download (from PyPI, if not checking locally) and
+    install the distribution. Distributions need to be uploaded first (see
+    `upload()`). The environment is created, and the distribution installed,
+    by `installer` (see `installers.get_installer()`).
+
+    Args
+    ----
+        python (tuple): (version, executable) of the interpreter to test
+            with (see `pythons.find_pythons()`). Defaults to ``python``.
+        exit_on_error (bool): stop the release if the install fails, rather
+            than reporting it as broken.
+
+    Returns
+    -------
+        tuple: (bool, str), whether the install works, and a string
+        summazing operation
+
+    """
+    from semantic_version import Version, validate
+
+    here = Path(ctx.releaser.here).resolve()
+    dist_dir = here / "dist"
+    the_file = latest_distribution(dist_dir, ext)
+
+    installer = installer or get_installer(ctx)
+    label = server
+    if python is not None:
+        label = "{}-py{}".format(server, python[0])
+    log = stage_log(ctx, "install-{}-{}".format(ext, label))
+    environment = new_environment(ctx, version, ext, label)
+
+    def failed(message, result):
+        with _print_lock:
             print(
-                textwrap.fill(
-                    "[{}ERROR{}] Something broke trying to upload "
-                    "your package. This will be the case if you "
-                    "have already uploaded it before. To upload "
-                    "again, use a different version number "
-                    "(or a different build by including a '+' "
-                    "suffix to your version number).".format(ERROR_COLOR, RESET_COLOR),
-                    width=text.get_terminal_size().columns - 1,
-                    subsequent_indent=" " * 8,
-                )
+                "[{}ERROR{}] {} ({})".format(ERROR_COLOR, RESET_COLOR, message, label)
             )
-            # print(result.stderr)
+            print_tail(result)
+        if exit_on_error:
+            sys.exit(1)
+        return False, "{}{} install {} broken{}".format(
+            ERROR_COLOR, label, ext, RESET_COLOR
+        )
 
-    # TODO: Allow creating these environments in a pre-determined temp directory
-    # remove directory if it exists
-    if (here / "env" / environment).exists():
-        shutil.rmtree("env" + os.sep + environment)
-    invoke.run("python -m venv env{}{}".format(os.sep, environment))
-    other_dependencies(ctx, server, environment)
+    if python is None:
+        result = installer.create(environment, log=log)
+    else:
+        result = installer.create(environment, python=python[1], log=log)
+    if result.failed:
+        return failed("Something broke trying to create a virtual environment.", result)
+    if not other_dependencies(ctx, server, environment, installer, log, exit_on_error):
+        return False, "{}{} install {} broken{}".format(
+            ERROR_COLOR, label, ext, RESET_COLOR
+        )
 
-    pip_args = " --no-cache"
+    pip_args = " --no-cache" + wheelhouse_args(ctx)
     # build isolation fails on the Test PyPI server, because the server does
     # not host a version of "setuptools"
     if server in ["testpypi", "pypitest"]:
         pip_args += " --no-build-isolation"
 
     if server == "local":
-        result = invoke.run(
-            ".{0}env{0}{1}{0}{2}{0}pip{3} install {4}{5}".format(
-                os.sep,
-                environment,
-                VENV_BIN,
-                PIP_EXT,
-                the_file,
-                pip_args,
-            ),
-            hide=True,
-        )
+        result = installer.install(environment, "{}{}".format(the_file, pip_args), log)
     else:
         # print("  **Install from server**")
-        result = invoke.run(
-            ".{0}env{0}{1}{0}{2}{0}pip{3} install -i {4} {5}=={6}{7}".format(
-                os.sep,
-                environment,
-                VENV_BIN,
-                PIP_EXT,
-                server_url(server, download=True),
+        result = installer.install(
+            environment,
+            "-i {} {}=={}{}".format(
+                server_url(server, download=True, ctx=ctx),
                 pypi_name(ctx),
                 version,
                 pip_args,
             ),
-            hide=True,
+            log,
         )
-        if result.failed:
-            print(
-                "[{}ERROR{}] Something broke trying to install your package.".format(
-                    ERROR_COLOR, RESET_COLOR
-                )
-            )
-            print(result.stderr)
-            sys.exit(1)
-    print("** Test version of installed package **")
+    if result.failed:
+        return failed("Something broke trying to install your package.", result)
 
     # this is (supposed) to be the same command, but command line escaping is
     # different...
     if os.name == "nt":
         result = invoke.run(
-            "env{0}{1}{0}{2}{0}python{3} -c "
+            "{1}{0}{2}{0}python{3} -c "
             'exec("""from {4} import __version__\\nprint(__version__)""")'.format(
                 os.sep,
                 environment,
                 VENV_BIN,
                 PIP_EXT,
                 (ctx.releaser.module_name).strip(),
-            )
+            ),
+            warn=True,
+            hide=True,
         )
     else:
         result = invoke.run(
-            ".{0}env{0}{1}{0}{2}{0}python{3} -c "
-            "'exec(\\\"\\\"\\\"from {4} import __version__\\nprint(__version__)\\\"\\\"\\\")'".format(
+            "{1}{0}{2}{0}python{3} -c "
+            "'from {4} import __version__; print(__version__)'".format(
                 os.sep,
                 environment,
                 VENV_BIN,
                 PIP_EXT,
                 (ctx.releaser.module_name).strip(),
-            )
+            ),
+            warn=True,
+            hide=True,
         )
     test_version = result.stdout.strip()
     # print(test_version, type(test_version), type(expected_version))
-    if Version(test_version) == version:
-        results = "{}{} install {} works!{}".format(
-            GOOD_COLOR, server, ext, RESET_COLOR
-        )
+    works = result.ok and validate(test_version) and Version(test_version) == version
+    if works:
+        results = "{}{} install {} works!{}".format(GOOD_COLOR, label, ext, RESET_COLOR)
     else:
         results = "{}{} install {} broken{}".format(
-            ERROR_COLOR, server, ext, RESET_COLOR
+            ERROR_COLOR, label, ext, RESET_COLOR
         )
-    print(results)
+    with _print_lock:
+        print("** Test version of installed package: {} **".format(test_version))
+        print(results)
+    return works, results
+
+
+def already_verified(state, pythons=None):
+    """
+    Determine if a file was installed successfully by an earlier release.
+
+    With several Python versions (`pythons`), it must have been verified on
+    each.
+    """
+    verified = state.get("verified", False)
+    if pythons is None or verified is True:
+        return bool(verified)
+    return bool(verified) and all(version in verified for version, _ in pythons)
+
+
+def skip_install(
+    state, local_works, remote_verify="install", hash_verified=False, pythons=None
+):
+    """
+    Determine if test installing a distribution can be skipped, and why.
+
+    Args:
+        state (dict): what earlier releases did with this exact file (see
+            `cache.artifact_state()`).
+        local_works (bool): whether this file installed from the local build.
+        remote_verify (str): see `remote_verify_mode()`.
+        hash_verified (bool): whether the server's copies of the files have
+            the same hashes as ours.
+
+    Returns
+    -------
+        str: "cached" if exactly this file was installed by an earlier
+        release, "sha256" if (in "hash" mode) the server's copy matches the
+        local file, which installed fine, or None if it needs installing.
+
+    """
+    if already_verified(state, pythons):
+        return "cached"
+    if remote_verify == "hash" and hash_verified and local_works:
+        return "sha256"
+    return None
+
+
+def check_installs(ctx, version, formats, server, installer, pythons):
+    """
+    Check installing each of `formats` on each of `pythons`, all at once.
+
+    Returns
+    -------
+        dict: of format to a dict of Python version to bool (whether the
+        install works).
+
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    jobs = [(ext, python) for ext in formats for python in pythons]
+    with ThreadPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as pool:
+        futures = [
+            pool.submit(
+                check_local_install,
+                ctx,
+                version,
+                ext,
+                server,
+                installer,
+                python,
+                exit_on_error=False,
+            )
+            for ext, python in jobs
+        ]
+    results = {ext: {} for ext in formats}
+    for (ext, python), future in zip(jobs, futures):
+        results[ext][python[0]] = future.result()[0]
     return results
 
 
+def print_install_matrix(matrix, versions):
+    """
+    Print the install checks as a table: a row per server and format, and a
+    column per Python version.
+
+    Each entry of `matrix` is either a dict (of Python version to bool), or
+    the reason the check was skipped ("cached" or "sha256").
+    """
+    rows = [("", versions)]
+    for (server, ext), results in matrix.items():
+        if isinstance(results, dict):
+            cells = [
+                {True: "ok", False: "FAIL"}.get(results.get(v, None), "-")
+                for v in versions
+            ]
+        else:
+            cells = [results] * len(versions)
+        rows.append(("{} {}".format(server, ext), cells))
+    first = max(len(label) for label, _ in rows) + 2
+    width = max(len(cell) for _, cells in rows for cell in cells) + 2
+    for i, (label, cells) in enumerate(rows):
+        line = label.ljust(first)
+        for j, cell in enumerate(cells):
+            padded = cell if j == len(cells) - 1 else cell.ljust(width)
+            if i > 0:
+                color = ERROR_COLOR if cell == "FAIL" else GOOD_COLOR
+                padded = color + padded + RESET_COLOR
+            line += padded
+        print(line)
+    print(
+        "(cached: unchanged since last checked; sha256: matches local build; "
+        "-: not checked)"
+    )
+
+
 @task(
-    optional=["bump", "skip-isort", "skip-local", "skip-test", "skip-pypi"],
+    optional=[
+        "bump",
+        "skip-isort",
+        "skip-local",
+        "skip-test",
+        "skip-pypi",
+        "yes",
+        "force-tests",
+    ],
     help={
         "bump": "What level to bump the version by. Setting this "
         "overrides the value set in your configuration. "
@@ -448,17 +1062,76 @@ def check_local_install(ctx, version, ext, server="local"):
         "skip-test": "Skip testing by uploading and installing to test " "PyPI server.",
         "skip-pypi": "Skip testing by uploading and installing to (the "
         "real) PyPI server.",
+        "yes": "Don't ask any questions. Answer 'yes' to confirmations "
+        "not otherwise answered by 'releaser.policy'; failures still stop "
+        "the release.",
+        "force-tests": "Run the test suite, even if it has already passed "
+        "on exactly this code.",
     },
 )
 def make_release(
-    ctx, bump=None, skip_local=False, skip_test=False, skip_pypi=False, skip_isort=False
+    ctx,
+    bump=None,
+    skip_local=False,
+    skip_test=False,
+    skip_pypi=False,
+    skip_isort=False,
+    yes=False,
+    force_tests=False,
 ):
     """Make and upload the release."""
+    timer = StageTimer()
+    try:
+        release(
+            ctx,
+            bump,
+            skip_local,
+            skip_test,
+            skip_pypi,
+            skip_isort,
+            yes,
+            force_tests=force_tests,
+            timer=timer,
+        )
+    finally:
+        timer.stop()
+        timer.report()
+        if "timings_file" in ctx.releaser and ctx.releaser.timings_file is not None:
+            timer.save(ctx.releaser.timings_file)
+
+
+def release(
+    ctx,
+    bump=None,
+    skip_local=False,
+    skip_test=False,
+    skip_pypi=False,
+    skip_isort=False,
+    yes=False,
+    force_tests=False,
+    git_state=None,
+    timer=None,
+):
+    """
+    Make and upload the release.
+
+    This is the body of the `make_release` task. See the task for the
+    meaning of most arguments.
+
+    Args:
+        git_state (dict): the result of `vcs.scan_status()`, if the git
+            repo has already been scanned (i.e. when releasing several
+            packages from one repo). Otherwise, the repo is scanned here.
+        timer (StageTimer): records how long each stage takes.
+    """
+    if timer is None:
+        timer = StageTimer()
+
     colorama.init()
     text.title("Minchin 'Make Release' for Python Projects v{}".format(__version__))
     print()
 
-    text.subtitle("Configuration")
+    timer.start("Configuration")
     extra_keys = [
         "here",
         "source",
@@ -468,6 +1141,7 @@ def make_release(
         "module_name",
     ]
     check_configuration(ctx, "releaser", extra_keys)
+    warn_unknown_policies(ctx)
 
     check_existence(ctx.releaser.here, "base dir", "releaser.here")
 
@@ -498,13 +1172,40 @@ def make_release(
     else:
         build_setup_py = True
         print(" "*18 + "Build using 'setup.py'")
+    installer = get_installer(ctx)
+    pythons = find_pythons(ctx)
+    if pythons:
+        print(
+            " " * 18
+            + "Test installs using '{}', on Python {}".format(
+                installer.name, ", ".join(version for version, _ in pythons)
+            )
+        )
+    else:
+        print(" " * 18 + "Test installs using '{}'".format(installer.name))
+        if pythons is not None:
+            print(
+                "[{}WARN{}] none of 'releaser.pythons' were found. Using "
+                "'python'.".format(WARNING_COLOR, RESET_COLOR)
+            )
+            pythons = None
     print()
 
-    text.subtitle("Git -- Clean directory?")
-    try:
-        repo = git.Repo(str(here))
-    except git.exc.InvalidGitRepositoryError:
-        repo = None
+    # clear out old test environments while we get on with the release
+    start_cleanup(ctx)
+
+    timer.start("Preflight Checks")
+    upload_servers = [
+        server
+        for server, skipped in [("testpypi", skip_test), ("pypi", skip_pypi)]
+        if not skipped
+    ]
+    preflight(ctx, upload_servers, assume_yes=yes)
+
+    timer.start("Git -- Clean directory?")
+    if git_state is None:
+        git_state = scan_status(here)
+    if git_state is None:
         print(
             textwrap.fill(
                 "[{}WARN{}] base directory does not appear to be "
@@ -514,8 +1215,21 @@ def make_release(
             )
         )
 
-    if repo is not None:
-        if repo.is_dirty():
+    else:
+        print(
+            "On branch {} at {}{}".format(
+                git_state["branch"] or "(detached HEAD)",
+                (git_state["commit"] or "(no commits)")[:10],
+                " (using fsmonitor)" if git_state["fsmonitor"] else "",
+            )
+        )
+        untracked = untracked_below(git_state, here)
+        if untracked:
+            print(
+                "[{}WARN{}] {} untracked file(s); these won't be "
+                "released.".format(WARNING_COLOR, RESET_COLOR, len(untracked))
+            )
+        if is_dirty_below(git_state, here):
             print(
                 textwrap.fill(
                     "[{}WARN{}] git repo is dirty. You should "
@@ -526,8 +1240,11 @@ def make_release(
                 )
             )
             # True = yes, False = Quit
-            ans = text.query_yes_quit(
-                " " * 7 + "Continue anyway or quit?", default="quit"
+            ans = ask(
+                ctx,
+                "on_dirty_repo",
+                " " * 7 + "Continue anyway or quit?",
+                assume_yes=yes,
             )
             if ans == text.Answers.QUIT:
                 sys.exit(1)
@@ -535,25 +1252,19 @@ def make_release(
             print("[{}GOOD{}] Clean Git repo.".format(GOOD_COLOR, RESET_COLOR))
     print()
 
-    text.subtitle("Sort Import Statements")
+    timer.start("Sort Import Statements")
     if not skip_isort:
-        for f in Path(ctx.releaser.source).resolve().glob("**/*.py"):
-            isort.file(f)
-            print(".", end="")
-        if ctx.releaser.test is not None:
-            for f in Path(ctx.releaser.test).resolve().glob("**/*.py"):
-                isort.file(f)
-                print(".", end="")
+        sort_imports(ctx.releaser.source, ctx.releaser.test)
         print(" Done!")
     else:
         print("[{}WARN{}] Skipped!".format(WARNING_COLOR, RESET_COLOR))
     print()
 
     if "vendor_packages" in ctx.releaser.keys():
-        text.subtitle("Vendorize!")
+        timer.start("Vendorize!")
         vendorize(ctx, internal_call=True)
 
-    text.subtitle("Run Tests")
+    timer.start("Run Tests")
     # check setup.py
     # python setup.py -r -s
     # https://stackoverflow.com/questions/30328259/what-does-python-setup-py-check-actually-do
@@ -566,15 +1277,46 @@ def make_release(
         )
         cmd_none = "none"
     if cmd_none != "none":
-        result = invoke.run(ctx.releaser.test_command, warn=True)
-        if not result.ok:
+        if git_state is not None:
+            # re-scan, as sorting imports and vendorizing may have changed files
+            test_key = test_cache_key(ctx, scan_status(here, untracked=False))
+        else:
+            test_key = test_cache_key(ctx)
+        previous = None if force_tests else passed_tests(ctx, test_key)
+        if previous is not None:
+            print(
+                "[{}GOOD{}] Tests already passed on this code at {} (taking "
+                "{:.1f}s). Skipped! Use '--force-tests' to run them "
+                "anyway.".format(
+                    GOOD_COLOR,
+                    RESET_COLOR,
+                    previous["passed_at"],
+                    previous["duration"],
+                )
+            )
+        else:
+            started = time.perf_counter()
+            shards = shard_count(ctx)
+            if shards > 1:
+                tests_ok = run_sharded(ctx, shards)
+            else:
+                result = run(ctx.releaser.test_command, log=stage_log(ctx, "tests"))
+                if result.failed:
+                    print_tail(result)
+                tests_ok = result.ok
+            if tests_ok:
+                record_passed_tests(ctx, test_key, time.perf_counter() - started)
+        if previous is None and not tests_ok:
             print(
                 "[{}WARN{}] the test suite reported errors.".format(
                     WARNING_COLOR, RESET_COLOR
                 )
             )
-            ans = text.query_yes_quit(
-                " " * 7 + "Continue anyway or quit?", default="quit"
+            ans = ask(
+                ctx,
+                "on_test_failure",
+                " " * 7 + "Continue anyway or quit?",
+                assume_yes=yes,
             )
             if ans == text.Answers.QUIT:
                 sys.exit(1)
@@ -582,27 +1324,30 @@ def make_release(
         print("[{}WARN{}] No test command given.".format(WARNING_COLOR, RESET_COLOR))
     print()
 
-    text.subtitle("Update Version Number")
-    old_version, new_version = update_version_number(ctx, bump)
+    timer.start("Update Version Number")
+    old_version, new_version = update_version_number(
+        ctx, bump, assume_yes=yes, git_state=git_state
+    )
     print()
 
-    text.subtitle("Add Release to Changelog")
+    timer.start("Add Release to Changelog")
     if old_version == new_version:
         print(
             "[{}WARN{}] Version hasn't changed. Not updating Changelog.".format(
                 WARNING_COLOR, RESET_COLOR
             )
         )
-    else:
+    elif str(ctx.releaser.get("changelog", None)).lower() == "none":
         print(
-            "[{}WARN{}] I can't do this yet, but you probably should.\n"
-            "           Not updating Changelog.".format(WARNING_COLOR, RESET_COLOR)
+            "[{}WARN{}] No changelog given. Use key 'releaser.changelog'.".format(
+                WARNING_COLOR, RESET_COLOR
+            )
         )
-        # https://github.com/bitprophet/releases/blob/master/releases/util.py#L21
-        # https://github.com/pyinvoke/invocations/blob/master/invocations/packaging/release.py#L362
+    else:
+        update_changelog(ctx, here, git_state, old_version, new_version)
     print()
 
-    text.subtitle("Build Documentation")
+    timer.start("Build Documentation")
     try:
         cmd_none = (ctx.releaser.doc_command).lower()
     except (AttributeError, KeyError):
@@ -614,15 +1359,44 @@ def make_release(
         )
         cmd_none = "none"
     if cmd_none != "none":
-        result = invoke.run(ctx.releaser.doc_command, warn=True)
-        if not result.ok:
+        if doc_output(ctx) is not None:
+            if git_state is not None:
+                doc_key = doc_cache_key(
+                    ctx, new_version, scan_status(here, untracked=False)
+                )
+            else:
+                doc_key = doc_cache_key(ctx, new_version)
+            previous = restore_docs(ctx, doc_key)
+        else:
+            previous = None
+        if previous is not None:
+            print(
+                "[{}GOOD{}] Documentation unchanged since {} (taking {:.1f}s "
+                "to build). Restored from cache.".format(
+                    GOOD_COLOR,
+                    RESET_COLOR,
+                    previous["built_at"],
+                    previous["duration"],
+                )
+            )
+        else:
+            started = time.perf_counter()
+            result = run(ctx.releaser.doc_command, log=stage_log(ctx, "docs"))
+            if result.failed:
+                print_tail(result)
+            if result.ok and doc_output(ctx) is not None:
+                save_docs(ctx, doc_key, time.perf_counter() - started)
+        if previous is None and not result.ok:
             print(
                 "[{}WARN{}] the documentation generation reported errors.".format(
                     WARNING_COLOR, RESET_COLOR
                 )
             )
-            ans = text.query_yes_quit(
-                " " * 7 + "Continue anyway or quit?", default="quit"
+            ans = ask(
+                ctx,
+                "on_doc_failure",
+                " " * 7 + "Continue anyway or quit?",
+                assume_yes=yes,
             )
             if ans == text.Answers.QUIT:
                 sys.exit(1)
@@ -634,29 +1408,62 @@ def make_release(
         )
     print()
 
-    ans = text.query_yes_quit("All good and ready to go?")
+    ans = ask(ctx, "confirm_release", "All good and ready to go?", assume_yes=yes)
     if ans == text.Answers.QUIT:
         sys.exit(1)
     print()
 
-    text.subtitle("Build Distributions")
-    build_distribution(build_setup_py, build_pyproject)
+    timer.start("Build Distributions")
+    file_formats = ["tar.gz", "whl"]
+    dist_dir = here / "dist"
+    source_date_epoch = None
+    if ctx.releaser.get("reproducible", False):
+        if git_state is not None:
+            source_date_epoch = commit_timestamp(git_state)
+        if source_date_epoch is None:
+            print(
+                "[{}WARN{}] can't find the time of the current commit, so the "
+                "build won't be reproducible.".format(WARNING_COLOR, RESET_COLOR)
+            )
+    previous_hashes = read_manifest(dist_dir)
+    build_distribution(
+        build_setup_py, build_pyproject, source_date_epoch, stage_log(ctx, "build")
+    )
+    dist_files = {ext: latest_distribution(dist_dir, ext) for ext in file_formats}
+    if source_date_epoch is not None:
+        for dist_file in dist_files.values():
+            normalize(dist_file, source_date_epoch)
+    hashes = write_manifest(dist_dir, dist_files.values())
+    for name, sha256 in sorted(hashes.items()):
+        if previous_hashes.get(name, None) == sha256:
+            print("{} is unchanged since the last build.".format(name))
+        else:
+            print("{} sha256 {}".format(name, sha256))
     print()
 
-    text.subtitle("Check Readme Rendering")
-    result = invoke.run("twine check dist/*", warn=True)
-    if not result.ok:
+    timer.start("Check Distribution Contents")
+    if git_state is None:
         print(
-            "[{}WARN{}] Readme reported ReST rendering errors.".format(
-                WARNING_COLOR, RESET_COLOR
-            )
+            "[{}WARN{}] not a git repo; skipping the distribution contents "
+            "check.".format(WARNING_COLOR, RESET_COLOR)
         )
-        ans = text.query_yes_quit(" " * 7 + "Continue anyway or quit?", default="quit")
-        if ans == text.Answers.QUIT:
-            sys.exit(1)
+        print()
     else:
-        print("[{}GOOD{}] Readme renders.".format(GOOD_COLOR, RESET_COLOR))
-    print()
+        check_dist_contents(
+            ctx, here, git_state, list(dist_files.values()), assume_yes=yes
+        )
+
+    timer.start("Check Distribution Sizes")
+    dist_sizes = check_dist_sizes(ctx, dist_dir, dist_files, assume_yes=yes)
+
+    # check the readme renders while the local installs are tested
+    from concurrent.futures import ThreadPoolExecutor
+
+    readme_executor = ThreadPoolExecutor(max_workers=1)
+    readme_check = readme_executor.submit(
+        check_distributions, ctx, list(dist_files.values()), hashes
+    )
+    readme_executor.shutdown(wait=False)
 
     server_list = []
     if not skip_local:
@@ -666,60 +1473,198 @@ def make_release(
     if not skip_pypi:
         server_list.append("pypi")
 
+    remote_verify = remote_verify_mode(ctx)
     success_list = []
+    install_matrix = {}
+    local_works = {}
     for server in server_list:
-        for file_format in ["tar.gz", "whl"]:
-            text.subtitle("Test {} Build {}".format(file_format, server))
-            s = check_local_install(ctx, new_version, file_format, server)
-            success_list.append(s)
+        # what earlier releases did with files identical to these
+        known = {
+            name: state
+            for name, state in artifact_state(ctx, server).items()
+            if name in hashes and state["sha256"] == hashes[name]
+        }
+        hash_verified = False
+        if server != "local":
+            if readme_check is not None:
+                timer.start("Check Readme Rendering")
+                report_readme_check(ctx, readme_check.result(), assume_yes=yes)
+                readme_check = None
+            timer.start("Upload to {}".format(server))
+            to_upload = [
+                f
+                for f in dist_files.values()
+                if not known.get(f.name, {}).get("uploaded", False)
+            ]
+            for f in dist_files.values():
+                if f not in to_upload:
+                    print("{} was already uploaded. Skipping.".format(f.name))
+            on_server = [f for f in dist_files.values() if f not in to_upload]
+            if to_upload:
+                uploaded = upload(ctx, server, to_upload, assume_yes=yes)
+                for f in to_upload:
+                    ok, message = uploaded[f.name]
+                    if ok:
+                        record_artifact(
+                            ctx, server, f.name, hashes[f.name], uploaded=True
+                        )
+                    if ok or message == ALREADY_UPLOADED:
+                        on_server.append(f)
+            # only released distributions are compared against next time
+            for file_format, f in dist_files.items():
+                if f in on_server:
+                    record_sizes(ctx, file_format, f.name, dist_sizes[file_format])
             print()
 
-    text.subtitle("Install Test Summary")
-    for line in success_list:
-        print(line)
+            # wait until the index has the files, so they can be installed
+            timer.start("Wait for {}".format(server))
+            found = wait_for_files(
+                simple_index_url(server, ctx),
+                pypi_name(ctx),
+                on_server,
+                timeout=ctx.releaser.get("index_timeout", None) or INDEX_TIMEOUT,
+            )
+            # the index's copies are known to be ours only if it gives hashes
+            hash_verified = report_files(found, dist_files.values()) and all(
+                found.values()
+            )
+            print()
+        to_check = []
+        for file_format in file_formats:
+            skipped = skip_install(
+                known.get(dist_files[file_format].name, {}),
+                local_works.get(file_format, False),
+                remote_verify,
+                hash_verified,
+                pythons,
+            )
+            if skipped == "cached":
+                success_list.append(
+                    "{}{} {} unchanged since last checked{}".format(
+                        GOOD_COLOR, server, file_format, RESET_COLOR
+                    )
+                )
+                if server == "local":
+                    local_works[file_format] = True
+            elif skipped == "sha256":
+                success_list.append(
+                    "{}{} {} matches local build (sha256){}".format(
+                        GOOD_COLOR, server, file_format, RESET_COLOR
+                    )
+                )
+            else:
+                to_check.append(file_format)
+            if skipped is not None:
+                install_matrix[(server, file_format)] = skipped
+
+        if pythons is None:
+            for file_format in to_check:
+                name = dist_files[file_format].name
+                timer.start("Test {} Build {}".format(file_format, server))
+                works, s = check_local_install(
+                    ctx, new_version, file_format, server, installer
+                )
+                if server == "local":
+                    local_works[file_format] = works
+                if works:
+                    record_artifact(ctx, server, name, hashes[name], verified=True)
+                success_list.append(s)
+                print()
+        elif to_check:
+            timer.start("Test Builds {}".format(server))
+            results = check_installs(
+                ctx, new_version, to_check, server, installer, pythons
+            )
+            for file_format in to_check:
+                name = dist_files[file_format].name
+                install_matrix[(server, file_format)] = results[file_format]
+                works = all(results[file_format].values())
+                if server == "local":
+                    local_works[file_format] = works
+                passed = [v for v, ok in sorted(results[file_format].items()) if ok]
+                if passed:
+                    record_artifact(ctx, server, name, hashes[name], verified=passed)
+            if not all(all(by_python.values()) for by_python in results.values()):
+                # without `pythons`, a broken install stops the release
+                ans = ask(
+                    ctx,
+                    "on_install_failure",
+                    "[{}ERROR{}] Some test installs from {} failed. Continue "
+                    "anyway?".format(ERROR_COLOR, RESET_COLOR, server),
+                    assume_yes=yes,
+                )
+                if ans == text.Answers.QUIT:
+                    sys.exit(1)
+            print()
+
+    if readme_check is not None:
+        timer.start("Check Readme Rendering")
+        report_readme_check(ctx, readme_check.result(), assume_yes=yes)
+
+    timer.start("Install Test Summary")
+    if pythons is None:
+        for line in success_list:
+            print(line)
+    else:
+        print_install_matrix(install_matrix, [version for version, _ in pythons])
     print()
 
     # git commit
 
-    if repo is not None:
-        text.subtitle("Create Git Tag")
+    if git_state is not None:
+        timer.start("Create Git Tag")
         _create_tag = True
 
+        tag = tag_name(ctx, new_version)
         # don't duplicate existing tag
-        tags = repo.tags
-        for tag in tags:
-            if tag.name == new_version:
-                print(
-                    "[{}WARN{}] Git tag for version {} already exists. "
-                    "Skipping.".format(WARNING_COLOR, RESET_COLOR, tag.name)
-                )
-                _create_tag = False
-                break
-
+        if has_tag(git_state, tag):
+            print(
+                "[{}WARN{}] Git tag {} already exists. "
+                "Skipping.".format(WARNING_COLOR, RESET_COLOR, tag)
+            )
+            _create_tag = False
         # warn on pre-release versions
-        if new_version.prerelease:
+        elif new_version.prerelease:
             print(
                 "[{}WARN{}] Currently a pre-release version.".format(
                     WARNING_COLOR, RESET_COLOR
                 )
             )
             # True = yes, False = Quit
-            ans = text.query_yes_no(" " * 7 + "Create Git tag anyway?", default="no")
+            ans = ask(
+                ctx,
+                "create_tag",
+                " " * 7 + "Create Git tag anyway?",
+                assume_yes=yes,
+                quit_option=False,
+            )
             if ans == text.Answers.NO:
                 _create_tag = False
         else:
-            ans = text.query_yes_no(
-                "Create Git tag for version {}?".format(new_version), default="no"
+            ans = ask(
+                ctx,
+                "create_tag",
+                "Create Git tag {}?".format(tag),
+                assume_yes=yes,
+                quit_option=False,
             )
             if ans == text.Answers.NO:
                 _create_tag = False
 
         if _create_tag:
-            print("Creating Git tag for version {}".format(new_version))
-            repo.create_tag(new_version)
+            print("Creating Git tag {}".format(tag))
+            create_tag(git_state, tag)
         print()
 
-    text.subtitle("Bump Version to Pre-release?")
-    ans = text.query_yes_no("Bump version to pre-release now?")
+    timer.start("Bump Version to Pre-release?")
+    ans = ask(
+        ctx,
+        "bump_to_prerelease",
+        "Bump version to pre-release now?",
+        assume_yes=yes,
+        quit_option=False,
+    )
     if ans == text.Answers.YES:
-        old_version, new_version = update_version_number(ctx, "prerelease", True)
+        old_version, new_version = update_version_number(
+            ctx, "prerelease", True, assume_yes=yes
+        )
@@ -0,0 +1,435 @@
+import os
+import re
+import sys
+from pathlib import Path
+
+import colorama
+import invoke
+from invoke import task
+
+from ._vendor import text
+from .constants import (
+    ERROR_COLOR,
+    GOOD_COLOR,
+    RESET_COLOR,
+    WARNING_COLOR,
+    __version__,
+)
+from .make_release import VALID_BUMPS_STR, release
+from .runner import run
+from .util import check_configuration, check_existence, normalize_name
+from .vcs import scan_status
+from .vendorize import read_requirements
+
+requirement_name_re = re.compile(r"\s*(?P<name>[A-Za-z0-9][A-Za-z0-9._-]*)")
+
+
+def plain(data):
+    """Turn (nested) invoke configuration into plain (picklable) Python objects."""
+    if hasattr(data, "keys"):
+        return {key: plain(data[key]) for key in data.keys()}
+    elif isinstance(data, (list, tuple)):
+        return [plain(item) for item in data]
+    return data
+
+
+def package_configs(ctx):
+    """
+    Determine the configuration of each package listed under `releaser.packages`.
+
+    Each package's configuration is layered: the shared `releaser` block is
+    at the bottom, then the `releaser` block of the `invoke.yaml` in the
+    package's own base directory (if there is one), and finally the keys given
+    for the package under `releaser.packages`. Unless set, `tag_format` is
+    "{name}-{version}", so the packages' tags don't collide.
+
+    Returns
+    -------
+        dict: package name -> (base directory, configuration dict)
+
+    """
+    root = Path(ctx.releaser.here).resolve()
+    shared = plain(ctx.releaser)
+    for key in ["packages", "jobs", "here"]:
+        shared.pop(key, None)
+
+    configs = {}
+    for entry in ctx.releaser.packages:
+        entry = plain(entry)
+        if "here" not in entry:
+            exit(
+                "[{}ERROR{}] every entry in 'releaser.packages' needs a "
+                "'here' key.".format(ERROR_COLOR, RESET_COLOR)
+            )
+        here = (root / entry.pop("here")).resolve()
+
+        config = dict(shared)
+        project_config = invoke.Config(project_location=str(here))
+        project_config.load_project()
+        if "releaser" in project_config and project_config.releaser is not None:
+            config.update(plain(project_config.releaser))
+        config.update(entry)
+        # packages are released from their base directory
+        config["here"] = "."
+
+        name = config.pop("name", None) or config.get("module_name")
+        if name is None:
+            exit(
+                "[{}ERROR{}] can't determine the name of the package in "
+                "{}.".format(ERROR_COLOR, RESET_COLOR, here)
+            )
+        # the packages share the repo's tags, so keep each package's apart
+        config.setdefault("tag_format", "{name}-{version}")
+        configs[name] = (here, config)
+    return configs
+
+
+def requirement_names(here):
+    """Return the (normalized) names of the requirements of the package in `here`."""
+    names = set()
+    for filename in ["requirements.in", "requirements.txt"]:
+        if (here / filename).exists():
+            for line in read_requirements(str(here / filename)):
+                match = requirement_name_re.match(line)
+                if match:
+                    names.add(normalize_name(match.group("name")))
+            break
+    return names
+
+
+def dependency_graph(configs):
+    """
+    Work out which packages need to be released before which.
+
+    A package depends on the packages listed in its `depends_on` key, and on
+    any other package named in its `requirements.in` (or `requirements.txt`).
+
+    Returns
+    -------
+        dict: package name -> set of package names it depends on
+
+    """
+    by_pypi_name = {}
+    for name, (here, config) in configs.items():
+        by_pypi_name[normalize_name(config.get("pypi_name") or name)] = name
+        by_pypi_name[normalize_name(name)] = name
+
+    graph = {}
+    for name, (here, config) in configs.items():
+        depends_on = set(config.pop("depends_on", None) or [])
+        unknown = depends_on - set(configs)
+        if unknown:
+            exit(
+                "[{}ERROR{}] '{}' depends on unknown package(s): {}".format(
+                    ERROR_COLOR, RESET_COLOR, name, ", ".join(sorted(unknown))
+                )
+            )
+        for requirement in requirement_names(here):
+            if requirement in by_pypi_name:
+                depends_on.add(by_pypi_name[requirement])
+        depends_on.discard(name)
+        graph[name] = depends_on
+
+    release_order(graph)  # check for cycles
+    return graph
+
+
+def release_order(graph):
+    """
+    Sort packages into groups that can be released together.
+
+    Every package in a group only depends on packages in earlier groups.
+
+    Returns
+    -------
+        list: of lists of package names
+
+    """
+    remaining = {name: set(deps) for name, deps in graph.items()}
+    order = []
+    while remaining:
+        ready = sorted(name for name, deps in remaining.items() if not deps)
+        if not ready:
+            exit(
+                "[{}ERROR{}] circular dependency between packages: {}".format(
+                    ERROR_COLOR, RESET_COLOR, ", ".join(sorted(remaining))
+                )
+            )
+        order.append(ready)
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return order
+
+
+def select_packages(configs, graph, only=None):
+    """
+    Pick the packages to release, from a comma separated list (`only`).
+
+    Packages not selected are assumed to already be released, and so are
+    dropped from the dependencies of those that are.
+
+    Returns
+    -------
+        tuple: of the configurations and dependency graph of the selected
+        packages (all of them, if `only` isn't given).
+
+    """
+    if only:
+        selected = [name.strip() for name in only.split(",")]
+        unknown = set(selected) - set(configs)
+        if unknown:
+            exit(
+                "[{}ERROR{}] unknown package(s): {}".format(
+                    ERROR_COLOR, RESET_COLOR, ", ".join(sorted(unknown))
+                )
+            )
+        configs = {name: configs[name] for name in selected}
+    graph = {name: graph[name] & set(configs) for name in configs}
+    return configs, graph
+
+
+def build_wheelhouse(ctx, configs):
+    """
+    Build wheels, once, for the extra packages needed by any of our packages.
+
+    These are shared by every environment created to test the releases.
+    """
+    wheelhouse = Path(ctx.releaser.wheelhouse).resolve()
+    wheelhouse.mkdir(parents=True, exist_ok=True)
+
+    extra_pkgs = set()
+    for here, config in configs.values():
+        for pkgs in (config.get("extra_packages") or {}).values():
+            extra_pkgs.update(pkgs or [])
+
+    if extra_pkgs:
+        result = run(
+            "python -m pip wheel --wheel-dir {} {}".format(
+                wheelhouse, " ".join(sorted(extra_pkgs))
+            )
+        )
+        if result.ok:
+            print(
+                "[{}GOOD{}] Wheelhouse ready with {} package(s).".format(
+                    GOOD_COLOR, RESET_COLOR, len(extra_pkgs)
+                )
+            )
+        else:
+            print(
+                "[{}WARN{}] Couldn't build all wheels for the wheelhouse. "
+                "Packages will be downloaded as needed.".format(
+                    WARNING_COLOR, RESET_COLOR
+                )
+            )
+    else:
+        print("No extra packages to add to the wheelhouse.")
+
+    for here, config in configs.values():
+        config["wheelhouse"] = str(wheelhouse)
+
+
+def _release_package(here, config, options, git_state, log_file):
+    """
+    Release a single package. Run in a worker process.
+
+    Output goes to `log_file`, and nothing is ever read from stdin.
+
+    Returns
+    -------
+        int: the exit code of the release; 0 for success.
+
+    """
+    os.chdir(str(here))
+    ctx = invoke.Context(invoke.Config(overrides={"releaser": config}))
+    with open(log_file, mode="w", encoding="utf-8") as log, open(os.devnull) as null:
+        sys.stdout = sys.stderr = log
+        sys.stdin = null
+        try:
+            release(ctx, git_state=git_state, **options)
+        except SystemExit as e:
+            if e.code is None or e.code == 0:
+                return 0
+            if not isinstance(e.code, int):
+                print(e.code)
+                return 1
+            return e.code
+        finally:
+            log.flush()
+    return 0
+
+
+@task(
+    optional=["bump", "only", "jobs"],
+    help={
+        "bump": "What level to bump the version of each package by. Setting "
+        "this overrides the value set in your configuration. "
+        "Valid bump levels are {}.".format(VALID_BUMPS_STR),
+        "only": "Comma separated list of packages to release. Defaults to "
+        "all of them.",
+        "jobs": "How many packages to release at once. Defaults to "
+        "'releaser.jobs', or the number of CPUs.",
+        "skip-isort": "Skip applying isort to your files.",
+        "skip-local": "Skip testing by installing from local build distribution.",
+        "skip-test": "Skip testing by uploading and installing to test PyPI server.",
+        "skip-pypi": "Skip testing by uploading and installing to (the "
+        "real) PyPI server.",
+        "yes": "Answer 'yes' to anything not otherwise answered by "
+        "'releaser.policy'.",
+        "force-tests": "Run each test suite, even if it has already passed "
+        "on exactly that code.",
+    },
+)
+def make_releases(
+    ctx,
+    bump=None,
+    only=None,
+    jobs=None,
+    skip_local=False,
+    skip_test=False,
+    skip_pypi=False,
+    skip_isort=False,
+    yes=False,
+    force_tests=False,
+):
+    """Make releases of several packages in one repo."""
+    import multiprocessing
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    colorama.init()
+    text.title("Minchin 'Make Releases' for Python Monorepos v{}".format(__version__))
+    print()
+
+    text.subtitle("Configuration")
+    check_configuration(ctx, "releaser", ["here", "packages"])
+    check_existence(ctx.releaser.here, "base dir", "releaser.here")
+    here = Path(ctx.releaser.here).resolve()
+
+    configs = package_configs(ctx)
+    configs, graph = select_packages(configs, dependency_graph(configs), only)
+    for name, (package_here, config) in configs.items():
+        print("{: <14} -> {}".format(name, package_here))
+        # there is nobody to answer questions in the worker processes
+        config.setdefault("policy", {})
+        config["policy"] = dict(config["policy"] or {}, interactive=False)
+    print()
+
+    text.subtitle("Release Order")
+    for i, group in enumerate(release_order(graph), start=1):
+        print("{: >3}. {}".format(i, ", ".join(group)))
+    print()
+
+    text.subtitle("Git -- Scan Repo")
+    git_state = scan_status(here)
+    if git_state is None:
+        print(
+            "[{}WARN{}] base directory does not appear to be "
+            "a valid git repo.".format(WARNING_COLOR, RESET_COLOR)
+        )
+    else:
+        print(
+            "[{}GOOD{}] Scanned {}; {} dirty file(s).".format(
+                GOOD_COLOR,
+                RESET_COLOR,
+                git_state["root"],
+                len(git_state["dirty_paths"]),
+            )
+        )
+    print()
+
+    if "wheelhouse" in ctx.releaser and ctx.releaser.wheelhouse is not None:
+        text.subtitle("Build Shared Wheelhouse")
+        build_wheelhouse(ctx, configs)
+        print()
+
+    text.subtitle("Release Packages")
+    if jobs is None:
+        jobs = ctx.releaser.get("jobs", None) or os.cpu_count() or 1
+    jobs = max(int(jobs), 1)
+    log_dir = here / "release-logs"
+    log_dir.mkdir(exist_ok=True)
+
+    options = {
+        "bump": bump,
+        "skip_local": skip_local,
+        "skip_test": skip_test,
+        "skip_pypi": skip_pypi,
+        "skip_isort": skip_isort,
+        "yes": yes,
+        "force_tests": force_tests,
+    }
+    # forking means workers don't need to re-import everything
+    if "fork" in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context("fork")
+    else:
+        mp_context = None
+
+    results = {}
+    running = {}
+    remaining = dict(graph)
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=mp_context) as executor:
+        while remaining or running:
+            for name in sorted(remaining):
+                deps = remaining[name]
+                if any(results.get(dep, 0) != 0 for dep in deps):
+                    print(
+                        "[{}WARN{}] skipping {}, as a dependency "
+                        "failed.".format(WARNING_COLOR, RESET_COLOR, name)
+                    )
+                    results[name] = None
+                    del remaining[name]
+                elif all(dep in results for dep in deps):
+                    package_here, config = configs[name]
+                    log_file = log_dir / "{}.log".format(name)
+                    print("Starting {} (log at {})".format(name, log_file))
+                    future = executor.submit(
+                        _release_package,
+                        package_here,
+                        config,
+                        options,
+                        git_state,
+                        str(log_file),
+                    )
+                    running[future] = name
+                    del remaining[name]
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    print(
+                        "[{}ERROR{}] {} crashed: {!r}".format(
+                            ERROR_COLOR, RESET_COLOR, name, e
+                        )
+                    )
+                    results[name] = 1
+                if results[name] == 0:
+                    print(
+                        "[{}GOOD{}] {} released.".format(GOOD_COLOR, RESET_COLOR, name)
+                    )
+                else:
+                    print(
+                        "[{}ERROR{}] {} failed (exit code {}).".format(
+                            ERROR_COLOR, RESET_COLOR, name, results[name]
+                        )
+                    )
+    print()
+
+    text.subtitle("Release Summary")
+    for name in configs:
+        if results.get(name) == 0:
+            status = "{}released{}".format(GOOD_COLOR, RESET_COLOR)
+        elif results.get(name) is None:
+            status = "{}skipped{}".format(WARNING_COLOR, RESET_COLOR)
+        else:
+            status = "{}failed{}".format(ERROR_COLOR, RESET_COLOR)
+        print("{: <14} -> {}".format(name, status))
+    print()
+
+    if any(code != 0 for code in results.values()):
+        sys.exit(1)
@@ -0,0 +1,162 @@
+import sys
+
+from ._vendor import text
+from .constants import ERROR_COLOR, RESET_COLOR, WARNING_COLOR
+
+# Every question `make_release` might ask, and the answer assumed if the
+# question is asked in non-interactive mode with no policy given. Policies are
+# set under the `releaser.policy` configuration key.
+POLICY_KEYS = {
+    "on_dirty_repo": "quit",
+    "on_version_guess": "yes",
+    "on_prerelease": "quit",
+    "on_test_failure": "quit",
+    "on_doc_failure": "quit",
+    "confirm_release": "quit",
+    "on_readme_failure": "quit",
+    "on_incomplete_dist": "quit",
+    "on_install_failure": "quit",
+    "on_dist_bloat": "quit",
+    "create_tag": "no",
+    "bump_to_prerelease": "yes",
+}
+# the questions `--yes` answers; the others (the failure gates) still take
+# their default answer, unless a policy is set for them
+CONFIRMATION_KEYS = [
+    "on_version_guess",
+    "confirm_release",
+    "create_tag",
+    "bump_to_prerelease",
+]
+
+YES_ANSWERS = ["yes", "y", "true", "continue", "ignore"]
+NO_ANSWERS = ["no", "n", "false", "quit", "q", "abort", "stop", "skip"]
+ASK_ANSWERS = ["ask", "prompt", "none"]
+
+
+def _policy(ctx):
+    try:
+        policy = ctx.releaser.policy
+    except (AttributeError, KeyError):
+        policy = None
+    return policy if policy is not None else {}
+
+
+def is_interactive(ctx, assume_yes=False):
+    """
+    Determine if we can ask the user questions (i.e. read from stdin).
+
+    Non-interactive mode is turned on by passing `--yes` on the command line,
+    or by setting `releaser.policy.interactive` to `false`.
+    """
+    if assume_yes:
+        return False
+    interactive = _policy(ctx).get("interactive", True)
+    if isinstance(interactive, str):
+        interactive = interactive.lower() not in NO_ANSWERS
+    return bool(interactive)
+
+
+def policy_answer(ctx, key):
+    """
+    Return the configured answer to a question.
+
+    Returns
+    -------
+        str: one of "yes" or "no", or None if the question is to be asked.
+
+    """
+    value = _policy(ctx).get(key, None)
+    # YAML turns a bare `yes` and `no` into booleans
+    if value is None:
+        return None
+    elif value is True:
+        return "yes"
+    elif value is False:
+        return "no"
+
+    value = str(value).lower()
+    if value in YES_ANSWERS:
+        return "yes"
+    elif value in NO_ANSWERS:
+        return "no"
+    elif value in ASK_ANSWERS:
+        return None
+    else:
+        exit(
+            "[{}ERROR{}] invalid policy '{}' for 'releaser.policy.{}'. Valid "
+            "values are 'yes', 'no', 'continue', 'abort', or 'ask'.".format(
+                ERROR_COLOR, RESET_COLOR, value, key
+            )
+        )
+
+
+def ask(ctx, key, question, default=None, assume_yes=False, quit_option=True):
+    """
+    Ask the user a question, unless policy already answers it.
+
+    Args:
+        ctx (invoke.context):
+        key (str): the sub-key of `releaser.policy` that answers this question.
+        question (str): the question, as presented to the user.
+        default (str): the answer used when the user just hits <Enter>, or
+            when running non-interactively without a policy for the
+            question. Defaults to the value in `POLICY_KEYS`.
+        assume_yes (bool): answer "yes" to any confirmation (one of
+            `CONFIRMATION_KEYS`) without a policy, and don't ask the rest
+            (i.e. `--yes` on the command line).
+        quit_option (bool): whether this is a yes/quit question (rather than a
+            yes/no question).
+
+    Returns
+    -------
+        text.Answers: YES, and one of QUIT or NO (depending on
+        `quit_option`).
+
+    """
+    if default is None:
+        default = POLICY_KEYS[key]
+    negative = text.Answers.QUIT if quit_option else text.Answers.NO
+
+    answer = policy_answer(ctx, key)
+    source = "policy 'releaser.policy.{}'".format(key)
+    if answer is None and assume_yes and key in CONFIRMATION_KEYS:
+        answer = "yes"
+        source = "'--yes'"
+    elif answer is None and not is_interactive(ctx, assume_yes):
+        answer = "yes" if default == "yes" else "no"
+        source = "default, non-interactive mode"
+
+    if answer is None:
+        if quit_option:
+            return text.query_yes_quit(question, default=default)
+        else:
+            return text.query_yes_no(question, default=default)
+
+    print(
+        "{} -> {} (from {})".format(
+            question, "yes" if answer == "yes" else negative.name.lower(), source
+        )
+    )
+    return text.Answers.YES if answer == "yes" else negative
+
+
+def require_interactive(ctx, assume_yes, message):
+    """Exit, rather than blocking on stdin, when running non-interactively."""
+    if not is_interactive(ctx, assume_yes):
+        print(
+            "[{}ERROR{}] {} Running non-interactively, so not asking. "
+            "Exiting...".format(ERROR_COLOR, RESET_COLOR, message)
+        )
+        sys.exit(1)
+
+
+def warn_unknown_policies(ctx):
+    """Point out policy keys we don't know about (probably typos)."""
+    for key in _policy(ctx).keys():
+        if key != "interactive" and key not in POLICY_KEYS:
+            print(
+                "[{}WARN{}] unknown policy key 'releaser.policy.{}'.".format(
+                    WARNING_COLOR, RESET_COLOR, key
+                )
+            )
@@ -0,0 +1,177 @@
+import configparser
+import importlib.util
+import os
+import re
+import shlex
+import shutil
+from pathlib import Path
+
+from .constants import ERROR_COLOR, GOOD_COLOR, RESET_COLOR, WARNING_COLOR
+
+# Check, before anything else is done, that everything a release needs from
+# outside the package is there: `twine`, credentials, the test command, and
+# the servers. The checks run at the same time, each with a short timeout, so
+# a release that is bound to fail does so in seconds rather than after the
+# tests have run and the distributions have been built.
+
+# seconds to wait for a server, if not set by `releaser.preflight_timeout`
+PREFLIGHT_TIMEOUT = 5
+
+GOOD, WARN, ERROR = "GOOD", "WARN", "ERROR"
+COLORS = {GOOD: GOOD_COLOR, WARN: WARNING_COLOR, ERROR: ERROR_COLOR}
+
+# commands that aren't programs on the PATH, and characters that make a
+# command more than a simple one
+SHELL_BUILTINS = [
+    ".",
+    "cd",
+    "call",
+    "echo",
+    "exec",
+    "export",
+    "set",
+    "source",
+    "if",
+    "for",
+    "while",
+    "{",
+]
+SHELL_OPERATORS = ["&&", "||", ";", "|", "(", "`"]
+
+env_assignment_re = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*=")
+
+
+def check_twine():
+    """Check `twine` (used to upload) is installed."""
+    if importlib.util.find_spec("twine") is None:
+        return ERROR, "not installed; it's needed to upload"
+    return GOOD, "installed"
+
+
+def check_command(command):
+    """
+    Check the program `command` starts with can be found.
+
+    Leading ``VAR=value`` settings are skipped. If the program is a shell
+    builtin (e.g. ``cd``), or the command is more than a simple one (e.g.
+    uses ``&&``, or a pipe), the program it runs can't be told, so only a
+    warning is given.
+    """
+    try:
+        words = shlex.split(command, posix=os.name != "nt")
+    except ValueError:
+        return WARN, "can't read '{}'".format(command)
+    while words and env_assignment_re.match(words[0]):
+        words = words[1:]
+    if not words:
+        return WARN, "can't tell what '{}' runs".format(command)
+    program = words[0]
+    if program in SHELL_BUILTINS or any(c in command for c in SHELL_OPERATORS):
+        return WARN, "can't tell what '{}' runs".format(command)
+    if shutil.which(program) is None and not Path(program).is_file():
+        return WARN, "can't find '{}'".format(program)
+    return GOOD, program
+
+
+def pypirc_path():
+    """Return the path of the ``.pypirc`` file `twine` reads."""
+    return Path(os.environ.get("TWINE_CONFIG_FILE", "~/.pypirc")).expanduser()
+
+
+def check_credentials(server, pypirc=None, interactive=True):
+    """
+    Check there are credentials to upload to `server`.
+
+    They come from ``TWINE_USERNAME`` and ``TWINE_PASSWORD``, or the
+    `server` section of `pypirc`. The password may also be in your keyring,
+    which isn't checked here (it can be slow to open). If `server` is None
+    (i.e. the upload URL is overridden), `twine` doesn't read `pypirc`.
+    """
+    if os.environ.get("TWINE_USERNAME") and os.environ.get("TWINE_PASSWORD"):
+        return GOOD, "from TWINE_USERNAME and TWINE_PASSWORD"
+
+    pypirc = Path(pypirc) if pypirc is not None else pypirc_path()
+    config = configparser.RawConfigParser()
+    if server is not None:
+        try:
+            config.read(str(pypirc), encoding="utf-8")
+        except configparser.Error as e:
+            return ERROR, "can't read {}: {}".format(pypirc, e.message.splitlines()[0])
+    section = config[server] if config.has_section(server or "") else {}
+    username = os.environ.get("TWINE_USERNAME") or section.get("username", None)
+    password = os.environ.get("TWINE_PASSWORD") or section.get("password", None)
+    if username == "__token__" and password and not password.startswith("pypi-"):
+        return ERROR, "the API token for '{}' in {} isn't one".format(server, pypirc)
+    if username and password:
+        return GOOD, "from {}".format(pypirc)
+    if interactive:
+        return WARN, "none found; you'll be asked for them"
+    return WARN, "none found, other than (maybe) in your keyring"
+
+
+def check_url(url, timeout=PREFLIGHT_TIMEOUT):
+    """
+    Check the server at `url` can be reached.
+
+    Any response from the server (even an error, like "405 Method Not
+    Allowed", which upload URLs give) counts.
+    """
+    import urllib.error
+    import urllib.request
+
+    request = urllib.request.Request(url, method="HEAD")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout):
+            pass
+    except urllib.error.HTTPError:
+        pass
+    except (urllib.error.URLError, OSError) as e:
+        reason = getattr(e, "reason", e)
+        return ERROR, "can't reach {} ({})".format(url, reason)
+    return GOOD, url
+
+
+def run_checks(checks):
+    """
+    Run `checks`, all at once.
+
+    Args:
+        checks (list): of (name, function, args) tuples. Each function
+            returns a (status, message) tuple.
+
+    Returns
+    -------
+        list: of (name, status, message) tuples, in the order of `checks`.
+
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run_check(check):
+        name, function, args = check
+        try:
+            status, message = function(*args)
+        except Exception as e:
+            status, message = ERROR, "{}: {}".format(e.__class__.__name__, e)
+        return name, status, message
+
+    with ThreadPoolExecutor(max_workers=max(len(checks), 1)) as executor:
+        return list(executor.map(run_check, checks))
+
+
+def report(results):
+    """
+    Print the results of `run_checks()`, as one table.
+
+    Returns
+    -------
+        bool: whether every check passed (warnings are allowed).
+
+    """
+    width = max([len(name) for name, status, message in results] + [0])
+    for name, status, message in results:
+        print(
+            "[{}{}{}] {: <{}}  {}".format(
+                COLORS[status], status, RESET_COLOR, name, width, message
+            )
+        )
+    return all(status != ERROR for name, status, message in results)
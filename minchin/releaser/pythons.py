@@ -0,0 +1,69 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+from .constants import RESET_COLOR, WARNING_COLOR
+
+VERSION_PROBE = "import sys; print('{}.{}'.format(*sys.version_info[:2]))"
+
+
+def find_python(name):
+    """
+    Find the interpreter `name` (e.g. "python3.12", or a path), and its version.
+
+    Returns
+    -------
+        tuple: (version, executable), e.g. ("3.12", "/usr/bin/python3.12"),
+        or None if it can't be found or doesn't run.
+
+    """
+    executable = shutil.which(name)
+    if executable is None and Path(name).is_file():
+        executable = str(Path(name).resolve())
+    if executable is None:
+        return None
+    try:
+        result = subprocess.run(
+            [executable, "-c", VERSION_PROBE], capture_output=True, timeout=30
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.decode("utf-8", "replace").strip(), executable
+
+
+def find_pythons(ctx):
+    """
+    Find the interpreters listed in `releaser.pythons`.
+
+    Interpreters that can't be found are warned about, and skipped.
+
+    Returns
+    -------
+        list: of (version, executable) tuples, in the order listed; or None
+        if `releaser.pythons` isn't set (i.e. just use ``python``).
+
+    """
+    names = ctx.releaser.get("pythons", None)
+    if not names:
+        return None
+    if isinstance(names, str):
+        names = names.split()
+
+    pythons = []
+    for name in names:
+        found = find_python(str(name))
+        if found is None:
+            print(
+                "[{}WARN{}] can't find Python interpreter '{}'. "
+                "Skipping.".format(WARNING_COLOR, RESET_COLOR, name)
+            )
+        elif found[0] in [version for version, executable in pythons]:
+            print(
+                "[{}WARN{}] '{}' is Python {}, which is already listed. "
+                "Skipping.".format(WARNING_COLOR, RESET_COLOR, name, found[0])
+            )
+        else:
+            pythons.append(found)
+    return pythons
@@ -0,0 +1,128 @@
+import stat
+import time
+from pathlib import Path
+
+from .cache import file_sha256, replace_with, write_atomic
+
+MANIFEST_NAME = "SHA256SUMS"
+# zip files can't hold dates before 1980
+ZIP_EPOCH = 315532800
+
+
+def _normal_mode(mode, is_dir=False):
+    """Everything is either 0o755 (directories and executables) or 0o644."""
+    if is_dir or mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH):
+        return 0o755
+    return 0o644
+
+
+def normalize_sdist(path, epoch):
+    """
+    Rewrite a ``.tar.gz`` so it only depends on its contents and `epoch`.
+
+    Members are sorted by name, owned by root, have their permissions set to
+    0o644 or 0o755, and are dated no later than `epoch` (as is the gzip
+    header).
+    """
+    import gzip
+    import tarfile
+
+    def write(temp_name):
+        with tarfile.open(str(path), "r:gz") as src:
+            members = sorted(src.getmembers(), key=lambda m: m.name)
+            with open(temp_name, "wb") as raw, gzip.GzipFile(
+                filename="", mode="wb", fileobj=raw, mtime=epoch
+            ) as gz, tarfile.open(fileobj=gz, mode="w", format=src.format) as dst:
+                for member in members:
+                    member.mtime = min(member.mtime, epoch)
+                    member.uid, member.gid = 0, 0
+                    member.uname, member.gname = "root", "root"
+                    member.mode = _normal_mode(member.mode, member.isdir())
+                    for key in ["mtime", "atime", "ctime"]:
+                        member.pax_headers.pop(key, None)
+                    if member.isfile():
+                        dst.addfile(member, src.extractfile(member))
+                    else:
+                        dst.addfile(member)
+
+    replace_with(path, write)
+
+
+def normalize_wheel(path, epoch):
+    """
+    Rewrite a wheel (a zip file) so it only depends on its contents and `epoch`.
+
+    Entries are sorted by name (with the ``.dist-info`` folder last, and
+    ``RECORD`` last of all), dated `epoch`, and have their permissions set to
+    0o644 or 0o755. File contents are unchanged, so ``RECORD`` stays valid.
+    """
+    import zipfile
+
+    date_time = time.gmtime(max(epoch, ZIP_EPOCH))[:6]
+
+    def order(info):
+        name = info.filename
+        dist_info = ".dist-info/" in name
+        return (dist_info, dist_info and name.endswith("/RECORD"), name)
+
+    def write(temp_name):
+        with zipfile.ZipFile(str(path)) as src, zipfile.ZipFile(
+            temp_name, "w", compression=zipfile.ZIP_DEFLATED
+        ) as dst:
+            for info in sorted(src.infolist(), key=order):
+                new_info = zipfile.ZipInfo(info.filename, date_time=date_time)
+                new_info.compress_type = zipfile.ZIP_DEFLATED
+                new_info.create_system = 3  # unix, so the permissions are read
+                new_info.external_attr = (
+                    _normal_mode(info.external_attr >> 16, info.is_dir()) << 16
+                )
+                dst.writestr(new_info, src.read(info))
+
+    replace_with(path, write)
+
+
+def normalize(path, epoch):
+    """Normalize a distribution file (sdist or wheel) for reproducibility."""
+    if str(path).endswith(".whl"):
+        normalize_wheel(path, epoch)
+    elif str(path).endswith(".tar.gz"):
+        normalize_sdist(path, epoch)
+
+
+def read_manifest(dist_dir):
+    """
+    Read the hash manifest (``SHA256SUMS``) of a previous build.
+
+    Returns
+    -------
+        dict: of filename to sha256 hash. Empty if there is no manifest.
+
+    """
+    manifest = Path(dist_dir) / MANIFEST_NAME
+    hashes = {}
+    if manifest.exists():
+        for line in manifest.read_text().splitlines():
+            sha256, _, name = line.partition("  ")
+            if name:
+                hashes[name] = sha256
+    return hashes
+
+
+def write_manifest(dist_dir, files):
+    """
+    Write the hash manifest (``SHA256SUMS``) for `files`.
+
+    The format is that of ``sha256sum``, so it can be checked with
+    ``sha256sum -c SHA256SUMS``. Each file is read once.
+
+    Returns
+    -------
+        dict: of filename to sha256 hash.
+
+    """
+    hashes = {Path(f).name: file_sha256(f) for f in files}
+    write_atomic(
+        Path(dist_dir) / MANIFEST_NAME,
+        "".join("{}  {}\n".format(hashes[name], name) for name in sorted(hashes)),
+    )
+    return hashes
@@ -0,0 +1,145 @@
+import collections
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from .cache import cache_dir
+
+# Commands (builds, installs, the test suite) are run with their output sent
+# to a log file, as it's written, rather than to the screen or kept in memory.
+# Only the last few lines are kept, to show if the command fails.
+
+TAIL_LINES = 20
+# how often to update the progress line, in seconds
+PROGRESS_INTERVAL = 0.1
+
+
+class RunResult:
+    """The outcome of a command run by `run()`."""
+
+    def __init__(self, command, returncode, tail, log=None, seconds=0.0):
+        self.command = command
+        self.returncode = returncode
+        self.tail = list(tail)
+        self.log = log
+        self.seconds = seconds
+
+    @property
+    def ok(self):
+        return self.returncode == 0
+
+    @property
+    def failed(self):
+        return not self.ok
+
+    @property
+    def output(self):
+        """The last lines of output (stdout and stderr, interleaved)."""
+        return "".join(self.tail)
+
+
+def log_dir(ctx):
+    """
+    Return the folder to keep logs in, creating it if needed.
+
+    This is `releaser.log_dir` if set, or ``logs`` in our cache folder.
+    """
+    if "log_dir" in ctx.releaser and ctx.releaser.log_dir is not None:
+        my_dir = Path(ctx.releaser.log_dir).resolve()
+    else:
+        my_dir = cache_dir(ctx) / "logs"
+    my_dir.mkdir(parents=True, exist_ok=True)
+    return my_dir
+
+
+def stage_log(ctx, name):
+    """Return the (emptied) log file for the stage `name`."""
+    log = log_dir(ctx) / "{}.log".format(name)
+    log.write_bytes(b"")
+    return log
+
+
+def _show_progress(started, line):
+    width = shutil.get_terminal_size().columns - 1
+    status = "[{:.0f}s] {}".format(time.perf_counter() - started, line.strip())
+    sys.stdout.write("\r" + status[:width].ljust(width))
+    sys.stdout.flush()
+
+
+def run(command, log=None, env=None, tail=TAIL_LINES, progress=None):
+    """
+    Run `command` (through the shell), logging its output.
+
+    Output is read a line at a time, appended to `log` (if given), and only
+    the last `tail` lines are kept, so memory use doesn't grow with the
+    amount of output. While it runs, the latest line is shown on a single
+    (overwritten) line of the terminal.
+
+    Args:
+        command (str): the command to run.
+        log (Path): file to append the output to.
+        env (dict): environment variables to set, on top of ours.
+        tail (int): how many lines of output to keep.
+        progress (bool): whether to show the progress line. Defaults to
+            doing so if stdout is a terminal, and we're on the main thread.
+
+    Returns
+    -------
+        RunResult
+
+    """
+    if progress is None:
+        # commands run at the same time (in other threads) can't share it
+        progress = (
+            sys.stdout.isatty()
+            and threading.current_thread() is threading.main_thread()
+        )
+    full_env = None
+    if env:
+        full_env = dict(os.environ)
+        full_env.update(env)
+
+    lines = collections.deque(maxlen=tail)
+    started = time.perf_counter()
+    last_shown = 0.0
+    log_file = open(str(log), mode="ab") if log is not None else None
+    try:
+        if log_file is not None:
+            log_file.write("$ {}\n".format(command).encode("utf-8"))
+            log_file.flush()
+        process = subprocess.Popen(
+            command,
+            shell=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env=full_env,
+        )
+        for raw in process.stdout:
+            if log_file is not None:
+                log_file.write(raw)
+            line = raw.decode("utf-8", "replace")
+            lines.append(line)
+            if progress and time.perf_counter() - last_shown > PROGRESS_INTERVAL:
+                _show_progress(started, line)
+                last_shown = time.perf_counter()
+        returncode = process.wait()
+    finally:
+        if log_file is not None:
+            log_file.close()
+    if progress:
+        sys.stdout.write("\r" + " " * (shutil.get_terminal_size().columns - 1) + "\r")
+        sys.stdout.flush()
+    return RunResult(command, returncode, lines, log, time.perf_counter() - started)
+
+
+def print_tail(result, indent=" " * 7):
+    """Print the last lines of a command's output, and where to find the rest."""
+    for line in result.tail:
+        print(indent + line.rstrip())
+    if result.log is not None:
+        print("{}(full output in {})".format(indent, result.log))
@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Virtual environments (to test installing the distributions) are created in
+# a "scratch" folder. Each gets a unique name, so concurrent releases don't
+# trip over each other. They're left in place after the release (so a failed
+# install can be looked into), and removed, in the background, by a later
+# release once they're old enough.
+
+# how long to keep environments, in hours
+SCRATCH_RETENTION = 24
+TRASH_PREFIX = ".trash-"
+
+
+def scratch_root(ctx):
+    """
+    Return the folder to create environments in, creating it if needed.
+
+    This is `releaser.scratch_dir` if set (e.g. somewhere on a tmpfs), or the
+    `env` folder in the base directory otherwise.
+    """
+    if "scratch_dir" in ctx.releaser and ctx.releaser.scratch_dir is not None:
+        root = Path(os.path.expandvars(str(ctx.releaser.scratch_dir))).expanduser()
+    else:
+        root = Path(ctx.releaser.here) / "env"
+    root = root.resolve()
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def retention(ctx):
+    """Return how long to keep environments for, in seconds."""
+    hours = ctx.releaser.get("scratch_retention", None)
+    if hours is None:
+        hours = SCRATCH_RETENTION
+    return float(hours) * 60 * 60
+
+
+def new_environment(ctx, version, ext, server):
+    """
+    Create a new (empty) folder for a virtual environment.
+
+    Returns
+    -------
+        Path: of the folder, named for `version`, `ext`, and `server`, plus a
+        suffix unique to this run.
+
+    """
+    prefix = "env-{}-{}-{}-".format(version, ext, server)
+    return Path(tempfile.mkdtemp(prefix=prefix, dir=str(scratch_root(ctx))))
+
+
+def stale_environments(root, max_age, now=None):
+    """List the environments in `root` last modified more than `max_age` seconds ago."""
+    now = now if now is not None else time.time()
+    stale = []
+    for entry in os.scandir(str(root)):
+        if entry.name.startswith("env-") and entry.is_dir(follow_symlinks=False):
+            if now - entry.stat(follow_symlinks=False).st_mtime > max_age:
+                stale.append(Path(entry.path))
+    return stale
+
+
+def remove_environments(root, environments):
+    """
+    Remove `environments`, and anything left in the trash from earlier runs.
+
+    Each environment is renamed into the trash first (which is quick, and
+    means no one else will try to use it), and then deleted.
+    """
+    for environment in environments:
+        try:
+            os.replace(str(environment), str(root / (TRASH_PREFIX + environment.name)))
+        except OSError:
+            pass
+    for entry in os.scandir(str(root)):
+        if entry.name.startswith(TRASH_PREFIX):
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def start_cleanup(ctx):
+    """
+    Remove stale environments, in a background thread.
+
+    Returns
+    -------
+        threading.Thread: doing the cleanup, already started.
+
+    """
+    root = scratch_root(ctx)
+    max_age = retention(ctx)
+
+    def cleanup():
+        remove_environments(root, stale_environments(root, max_age))
+
+    thread = threading.Thread(target=cleanup, name="scratch-cleanup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,193 @@
+import heapq
+import os
+import shlex
+import subprocess
+from pathlib import Path
+
+from .cache import load_cache, save_cache
+from .constants import ERROR_COLOR, GOOD_COLOR, RESET_COLOR, WARNING_COLOR
+from .runner import print_tail, run, stage_log
+
+# Assumed run time of a test module we have never timed, if there are no
+# other timings to go by.
+DEFAULT_DURATION = 1.0
+
+
+def shard_count(ctx):
+    """
+    Return the number of shards to split the test suite into.
+
+    This is `releaser.test_shards`, which is either a number or ``auto`` (for
+    one shard per CPU). Defaults to 1 (i.e. no sharding).
+    """
+    shards = ctx.releaser.get("test_shards", None)
+    if shards is None:
+        return 1
+    if str(shards).lower() == "auto":
+        return os.cpu_count() or 1
+    return max(int(shards), 1)
+
+
+def discover_test_modules(test_dir, here):
+    """
+    Find the test modules (``test_*.py`` and ``*_test.py``) in `test_dir`.
+
+    Returns
+    -------
+        list: of paths, relative to `here` and in posix form.
+
+    """
+    test_dir = Path(test_dir)
+    here = Path(here)
+    modules = set(test_dir.glob("**/test_*.py")) | set(test_dir.glob("**/*_test.py"))
+    return sorted(path.resolve().relative_to(here).as_posix() for path in modules)
+
+
+def default_duration(modules, durations):
+    """
+    Return the run time to assume for any of `modules` not yet timed.
+
+    This is the median of the recorded durations of `modules`, or
+    `DEFAULT_DURATION` if none have been timed.
+    """
+    known = sorted(durations[module] for module in modules if module in durations)
+    return known[len(known) // 2] if known else DEFAULT_DURATION
+
+
+def split_shards(modules, durations, count):
+    """
+    Split `modules` into `count` shards of about equal run time.
+
+    The longest modules are placed first, each onto whichever shard is the
+    shortest so far. Modules without a recorded duration are assumed to take
+    as long as the typical (median) module.
+
+    Args:
+        modules (list): test modules.
+        durations (dict): of module to run time (in seconds), from earlier
+            runs.
+        count (int): number of shards.
+
+    Returns
+    -------
+        list: of shards, each a sorted list of modules. Empty shards are
+        dropped.
+
+    """
+    default = default_duration(modules, durations)
+
+    # (expected run time, shard number, modules)
+    shards = [(0.0, i, []) for i in range(count)]
+    for module in sorted(modules, key=lambda m: (-durations.get(m, default), m)):
+        total, i, shard = heapq.heappop(shards)
+        shard.append(module)
+        heapq.heappush(shards, (total + durations.get(module, default), i, shard))
+    return [
+        sorted(shard) for total, i, shard in sorted(shards, key=lambda s: s[1]) if shard
+    ]
+
+
+def quote_files(files):
+    if os.name == "nt":
+        return subprocess.list2cmdline(files)
+    return " ".join(shlex.quote(f) for f in files)
+
+
+def shard_command(ctx, files):
+    """
+    Build the command to run one shard.
+
+    The template is `releaser.test_shard_command`, which defaults to
+    ``{test_command} {files}``.
+    """
+    template = ctx.releaser.get("test_shard_command", None) or "{test_command} {files}"
+    return template.format(
+        test_command=ctx.releaser.test_command, files=quote_files(files)
+    )
+
+
+def _run_shard(command, log):
+    # shards run at the same time, so they can't share the progress line
+    result = run(command, log=log, progress=False)
+    return result, result.seconds
+
+
+def run_sharded(ctx, count):
+    """
+    Run the test suite split into `count` shards, all at once.
+
+    The output of each shard is logged (as ``tests-<n>``), and the end of it
+    printed if the shard fails. How long each module took is estimated from
+    its shard's run time, and used to balance the next run. If there's no
+    test folder (`releaser.test`) to find the modules in, the test suite is
+    run as one.
+
+    Returns
+    -------
+        bool: True if every shard passed.
+
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    here = Path(ctx.releaser.here).resolve()
+    test_dir = ctx.releaser.get("test", None)
+    if test_dir is None or str(test_dir).lower() == "none":
+        modules = []
+    else:
+        modules = discover_test_modules(here / test_dir, here)
+    durations = load_cache(ctx, "test_durations")
+    if not modules:
+        print(
+            "[{}WARN{}] no test modules found to shard. Running the test "
+            "suite as one.".format(WARNING_COLOR, RESET_COLOR)
+        )
+        result = run(ctx.releaser.test_command, log=stage_log(ctx, "tests"))
+        if result.failed:
+            print_tail(result)
+        return result.ok
+    shards = split_shards(modules, durations, count)
+    # (as used to split the shards, before any new timings are added)
+    default = default_duration(modules, durations)
+    print("Running {} test module(s) in {} shard(s).".format(len(modules), len(shards)))
+
+    with ThreadPoolExecutor(max_workers=max(len(shards), 1)) as executor:
+        futures = [
+            executor.submit(
+                _run_shard,
+                shard_command(ctx, shard),
+                stage_log(ctx, "tests-{}".format(i)),
+            )
+            for i, shard in enumerate(shards, start=1)
+        ]
+        all_ok = True
+        for i, (shard, future) in enumerate(zip(shards, futures), start=1):
+            result, seconds = future.result()
+            print(
+                "[{}] shard {}/{}: {} module(s) in {:.1f}s".format(
+                    (
+                        "{}GOOD{}".format(GOOD_COLOR, RESET_COLOR)
+                        if result.ok
+                        else "{}FAIL{}".format(ERROR_COLOR, RESET_COLOR)
+                    ),
+                    i,
+                    len(shards),
+                    len(shard),
+                    seconds,
+                )
+            )
+            if result.failed:
+                print_tail(result)
+            all_ok = all_ok and result.ok
+
+            # share the shard's time out between its modules, in proportion to
+            # how long we expected each to take
+            expected = {m: durations.get(m, default) for m in shard}
+            scale = seconds / sum(expected.values())
+            for module in shard:
+                durations[module] = expected[module] * scale
+
+    # forget modules that no longer exist
+    save_cache(
+        ctx, "test_durations", {m: durations[m] for m in modules if m in durations}
+    )
+    return all_ok
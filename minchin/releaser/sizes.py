@@ -0,0 +1,197 @@
+import re
+from pathlib import Path
+
+from .cache import load_cache, save_cache
+from .constants import GOOD_COLOR, RESET_COLOR, WARNING_COLOR
+
+# Compare the contents of each distribution to the last release's, to catch
+# files that shouldn't have been included (tests, data, build output...).
+
+# defaults for `releaser.size_limits`
+SIZE_LIMITS = {
+    # how much the distribution may grow (in total, unpacked), in percent
+    "growth": 20,
+    # how much the number of files may grow, in percent
+    "files_growth": 20,
+    # newly added files larger than this (in bytes) are flagged
+    "large_file": 1000000,
+}
+# how many of the biggest changes to list
+SHOW_CHANGES = 5
+
+dist_info_re = re.compile(r"^[^/]+-[^/-]+\.(dist-info|data)/")
+
+
+def human_size(size):
+    """Format `size` (in bytes) for people, e.g. "1.2 MB"."""
+    if abs(size) < 1000:
+        return "{} B".format(size)
+    if abs(size) < 1000000:
+        return "{:.1f} kB".format(size / 1000)
+    return "{:.1f} MB".format(size / 1000000)
+
+
+def archive_sizes(path):
+    """
+    List the (unpacked) size of each file in a distribution.
+
+    Names are made independent of the version: the top folder of an sdist is
+    dropped, and a wheel's ``.dist-info`` folder is renamed ``.dist-info``.
+
+    Returns
+    -------
+        dict: of file name to size, in bytes.
+
+    """
+    import tarfile
+    import zipfile
+
+    path = str(path)
+    sizes = {}
+    if path.endswith(".whl"):
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if not info.is_dir():
+                    name = dist_info_re.sub(r".\1/", info.filename)
+                    sizes[name] = info.file_size
+    else:
+        with tarfile.open(path, "r|gz") as tf:
+            for member in tf:
+                if member.isfile():
+                    sizes[member.name.partition("/")[2]] = member.size
+    return sizes
+
+
+def size_limits(ctx):
+    """Return the limits, from `releaser.size_limits` and our defaults."""
+    limits = dict(SIZE_LIMITS)
+    limits.update(ctx.releaser.get("size_limits", None) or {})
+    return limits
+
+
+def baseline(ctx, ext, name, search_dirs=()):
+    """
+    Find the sizes of the last release's distribution of type `ext`.
+
+    This is the last distribution (other than `name`) we recorded (see
+    `record_sizes()`), or else the most recent other distribution in
+    `search_dirs` (e.g. ``dist`` or the wheelhouse).
+
+    Returns
+    -------
+        dict: with keys "name" and "sizes", or None if there's nothing to
+        compare to.
+
+    """
+    entry = load_cache(ctx, "dist_sizes").get(ext, {})
+    for key in ["current", "previous"]:
+        record = entry.get(key, None)
+        if record and record["name"] != name:
+            return record
+
+    candidates = [
+        f
+        for directory in search_dirs
+        if directory is not None and Path(directory).is_dir()
+        for f in Path(directory).glob("*.{}".format(ext))
+        if f.name != name
+    ]
+    if not candidates:
+        return None
+    latest = max(candidates, key=lambda f: f.stat().st_mtime)
+    return {"name": latest.name, "sizes": archive_sizes(latest)}
+
+
+def record_sizes(ctx, ext, name, sizes):
+    """Remember the sizes of a distribution, to compare the next release to."""
+    cache = load_cache(ctx, "dist_sizes")
+    entry = cache.setdefault(ext, {})
+    current = entry.get("current", None)
+    if current and current["name"] != name:
+        entry["previous"] = current
+    entry["current"] = {"name": name, "sizes": sizes}
+    save_cache(ctx, "dist_sizes", cache)
+
+
+def compare_sizes(old, new, limits):
+    """
+    Compare the file sizes of two distributions.
+
+    Returns
+    -------
+        dict: with keys "old_total", "new_total", "old_count", "new_count",
+        "added" (list of (name, size)), "large" (the added files bigger than
+        the "large_file" limit), "changes" (the biggest changes in size, as
+        (name, old size, new size)), and "problems" (a list of strings, one
+        for each limit exceeded).
+
+    """
+    old_total, new_total = sum(old.values()), sum(new.values())
+    added = sorted(
+        ((name, size) for name, size in new.items() if name not in old),
+        key=lambda item: -item[1],
+    )
+    changes = sorted(
+        (
+            (name, old.get(name, 0), new.get(name, 0))
+            for name in set(old) | set(new)
+            if old.get(name, 0) != new.get(name, 0)
+        ),
+        key=lambda item: -abs(item[2] - item[1]),
+    )
+    large = [(name, size) for name, size in added if size > limits["large_file"]]
+
+    problems = []
+    if old_total and (new_total - old_total) * 100 > limits["growth"] * old_total:
+        problems.append(
+            "grew by {:.0f}% (the limit is {}%)".format(
+                (new_total - old_total) * 100 / old_total, limits["growth"]
+            )
+        )
+    if old and (len(new) - len(old)) * 100 > limits["files_growth"] * len(old):
+        problems.append(
+            "has {} more files ({:.0f}%; the limit is {}%)".format(
+                len(new) - len(old),
+                (len(new) - len(old)) * 100 / len(old),
+                limits["files_growth"],
+            )
+        )
+    for name, size in large:
+        problems.append("adds a large file: {} ({})".format(name, human_size(size)))
+
+    return {
+        "old_total": old_total,
+        "new_total": new_total,
+        "old_count": len(old),
+        "new_count": len(new),
+        "added": added,
+        "large": large,
+        "changes": changes[:SHOW_CHANGES],
+        "problems": problems,
+    }
+
+
+def report_sizes(name, result, baseline_name):
+    """Print how the distribution `name` compares to `baseline_name`."""
+    print(
+        "{}: {} unpacked ({:+} bytes), {} files ({:+}), vs. {}".format(
+            name,
+            human_size(result["new_total"]),
+            result["new_total"] - result["old_total"],
+            result["new_count"],
+            result["new_count"] - result["old_count"],
+            baseline_name,
+        )
+    )
+    for changed, old_size, new_size in result["changes"]:
+        print(
+            "{}{:>+10}  {}{}".format(
+                " " * 7, new_size - old_size, changed, "" if old_size else " (new)"
+            )
+        )
+    for problem in result["problems"]:
+        print("[{}WARN{}] {} {}".format(WARNING_COLOR, RESET_COLOR, name, problem))
+    if not result["problems"]:
+        print(
+            "[{}GOOD{}] {} is within size limits.".format(GOOD_COLOR, RESET_COLOR, name)
+        )
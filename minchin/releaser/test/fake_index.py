@@ -0,0 +1,243 @@
+"""
+A stand-in for a package index (i.e. PyPI), served from localhost.
+
+It accepts uploads via the "legacy" upload API (as used by `twine`), and
+serves the uploaded files through a PEP 503 "simple" index and the PyPI JSON
+API. Useful for testing and benchmarking releases without touching the
+network.
+"""
+
+import hashlib
+import html
+import json
+import re
+import threading
+from email import policy
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+
+def normalize_name(name):
+    """Normalize a package name, as per PEP 503."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def project_name(filename):
+    """Determine the (normalized) project name from a distribution filename."""
+    if filename.endswith(".whl"):
+        return normalize_name(filename.split("-")[0])
+    for ext in [".tar.gz", ".zip"]:
+        if filename.endswith(ext):
+            return normalize_name(filename[: -len(ext)].rsplit("-", 1)[0])
+    return normalize_name(filename.split("-")[0])
+
+
+def project_version(filename):
+    """Determine the version from a distribution filename."""
+    if filename.endswith(".whl"):
+        return filename.split("-")[1]
+    for ext in [".tar.gz", ".zip"]:
+        if filename.endswith(ext):
+            return filename[: -len(ext)].rsplit("-", 1)[1]
+    return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # set on the server: `self.server.index` is the FakeIndex
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b"", content_type="text/html"):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        # some installers (e.g. `uv`) check the file size before downloading
+        self.do_GET()
+
+    def do_POST(self):
+        index = self.server.index
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        status = index._next_upload_status()
+        if status != 200:
+            self._send(status, "Injected failure")
+            return
+
+        message = BytesParser(policy=policy.HTTP).parsebytes(
+            b"Content-Type: "
+            + self.headers.get("Content-Type", "").encode("latin-1")
+            + b"\r\n\r\n"
+            + body
+        )
+        fields = {}
+        content = None
+        filename = None
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if part.get_filename():
+                filename = Path(part.get_filename()).name
+                content = part.get_payload(decode=True)
+            else:
+                fields[name] = part.get_content().strip()
+
+        if content is None:
+            self._send(400, "No file uploaded")
+            return
+        if fields.get("sha256_digest") and (
+            fields["sha256_digest"] != hashlib.sha256(content).hexdigest()
+        ):
+            self._send(400, "Digest mismatch")
+            return
+        if (index.packages_dir / filename).exists():
+            self._send(400, "File already exists")
+            return
+        (index.packages_dir / filename).write_bytes(content)
+        index.uploads.append(filename)
+        self._send(200, "OK")
+
+    def do_GET(self):
+        index = self.server.index
+        parts = [part for part in self.path.split("?")[0].split("/") if part]
+
+        if parts == ["simple"]:
+            links = "".join(
+                '<a href="/simple/{0}/">{0}</a>\n'.format(name)
+                for name in sorted({project_name(f.name) for f in index.files()})
+            )
+            self._send(200, "<html><body>\n{}</body></html>".format(links))
+        elif len(parts) == 2 and parts[0] == "simple":
+            files = index.files(parts[1])
+            if not files:
+                self._send(404, "Not Found")
+                return
+            links = "".join(
+                '<a href="/packages/{0}#sha256={1}">{0}</a>\n'.format(
+                    html.escape(f.name), index.sha256(f)
+                )
+                for f in files
+            )
+            self._send(200, "<html><body>\n{}</body></html>".format(links))
+        elif len(parts) == 2 and parts[0] == "packages":
+            path = index.packages_dir / Path(parts[1]).name
+            if path.exists():
+                self._send(200, path.read_bytes(), "application/octet-stream")
+            else:
+                self._send(404, "Not Found")
+        elif len(parts) in [3, 4] and parts[0] == "pypi" and parts[-1] == "json":
+            version = parts[2] if len(parts) == 4 else None
+            files = [
+                f
+                for f in index.files(parts[1])
+                if version is None or project_version(f.name) == version
+            ]
+            if not files:
+                self._send(404, "Not Found")
+                return
+            urls = [
+                {
+                    "filename": f.name,
+                    "url": "{}/packages/{}".format(index.url, f.name),
+                    "digests": {"sha256": index.sha256(f)},
+                    "size": f.stat().st_size,
+                }
+                for f in files
+            ]
+            self._send(
+                200,
+                json.dumps({"info": {"name": parts[1]}, "urls": urls}),
+                "application/json",
+            )
+        else:
+            self._send(404, "Not Found")
+
+
+class FakeIndex:
+    """
+    A package index, run in a background thread on localhost.
+
+    Use as a context manager, or call `start()` and `stop()`.
+
+    Args:
+        packages_dir (str): where uploaded files are stored. Defaults to a
+            temporary directory.
+        port (int): port to listen on. Defaults to any free port.
+        upload_failures (list): HTTP status codes to answer the first uploads
+            with (e.g. [503, 503]), to test retries.
+    """
+
+    def __init__(self, packages_dir=None, port=0, upload_failures=None):
+        self._tempdir = None
+        if packages_dir is None:
+            self._tempdir = TemporaryDirectory()
+            packages_dir = self._tempdir.name
+        self.packages_dir = Path(packages_dir)
+        self.packages_dir.mkdir(parents=True, exist_ok=True)
+        self.port = port
+        self.uploads = []
+        self._upload_failures = list(upload_failures or [])
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:{}".format(self.port)
+
+    @property
+    def upload_url(self):
+        return self.url + "/legacy/"
+
+    @property
+    def simple_url(self):
+        return self.url + "/simple/"
+
+    def _next_upload_status(self):
+        with self._lock:
+            if self._upload_failures:
+                return self._upload_failures.pop(0)
+        return 200
+
+    def files(self, project=None):
+        return sorted(
+            f
+            for f in self.packages_dir.iterdir()
+            if f.is_file()
+            and (project is None or project_name(f.name) == normalize_name(project))
+        )
+
+    @staticmethod
+    def sha256(path):
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.index = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._tempdir is not None:
+            self._tempdir.cleanup()
+            self._tempdir = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
@@ -0,0 +1,98 @@
+"""
+Helpers shared by the tests: git repos, and distribution files to check,
+compare, and upload.
+"""
+
+import io
+import subprocess
+import tarfile
+import zipfile
+from pathlib import Path
+
+
+def git(root, *args):
+    """Run git in `root`, as a test user."""
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com"]
+        + list(args),
+        cwd=str(root),
+        check=True,
+        capture_output=True,
+    )
+
+
+def _dist_name(path, suffix):
+    # e.g. "example-1.0.0" from "example-1.0.0-py3-none-any.whl"
+    name = Path(path).name[: -len(suffix)]
+    return "-".join(name.split("-")[:2])
+
+
+def make_wheel(path, files, metadata=None, date_time=None):
+    """
+    Write a wheel to `path`.
+
+    Args:
+        files (dict): of file name to content (str or bytes), written in
+            order.
+        metadata (str): if given, written as the ``METADATA`` file of the
+            wheel's ``.dist-info`` folder (named after `path`).
+        date_time (tuple): the timestamp given to each file, if not now.
+
+    Returns
+    -------
+        Path: to the wheel.
+
+    """
+    files = dict(files)
+    if metadata is not None:
+        dist_info = _dist_name(path, ".whl") + ".dist-info"
+        files[dist_info + "/METADATA"] = metadata
+    with zipfile.ZipFile(str(path), "w") as zf:
+        for name, content in files.items():
+            if date_time is not None:
+                name = zipfile.ZipInfo(name, date_time=date_time)
+            zf.writestr(name, content)
+    return Path(path)
+
+
+def make_sdist(path, files, mtime=0, uid=0, mode=0o644):
+    """
+    Write an sdist to `path`.
+
+    Args:
+        files (dict): of file name (within the sdist's top folder, named
+            after `path`) to content (str or bytes), written in order.
+        mtime, uid, mode (int): given to each file.
+
+    Returns
+    -------
+        Path: to the sdist.
+
+    """
+    top = _dist_name(path, ".tar.gz")
+    with tarfile.open(str(path), "w:gz") as tf:
+        for name, content in files.items():
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            info = tarfile.TarInfo("{}/{}".format(top, name))
+            info.size = len(content)
+            info.mtime = mtime
+            info.uid = uid
+            info.mode = mode
+            tf.addfile(info, io.BytesIO(content))
+    return Path(path)
+
+
+def upload_wheel(dist_dir, name="example", version="1.0.0"):
+    """Write a minimal (but valid enough to upload) wheel to `dist_dir`."""
+    dist_info = "{}-{}.dist-info".format(name, version)
+    return make_wheel(
+        Path(dist_dir) / "{}-{}-py3-none-any.whl".format(name, version),
+        {
+            "{}/__init__.py".format(name): "__version__ = '{}'\n".format(version),
+            dist_info + "/WHEEL": "Wheel-Version: 1.0\nGenerator: test\n"
+            "Root-Is-Purelib: true\nTag: py3-none-any\n",
+            dist_info + "/RECORD": "",
+        },
+        metadata="Metadata-Version: 2.1\nName: {}\nVersion: {}\n".format(name, version),
+    )
@@ -0,0 +1,132 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from invoke import Config, Context
+
+from minchin.releaser import cache
+from minchin.releaser.test.support import git
+from minchin.releaser.vcs import scan_status
+
+
+class Test_Test_Cache(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name).resolve()
+        (self.root / "example").mkdir()
+        (self.root / "tests").mkdir()
+        (self.root / "example" / "__init__.py").write_text("a = 1\n")
+        (self.root / "tests" / "test_a.py").write_text("")
+        (self.root / "requirements.txt").write_text("requests\n")
+        self.ctx = self.make_ctx("pytest")
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def make_ctx(self, test_command):
+        return Context(
+            Config(
+                overrides={
+                    "releaser": {
+                        "here": str(self.root),
+                        "source": str(self.root / "example"),
+                        "test": str(self.root / "tests"),
+                        "test_command": test_command,
+                    }
+                }
+            )
+        )
+
+    def commit(self):
+        git(self.root, "init", "-q")
+        git(self.root, "add", "-A")
+        git(self.root, "commit", "-q", "-m", "initial")
+
+    def test_key_changes(self):
+        key = cache.test_cache_key(self.ctx)
+        self.assertEqual(key, cache.test_cache_key(self.ctx))
+        self.assertNotEqual(key, cache.test_cache_key(self.make_ctx("pytest -x")))
+
+        (self.root / "requirements.txt").write_text("requests>=2\n")
+        self.assertNotEqual(key, cache.test_cache_key(self.ctx))
+        key = cache.test_cache_key(self.ctx)
+
+        (self.root / "tests" / "test_a.py").write_text("# changed\n")
+        self.assertNotEqual(key, cache.test_cache_key(self.ctx))
+
+    def test_git_key_changes(self):
+        self.commit()
+        key = cache.test_cache_key(self.ctx, scan_status(self.root))
+        # the cache itself (and other untracked files) don't matter
+        cache.record_passed_tests(self.ctx, key, 1.0)
+        (self.root / "example" / "scratch.txt").write_text("")
+        self.assertEqual(key, cache.test_cache_key(self.ctx, scan_status(self.root)))
+
+        (self.root / "example" / "__init__.py").write_text("a = 2\n")
+        self.assertNotEqual(key, cache.test_cache_key(self.ctx, scan_status(self.root)))
+
+    def test_record(self):
+        key = cache.test_cache_key(self.ctx)
+        self.assertIsNone(cache.passed_tests(self.ctx, key))
+        cache.record_passed_tests(self.ctx, key, 2.5)
+        self.assertEqual(cache.passed_tests(self.ctx, key)["duration"], 2.5)
+
+
+class Test_Doc_Cache(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name).resolve()
+        (self.root / "example").mkdir()
+        (self.root / "docs").mkdir()
+        (self.root / "example" / "__init__.py").write_text("a = 1\n")
+        (self.root / "docs" / "index.rst").write_text("Example\n")
+        self.output = self.root / "docs" / "_build"
+        self.ctx = Context(
+            Config(
+                overrides={
+                    "releaser": {
+                        "here": str(self.root),
+                        "source": "example",
+                        "docs": "docs",
+                        "doc_command": "make html",
+                        "doc_output": "docs/_build",
+                    }
+                }
+            )
+        )
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_key_changes(self):
+        key = cache.doc_cache_key(self.ctx, "1.0.0")
+        self.assertNotEqual(key, cache.doc_cache_key(self.ctx, "1.0.1"))
+
+        # building the docs doesn't change the key
+        self.output.mkdir()
+        (self.output / "index.html").write_text("<html></html>")
+        self.assertEqual(key, cache.doc_cache_key(self.ctx, "1.0.0"))
+
+        (self.root / "example" / "__init__.py").write_text("a = 2\n")
+        self.assertNotEqual(key, cache.doc_cache_key(self.ctx, "1.0.0"))
+
+    def test_restore(self):
+        key = cache.doc_cache_key(self.ctx, "1.0.0")
+        self.assertIsNone(cache.restore_docs(self.ctx, key))
+
+        self.output.mkdir()
+        (self.output / "index.html").write_text("<html></html>")
+        cache.save_docs(self.ctx, key, 60.0)
+        (self.output / "index.html").unlink()
+
+        self.assertEqual(cache.restore_docs(self.ctx, key)["duration"], 60.0)
+        self.assertEqual((self.output / "index.html").read_text(), "<html></html>")
+        self.assertIsNone(cache.restore_docs(self.ctx, "another key"))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
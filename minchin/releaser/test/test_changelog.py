@@ -0,0 +1,108 @@
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+from invoke import Config, Context
+
+from minchin.releaser import changelog
+
+CHANGELOG = """\
+Changelog
+=========
+
+- :feature:`-` an unreleased feature.
+- :release:`1.0.0 <2024-01-01>`
+- :bug:`-` an old bug.
+"""
+
+
+class Test_Classify(unittest.TestCase):
+    def test_feature(self):
+        commit = changelog.classify("feat(cli): Add an option\n\nMore detail.")
+        self.assertEqual(commit["role"], "feature")
+        self.assertEqual(commit["description"], "Add an option")
+        self.assertFalse(commit["breaking"])
+
+    def test_breaking(self):
+        self.assertTrue(changelog.classify("fix!: drop Python 2")["breaking"])
+        commit = changelog.classify("feat: new API\n\nBREAKING CHANGE: old one gone")
+        self.assertTrue(commit["breaking"])
+
+    def test_bump_level(self):
+        commits = [changelog.classify(m) for m in ["fix: a", "docs: b", "tidy"]]
+        self.assertEqual(changelog.bump_level(commits), "patch")
+        commits.append(changelog.classify("feat: c"))
+        self.assertEqual(changelog.bump_level(commits), "minor")
+        commits.append(changelog.classify("refactor!: d"))
+        self.assertEqual(changelog.bump_level(commits), "major")
+        self.assertEqual(changelog.bump_level([]), "none")
+
+    def test_unlisted(self):
+        self.assertIsNone(changelog.classify("chore: tidy up")["role"])
+        self.assertIsNone(changelog.classify("Merge branch 'x'")["type"])
+
+
+class Test_Changelog(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name)
+        self.changelog = self.root / "changelog.rst"
+        self.changelog.write_text(CHANGELOG)
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_add_release(self):
+        entries = [
+            "- :feature:`-` an unreleased feature.",
+            "- :bug:`-` a new bug.",
+        ]
+        added = changelog.add_release(
+            self.changelog, "1.1.0", entries, release_date=date(2024, 2, 1)
+        )
+        self.assertEqual(added, entries[1:])
+        self.assertEqual(
+            self.changelog.read_text(),
+            CHANGELOG.replace(
+                "- :feature:",
+                "- :release:`1.1.0 <2024-02-01>`\n- :bug:`-` a new bug.\n- :feature:",
+                1,
+            ),
+        )
+
+    def test_scan_cached(self):
+        """Each commit is only read once"""
+        ctx = Context(Config(overrides={"releaser": {"here": str(self.root)}}))
+        with mock.patch.object(
+            changelog, "commits_since", return_value=["b", "a"]
+        ), mock.patch.object(
+            changelog,
+            "commit_messages",
+            return_value={"a": "fix: a bug", "b": "docs: Explain it"},
+        ):
+            commits = changelog.scan_commits(ctx, {}, "1.0.0")
+        self.assertEqual(
+            changelog.changelog_entries(commits),
+            ["- :bug:`-` a bug.", "- :support:`-` explain it."],
+        )
+
+        with mock.patch.object(
+            changelog, "commits_since", return_value=["c", "b", "a"]
+        ), mock.patch.object(
+            changelog, "commit_messages", return_value={"c": "feat: more"}
+        ) as messages:
+            commits = changelog.scan_commits(ctx, {}, "1.0.0")
+        messages.assert_called_once_with({}, ["c"])
+        self.assertEqual(
+            [commit["type"] for commit in commits], ["feat", "docs", "fix"]
+        )
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from invoke import Config, Context
+
+from minchin.releaser import check
+from minchin.releaser.test.support import make_sdist, make_wheel
+
+METADATA = """\
+Metadata-Version: 2.1
+Name: example
+Version: 1.0.0
+Description-Content-Type: text/x-rst
+
+{}"""
+
+GOOD_README = "Example\n=======\n\nAn example.\n"
+BAD_README = "Example\n=======\n\n`broken link <\n"
+
+
+def wheel_with(path, description):
+    return make_wheel(
+        path, {"example/__init__.py": ""}, metadata=METADATA.format(description)
+    )
+
+
+def sdist_with(path, description):
+    return make_sdist(path, {"PKG-INFO": METADATA.format(description)})
+
+
+class Test_Check(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name)
+        self.ctx = Context(Config(overrides={"releaser": {"here": str(self.root)}}))
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_good(self):
+        wheel = self.root / "example-1.0.0-py3-none-any.whl"
+        sdist = self.root / "example-1.0.0.tar.gz"
+        wheel_with(wheel, GOOD_README)
+        sdist_with(sdist, GOOD_README)
+        results = check.check_distributions(self.ctx, [wheel, sdist])
+        self.assertEqual(results, {wheel.name: (True, []), sdist.name: (True, [])})
+
+    def test_bad_markup(self):
+        wheel = self.root / "example-1.0.0-py3-none-any.whl"
+        wheel_with(wheel, BAD_README)
+        ok, messages = check.check_distributions(self.ctx, [wheel])[wheel.name]
+        self.assertFalse(ok)
+        self.assertIn("syntax errors", messages[0])
+
+    def test_missing_description(self):
+        wheel = self.root / "example-1.0.0-py3-none-any.whl"
+        wheel_with(wheel, "")
+        ok, messages = check.check_distributions(self.ctx, [wheel])[wheel.name]
+        self.assertTrue(ok)
+        self.assertEqual(messages, ["`long_description` missing."])
+
+    def test_cached(self):
+        """An identical file is only checked once"""
+        wheel = self.root / "example-1.0.0-py3-none-any.whl"
+        wheel_with(wheel, GOOD_README)
+        check.check_distributions(self.ctx, [wheel])
+        with mock.patch.object(check, "read_metadata", side_effect=AssertionError):
+            results = check.check_distributions(self.ctx, [wheel])
+        self.assertEqual(results, {wheel.name: (True, [])})
+
+
+class Test_Contents(unittest.TestCase):
+    tracked = ["src/example/__init__.py", "src/example/data.json", ".gitignore"]
+
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name)
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def make_sdist(self, names):
+        return make_sdist(
+            self.root / "example-1.0.0.tar.gz",
+            {name: "" for name in ["PKG-INFO"] + names},
+        )
+
+    def test_complete(self):
+        sdist = self.make_sdist(
+            ["src/example/__init__.py", "src/example/data.json", "setup.py"]
+        )
+        wheel = make_wheel(
+            self.root / "example-1.0.0-py3-none-any.whl",
+            {"example/__init__.py": "", "example/data.json": ""},
+            metadata="",
+        )
+        results = check.check_contents([sdist, wheel], self.tracked, "src/example")
+        self.assertEqual(results, {sdist.name: ([], []), wheel.name: ([], [])})
+
+    def test_missing(self):
+        sdist = self.make_sdist(["src/example/__init__.py", "src/example/extra.py"])
+        results = check.check_contents([sdist], self.tracked, "src/example")
+        self.assertEqual(
+            results[sdist.name], (["src/example/data.json"], ["src/example/extra.py"])
+        )
+
+    def test_ignore(self):
+        sdist = self.make_sdist(["src/example/__init__.py"])
+        results = check.check_contents(
+            [sdist], self.tracked, "src/example", ignore=["*.json"]
+        )
+        self.assertEqual(results[sdist.name], ([], []))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import json
+import subprocess
+import sys
+import unittest
+
+# `invoke` (and the `minchin` namespace package) are always loaded by the
+# time `tasks.py` imports us, so they aren't counted against us.
+PROBE = """
+import json, sys, time
+import invoke, minchin
+before = set(sys.modules)
+start = time.perf_counter()
+import minchin.releaser
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "elapsed": elapsed,
+    "modules": sorted(set(sys.modules) - before),
+    "tasks": [
+        name for name in ("make_release", "make_releases", "vendorize")
+        if hasattr(minchin.releaser, name)
+    ],
+}))
+"""
+
+MAX_IMPORT_SECONDS = 0.5
+MAX_NEW_MODULES = 40
+HEAVY_MODULES = [
+    "git",
+    "isort",
+    "semantic_version",
+    "multiprocessing",
+    "concurrent",
+    "tarfile",
+    "zipfile",
+    "gzip",
+]
+
+
+class Test_Import(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        cls.probe = json.loads(output.strip().splitlines()[-1])
+
+    def test_tasks_registered(self):
+        """Tasks are available without loading their dependencies"""
+        self.assertIn("make_release", self.probe["tasks"])
+        self.assertIn("vendorize", self.probe["tasks"])
+
+    def test_no_heavy_modules(self):
+        loaded = {name.split(".")[0] for name in self.probe["modules"]}
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, loaded)
+
+    def test_module_count(self):
+        self.assertLessEqual(len(self.probe["modules"]), MAX_NEW_MODULES)
+
+    def test_import_time(self):
+        self.assertLess(self.probe["elapsed"], MAX_IMPORT_SECONDS)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from minchin.releaser.index import wait_for_files
+from minchin.releaser.test.fake_index import FakeIndex
+from minchin.releaser.test.support import upload_wheel
+
+
+class Test_Wait_For_Files(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name)
+        (self.root / "dist").mkdir()
+        self.wheel = upload_wheel(self.root / "dist")
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def publish_later(self, index, path, seconds):
+        timer = threading.Timer(
+            seconds, shutil.copy, [str(path), str(index.packages_dir / path.name)]
+        )
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+    def test_appears(self):
+        """Returns once the file is listed"""
+        with FakeIndex() as index:
+            self.publish_later(index, self.wheel, 0.2)
+            found = wait_for_files(
+                index.simple_url, "example", [self.wheel], timeout=10, delay=0.05
+            )
+        self.assertEqual(found, {self.wheel.name: FakeIndex.sha256(self.wheel)})
+
+    def test_timeout(self):
+        with FakeIndex() as index:
+            found = wait_for_files(
+                index.simple_url, "example", [self.wheel], timeout=0.2, delay=0.05
+            )
+        self.assertEqual(found, {self.wheel.name: None})
+
+    def test_different_file(self):
+        """A file with the wrong hash is reported straight away"""
+        with FakeIndex() as index:
+            (index.packages_dir / self.wheel.name).write_bytes(b"something else")
+            found = wait_for_files(
+                index.simple_url, "example", [self.wheel], timeout=60, delay=30
+            )
+        self.assertNotEqual(found[self.wheel.name], FakeIndex.sha256(self.wheel))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
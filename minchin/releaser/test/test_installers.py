@@ -0,0 +1,56 @@
+import sys
+import unittest
+from unittest import mock
+
+from invoke import Config, Context
+
+from minchin.releaser import installers
+
+
+def make_ctx(installer=None):
+    return Context(Config(overrides={"releaser": {"installer": installer}}))
+
+
+class Test_Installers(unittest.TestCase):
+    def test_auto(self):
+        with mock.patch.object(installers.UvInstaller, "available", return_value=True):
+            self.assertEqual(installers.get_installer(make_ctx()).name, "uv")
+        with mock.patch.object(
+            installers.UvInstaller, "available", return_value=False
+        ), mock.patch.object(
+            installers.VirtualenvInstaller, "available", return_value=False
+        ):
+            self.assertEqual(installers.get_installer(make_ctx("auto")).name, "pip")
+
+    def test_requested(self):
+        with mock.patch.object(installers.UvInstaller, "available", return_value=True):
+            self.assertEqual(installers.get_installer(make_ctx("pip")).name, "pip")
+
+    def test_unavailable(self):
+        """An installer that isn't available falls back to the best that is"""
+        with mock.patch.object(
+            installers.UvInstaller, "available", return_value=False
+        ), mock.patch.object(
+            installers.VirtualenvInstaller, "available", return_value=False
+        ), mock.patch(
+            "builtins.print"
+        ):
+            self.assertEqual(installers.get_installer(make_ctx("uv")).name, "pip")
+
+    def test_virtualenv_command(self):
+        """`virtualenv` runs from our Python, and targets the one asked for"""
+        with mock.patch.object(installers, "run") as run:
+            installers.VirtualenvInstaller().create("env-3.12", "python3.12")
+        command = run.call_args[0][0]
+        self.assertTrue(
+            command.startswith('"{}" -m virtualenv '.format(sys.executable))
+        )
+        self.assertTrue(command.endswith(" --python python3.12 env-3.12"))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from invoke import Config, Context
+
+from minchin.releaser import monorepo
+
+
+class Test_Monorepo(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name).resolve()
+        for package in ["core", "cli", "web"]:
+            (self.root / package).mkdir()
+        # found through the requirements, rather than `depends_on`
+        (self.root / "web" / "requirements.in").write_text(
+            "# the web app\nExample_Core >= 1.0\nrequests\n"
+        )
+        (self.root / "web" / "invoke.yaml").write_text(
+            "releaser:\n    test_command: pytest web\n"
+        )
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def ctx(self, packages):
+        return Context(
+            Config(
+                overrides={
+                    "releaser": {
+                        "here": str(self.root),
+                        "test_command": "pytest",
+                        "jobs": 2,
+                        "packages": packages,
+                    }
+                }
+            )
+        )
+
+    def configs(self):
+        return monorepo.package_configs(
+            self.ctx(
+                [
+                    {"here": "core", "module_name": "example_core"},
+                    {
+                        "here": "cli",
+                        "module_name": "example_cli",
+                        "depends_on": ["example_core"],
+                    },
+                    {"here": "web", "name": "web", "module_name": "example_web"},
+                ]
+            )
+        )
+
+    def test_package_configs(self):
+        configs = self.configs()
+        self.assertEqual(sorted(configs), ["example_cli", "example_core", "web"])
+        here, config = configs["web"]
+        self.assertEqual(here, self.root / "web")
+        self.assertEqual(config["here"], ".")
+        self.assertEqual(config["test_command"], "pytest web")
+        self.assertEqual(config["tag_format"], "{name}-{version}")
+        self.assertNotIn("jobs", config)
+        self.assertEqual(configs["example_core"][1]["test_command"], "pytest")
+
+    def test_missing_here(self):
+        with self.assertRaises(SystemExit):
+            monorepo.package_configs(self.ctx([{"module_name": "example_core"}]))
+
+    def test_requirement_names(self):
+        self.assertEqual(
+            monorepo.requirement_names(self.root / "web"), {"example-core", "requests"}
+        )
+        self.assertEqual(monorepo.requirement_names(self.root / "core"), set())
+
+    def test_order(self):
+        graph = monorepo.dependency_graph(self.configs())
+        self.assertEqual(
+            graph,
+            {
+                "example_core": set(),
+                "example_cli": {"example_core"},
+                "web": {"example_core"},
+            },
+        )
+        self.assertEqual(
+            monorepo.release_order(graph), [["example_core"], ["example_cli", "web"]]
+        )
+
+    def test_cycle(self):
+        with self.assertRaises(SystemExit):
+            monorepo.release_order({"a": {"b"}, "b": {"c"}, "c": {"a"}, "d": set()})
+
+    def test_unknown_depends_on(self):
+        configs = self.configs()
+        configs["example_cli"][1]["depends_on"] = ["example_nope"]
+        with self.assertRaises(SystemExit):
+            monorepo.dependency_graph(configs)
+
+    def test_only(self):
+        configs = self.configs()
+        graph = monorepo.dependency_graph(configs)
+        selected, selected_graph = monorepo.select_packages(
+            configs, graph, "web, example_cli"
+        )
+        self.assertEqual(list(selected), ["web", "example_cli"])
+        # example_core isn't being released, so is taken as already released
+        self.assertEqual(selected_graph, {"web": set(), "example_cli": set()})
+
+        self.assertEqual(monorepo.select_packages(configs, graph)[1], graph)
+        with self.assertRaises(SystemExit):
+            monorepo.select_packages(configs, graph, "web,example_nope")
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import unittest
+from unittest import mock
+
+from invoke import Config, Context
+
+from minchin.releaser._vendor import text
+from minchin.releaser.policy import ask, is_interactive, policy_answer
+
+
+def make_ctx(policy=None):
+    releaser = {"module_name": "example"}
+    if policy is not None:
+        releaser["policy"] = policy
+    return Context(Config(overrides={"releaser": releaser}))
+
+
+class Test_Policy(unittest.TestCase):
+    def test_yaml_booleans(self):
+        """YAML's bare `yes` and `no` are read as answers"""
+        ctx = make_ctx({"create_tag": True, "bump_to_prerelease": False})
+        self.assertEqual(policy_answer(ctx, "create_tag"), "yes")
+        self.assertEqual(policy_answer(ctx, "bump_to_prerelease"), "no")
+
+    def test_words(self):
+        ctx = make_ctx({"on_test_failure": "abort", "on_doc_failure": "continue"})
+        self.assertEqual(policy_answer(ctx, "on_test_failure"), "no")
+        self.assertEqual(policy_answer(ctx, "on_doc_failure"), "yes")
+        self.assertIsNone(policy_answer(ctx, "on_dirty_repo"))
+
+    def test_interactive(self):
+        self.assertTrue(is_interactive(make_ctx()))
+        self.assertFalse(is_interactive(make_ctx(), assume_yes=True))
+        self.assertFalse(is_interactive(make_ctx({"interactive": False})))
+
+    def test_policy_beats_yes(self):
+        """An explicit policy wins over `--yes`"""
+        ctx = make_ctx({"on_test_failure": "abort"})
+        with mock.patch("builtins.input", side_effect=AssertionError):
+            ans = ask(ctx, "on_test_failure", "Continue?", assume_yes=True)
+        self.assertEqual(ans, text.Answers.QUIT)
+
+    def test_yes_stops_on_failure(self):
+        """`--yes` confirms, but doesn't continue past a failure"""
+        ctx = make_ctx()
+        with mock.patch("builtins.input", side_effect=AssertionError):
+            ans = ask(ctx, "confirm_release", "Ready?", assume_yes=True)
+            self.assertEqual(ans, text.Answers.YES)
+            for key in ["on_test_failure", "on_incomplete_dist", "on_dist_bloat"]:
+                ans = ask(ctx, key, "Continue anyway?", assume_yes=True)
+                self.assertEqual(ans, text.Answers.QUIT, key)
+
+    def test_never_reads_stdin(self):
+        """Non-interactive mode falls back to the question's default"""
+        ctx = make_ctx({"interactive": False})
+        with mock.patch("builtins.input", side_effect=AssertionError):
+            self.assertEqual(ask(ctx, "on_dirty_repo", "Continue?"), text.Answers.QUIT)
+            self.assertEqual(
+                ask(ctx, "create_tag", "Tag?", quit_option=False), text.Answers.NO
+            )
+            self.assertEqual(
+                ask(ctx, "create_tag", "Tag?", assume_yes=True, quit_option=False),
+                text.Answers.YES,
+            )
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
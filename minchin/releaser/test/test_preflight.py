@@ -0,0 +1,84 @@
+import os
+import socket
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from minchin.releaser import preflight
+from minchin.releaser.test.fake_index import FakeIndex
+
+
+def closed_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class Test_Preflight(unittest.TestCase):
+    def test_command(self):
+        status, program = preflight.check_command(
+            '"{}" -m pytest'.format(sys.executable)
+        )
+        self.assertEqual(status, preflight.GOOD)
+        status, program = preflight.check_command(
+            'PYTHONPATH=. "{}" -m pytest'.format(sys.executable)
+        )
+        self.assertEqual((status, program), (preflight.GOOD, sys.executable))
+        for command in [
+            "no-such-program --verbose",
+            "cd tests && pytest",
+            "pytest | tee log.txt",
+        ]:
+            status, message = preflight.check_command(command)
+            self.assertEqual(status, preflight.WARN, command)
+
+    def test_url(self):
+        with FakeIndex() as index:
+            self.assertEqual(preflight.check_url(index.simple_url)[0], preflight.GOOD)
+            # an error response still means the server is there
+            self.assertEqual(
+                preflight.check_url(index.url + "/missing/")[0], preflight.GOOD
+            )
+        url = "http://127.0.0.1:{}/simple/".format(closed_port())
+        self.assertEqual(preflight.check_url(url, timeout=1)[0], preflight.ERROR)
+
+    @mock.patch.dict(os.environ, {}, clear=True)
+    def test_credentials(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            pypirc = Path(tempdir) / ".pypirc"
+            pypirc.write_text(
+                "[pypi]\nusername = __token__\npassword = pypi-abc\n"
+                "[testpypi]\nusername = __token__\npassword = abc\n"
+            )
+            check = preflight.check_credentials
+            self.assertEqual(check("pypi", pypirc)[0], preflight.GOOD)
+            self.assertEqual(check("testpypi", pypirc)[0], preflight.ERROR)
+            self.assertEqual(check("other", pypirc)[0], preflight.WARN)
+            self.assertEqual(check(None, pypirc)[0], preflight.WARN)
+
+            pypirc.write_text("username = nobody\n")
+            self.assertEqual(check("pypi", pypirc)[0], preflight.ERROR)
+
+    def test_run_checks(self):
+        def broken():
+            raise RuntimeError("oops")
+
+        results = preflight.run_checks(
+            [("twine", preflight.check_twine, []), ("broken", broken, [])]
+        )
+        self.assertEqual(
+            [name for name, status, message in results], ["twine", "broken"]
+        )
+        self.assertEqual(results[1][1:], (preflight.ERROR, "RuntimeError: oops"))
+        with mock.patch("builtins.print"):
+            self.assertFalse(preflight.report(results))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
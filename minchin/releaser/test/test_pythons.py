@@ -0,0 +1,43 @@
+import sys
+import unittest
+from unittest import mock
+
+from invoke import Config, Context
+
+from minchin.releaser.pythons import find_python, find_pythons
+
+VERSION = "{}.{}".format(*sys.version_info[:2])
+
+
+class Test_Pythons(unittest.TestCase):
+    def test_find(self):
+        self.assertEqual(find_python(sys.executable), (VERSION, sys.executable))
+        self.assertIsNone(find_python("no-such-python3.99"))
+
+    def test_config(self):
+        ctx = Context(
+            Config(
+                overrides={
+                    "releaser": {
+                        "pythons": [
+                            sys.executable,
+                            "no-such-python3.99",
+                            sys.executable,
+                        ]
+                    }
+                }
+            )
+        )
+        with mock.patch("builtins.print"):
+            self.assertEqual(find_pythons(ctx), [(VERSION, sys.executable)])
+
+    def test_unset(self):
+        self.assertIsNone(find_pythons(Context(Config(overrides={"releaser": {}}))))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import contextlib
+import io
+import unittest
+
+from invoke import Config, Context
+
+from minchin.releaser.make_release import remote_verify_mode, skip_install
+
+
+class Test_Remote_Verify(unittest.TestCase):
+    def test_mode(self):
+        for value, mode in [(None, "install"), ("hash", "hash"), ("HASH", "hash")]:
+            ctx = Context(Config(overrides={"releaser": {"remote_verify": value}}))
+            self.assertEqual(remote_verify_mode(ctx), mode)
+
+    def test_unknown_mode(self):
+        ctx = Context(Config(overrides={"releaser": {"remote_verify": "trust"}}))
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(remote_verify_mode(ctx), "install")
+        self.assertIn("unknown 'releaser.remote_verify' value", output.getvalue())
+
+    def test_hash_matches(self):
+        """The remote install is skipped if the local one worked"""
+        self.assertEqual(skip_install({}, True, "hash", hash_verified=True), "sha256")
+
+    def test_hash_fallback(self):
+        # the server's copy differs
+        self.assertIsNone(skip_install({}, True, "hash", hash_verified=False))
+        # the local install failed, or wasn't checked (`--skip-local`)
+        self.assertIsNone(skip_install({}, False, "hash", hash_verified=True))
+
+    def test_install_mode(self):
+        self.assertIsNone(skip_install({}, True, "install", hash_verified=True))
+
+    def test_cached(self):
+        state = {"sha256": "abc", "verified": ["3.11", "3.12"]}
+        self.assertEqual(skip_install(state, False), "cached")
+        pythons = [("3.11", "python3.11"), ("3.12", "python3.12")]
+        self.assertEqual(skip_install(state, False, pythons=pythons), "cached")
+        # not yet checked on every Python version
+        pythons.append(("3.13", "python3.13"))
+        self.assertIsNone(skip_install(state, False, pythons=pythons))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import os
+import tarfile
+import tempfile
+import unittest
+from pathlib import Path
+
+from minchin.releaser.reproducible import normalize, read_manifest, write_manifest
+from minchin.releaser.test.support import make_sdist, make_wheel
+
+EPOCH = 1700000000
+FILES = {"setup.py": b"setup()\n", "example.py": b"a = 1\n"}
+
+
+def ordered(reverse=False):
+    return {name: FILES[name] for name in sorted(FILES, reverse=reverse)}
+
+
+class Test_Normalize(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name)
+        (self.root / "a").mkdir()
+        (self.root / "b").mkdir()
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_sdist(self):
+        a = self.root / "a" / "example-1.0.tar.gz"
+        b = self.root / "b" / "example-1.0.tar.gz"
+        make_sdist(a, ordered(), EPOCH + 100, 1000, mode=0o664)
+        make_sdist(b, ordered(reverse=True), EPOCH + 5000, 0, mode=0o664)
+        self.assertNotEqual(a.read_bytes(), b.read_bytes())
+        normalize(a, EPOCH)
+        normalize(b, EPOCH)
+        self.assertEqual(a.read_bytes(), b.read_bytes())
+        with tarfile.open(str(a)) as tf:
+            self.assertEqual(
+                tf.getnames(), ["example-1.0/" + name for name in sorted(FILES)]
+            )
+            self.assertEqual({m.mode for m in tf.getmembers()}, {0o644})
+
+    def test_wheel(self):
+        a = self.root / "a" / "example-1.0-py3-none-any.whl"
+        b = self.root / "b" / "example-1.0-py3-none-any.whl"
+        make_wheel(a, ordered(), date_time=(2024, 1, 1, 0, 0, 0))
+        make_wheel(b, ordered(reverse=True), date_time=(2025, 6, 1, 12, 0, 0))
+        normalize(a, EPOCH)
+        normalize(b, EPOCH)
+        self.assertEqual(a.read_bytes(), b.read_bytes())
+
+    def test_manifest(self):
+        a = self.root / "a" / "example-1.0.tar.gz"
+        make_sdist(a, ordered(), EPOCH)
+        hashes = write_manifest(self.root / "a", [a])
+        self.assertEqual(read_manifest(self.root / "a"), hashes)
+        self.assertEqual(read_manifest(self.root / "b"), {})
+        self.assertEqual(
+            (self.root / "a" / "SHA256SUMS").read_text(),
+            "{}  {}\n".format(hashes[a.name], a.name),
+        )
+        self.assertEqual(
+            sorted(os.listdir(str(self.root / "a"))), ["SHA256SUMS", a.name]
+        )
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
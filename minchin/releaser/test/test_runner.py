@@ -0,0 +1,49 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from minchin.releaser.runner import run
+
+CHATTY = "import sys; [print('line', i) for i in range(1000)]; sys.exit({})"
+
+
+class Test_Run(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.log = Path(self._tempdir.name) / "stage.log"
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def command(self, code):
+        return '"{}" -c "{}"'.format(sys.executable, CHATTY.format(code))
+
+    def test_tail(self):
+        """Only the end of the output is kept, but all of it is logged"""
+        result = run(self.command(0), log=self.log, tail=5, progress=False)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.tail, ["line {}\n".format(i) for i in range(995, 1000)])
+        lines = self.log.read_text().splitlines()
+        self.assertTrue(lines[0].startswith("$ "))
+        self.assertEqual(len(lines), 1001)
+
+    def test_failure(self):
+        result = run(self.command(3), progress=False)
+        self.assertTrue(result.failed)
+        self.assertEqual(result.returncode, 3)
+
+    def test_env(self):
+        command = '"{}" -c "import os; print(os.environ[\'RUNNER_TEST\'])"'.format(
+            sys.executable
+        )
+        result = run(command, env={"RUNNER_TEST": "set"}, progress=False)
+        self.assertEqual(result.output, "set\n")
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
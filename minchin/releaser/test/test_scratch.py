@@ -0,0 +1,59 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from invoke import Config, Context
+
+from minchin.releaser import scratch
+
+
+class Test_Scratch(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name)
+        self.ctx = Context(
+            Config(
+                overrides={
+                    "releaser": {
+                        "here": str(self.root),
+                        "scratch_dir": str(self.root / "scratch"),
+                    }
+                }
+            )
+        )
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_unique(self):
+        a = scratch.new_environment(self.ctx, "1.0.0", "whl", "local")
+        b = scratch.new_environment(self.ctx, "1.0.0", "whl", "local")
+        self.assertNotEqual(a, b)
+        self.assertEqual(a.parent, self.root / "scratch")
+        self.assertTrue(a.name.startswith("env-1.0.0-whl-local-"))
+
+    def test_cleanup(self):
+        old = scratch.new_environment(self.ctx, "1.0.0", "whl", "local")
+        (old / "bin").mkdir()
+        new = scratch.new_environment(self.ctx, "1.0.1", "whl", "local")
+        other = self.root / "scratch" / "not-an-env"
+        other.mkdir()
+        hours_ago = time.time() - 48 * 60 * 60
+        os.utime(str(old), (hours_ago, hours_ago))
+        os.utime(str(other), (hours_ago, hours_ago))
+
+        scratch.start_cleanup(self.ctx).join()
+        self.assertEqual(
+            sorted(os.listdir(str(self.root / "scratch"))),
+            sorted([new.name, other.name]),
+        )
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
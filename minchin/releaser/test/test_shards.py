@@ -0,0 +1,99 @@
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from invoke import Config, Context
+
+from minchin.releaser import cache, shards
+
+
+class Test_Split_Shards(unittest.TestCase):
+    def test_balanced(self):
+        durations = {"a": 8.0, "b": 4.0, "c": 4.0, "d": 3.0, "e": 1.0}
+        result = shards.split_shards(sorted(durations), durations, 2)
+        self.assertEqual(result, [["a", "d"], ["b", "c", "e"]])
+
+    def test_unknown_modules(self):
+        """Modules we haven't timed are assumed to be typical"""
+        result = shards.split_shards(["a", "b", "c", "d"], {}, 2)
+        self.assertEqual([len(shard) for shard in result], [2, 2])
+
+    def test_more_shards_than_modules(self):
+        self.assertEqual(shards.split_shards(["a"], {}, 4), [["a"]])
+
+    def test_default_duration(self):
+        durations = {"a": 1.0, "b": 2.0, "c": 9.0, "gone": 100.0}
+        self.assertEqual(shards.default_duration(["a", "b", "c", "d"], durations), 2.0)
+        self.assertEqual(shards.default_duration(["d"], durations), 1.0)
+
+
+class Test_Run_Sharded(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name).resolve()
+        (self.root / "tests" / "sub").mkdir(parents=True)
+        for name in ["test_a.py", "test_b.py", "sub/c_test.py", "helpers.py"]:
+            (self.root / "tests" / name).write_text("")
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def make_ctx(self, shard_template, test="tests"):
+        return Context(
+            Config(
+                overrides={
+                    "releaser": {
+                        "here": str(self.root),
+                        "test": test,
+                        "test_command": '"{}"'.format(sys.executable),
+                        "test_shard_command": shard_template,
+                        "test_shards": 2,
+                    }
+                }
+            )
+        )
+
+    def test_discover(self):
+        self.assertEqual(
+            shards.discover_test_modules(self.root / "tests", self.root),
+            ["tests/sub/c_test.py", "tests/test_a.py", "tests/test_b.py"],
+        )
+
+    def test_run(self):
+        ctx = self.make_ctx("{test_command} -c \"print('ran')\" {files}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(shards.run_sharded(ctx, 2))
+        logs = sorted((self.root / ".releaser_cache" / "logs").glob("tests-*.log"))
+        self.assertEqual(len(logs), 2)
+        for log in logs:
+            self.assertIn("ran", log.read_text())
+        self.assertEqual(len(cache.load_cache(ctx, "test_durations")), 3)
+
+    def test_no_test_dir(self):
+        """Without a test folder, the suite is run as one"""
+        ctx = self.make_ctx("{test_command} {files}", test=None)
+        ctx.releaser.test_command = '"{}" -c "print(\'ran\')"'.format(sys.executable)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(shards.run_sharded(ctx, 2))
+        log = self.root / ".releaser_cache" / "logs" / "tests.log"
+        self.assertIn("ran", log.read_text())
+
+    def test_failure(self):
+        """One failing shard fails the run"""
+        ctx = self.make_ctx(
+            "{test_command} -c \"import sys; sys.exit('tests/test_b.py' in sys.argv)\" "
+            "{files}"
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(shards.run_sharded(ctx, 2))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
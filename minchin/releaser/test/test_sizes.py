@@ -0,0 +1,99 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from invoke import Config, Context
+
+from minchin.releaser import sizes
+from minchin.releaser.make_release import check_dist_sizes
+from minchin.releaser.test.support import make_sdist, make_wheel
+
+
+def sized(files):
+    """Contents for each of `files`, given as file name to size."""
+    return {name: b"x" * size for name, size in files.items()}
+
+
+class Test_Sizes(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name)
+        self.ctx = Context(Config(overrides={"releaser": {"here": str(self.root)}}))
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_archive_sizes(self):
+        wheel = self.root / "example-1.0.0-py3-none-any.whl"
+        sdist = self.root / "example-1.0.0.tar.gz"
+        make_wheel(wheel, sized({"example/__init__.py": 10}), metadata="")
+        make_sdist(sdist, sized({"setup.py": 20}))
+        self.assertEqual(
+            sizes.archive_sizes(wheel),
+            {"example/__init__.py": 10, ".dist-info/METADATA": 0},
+        )
+        self.assertEqual(sizes.archive_sizes(sdist), {"setup.py": 20})
+
+    def test_compare(self):
+        old = {"a.py": 100, "b.py": 100}
+        limits = dict(sizes.SIZE_LIMITS)
+        result = sizes.compare_sizes(old, {"a.py": 110, "b.py": 100}, limits)
+        self.assertEqual(result["problems"], [])
+        self.assertEqual(result["changes"], [("a.py", 100, 110)])
+
+        limits["large_file"] = 500
+        result = sizes.compare_sizes(old, dict(old, **{"data.bin": 1000}), limits)
+        self.assertEqual(result["large"], [("data.bin", 1000)])
+        # grew, has more files, and adds a large file
+        self.assertEqual(len(result["problems"]), 3)
+
+    def test_baseline(self):
+        old = self.root / "example-1.0.0-py3-none-any.whl"
+        new = self.root / "example-1.1.0-py3-none-any.whl"
+        make_wheel(old, sized({"example/__init__.py": 10}), metadata="")
+        make_wheel(new, sized({"example/__init__.py": 20}), metadata="")
+        self.assertIsNone(sizes.baseline(self.ctx, "whl", new.name))
+
+        found = sizes.baseline(self.ctx, "whl", new.name, [self.root])
+        self.assertEqual(found["name"], old.name)
+
+        # the recorded sizes of the last version win, even after rebuilds
+        sizes.record_sizes(self.ctx, "whl", old.name, {"a.py": 1})
+        sizes.record_sizes(self.ctx, "whl", new.name, {"a.py": 2})
+        sizes.record_sizes(self.ctx, "whl", new.name, {"a.py": 3})
+        found = sizes.baseline(self.ctx, "whl", new.name, [self.root])
+        self.assertEqual(found, {"name": old.name, "sizes": {"a.py": 1}})
+
+    def test_yes_stops_on_bloat(self):
+        """`--yes` doesn't carry on past a distribution that grew too much"""
+        old = self.root / "example-1.0.0-py3-none-any.whl"
+        new = self.root / "example-1.1.0-py3-none-any.whl"
+        make_wheel(old, sized({"example/__init__.py": 10}), metadata="")
+        make_wheel(
+            new, sized({"example/__init__.py": 10, "data.bin": 5000}), metadata=""
+        )
+        with mock.patch("builtins.print"), mock.patch(
+            "builtins.input", side_effect=AssertionError
+        ):
+            with self.assertRaises(SystemExit):
+                check_dist_sizes(self.ctx, self.root, {"whl": new}, assume_yes=True)
+
+    def test_not_recorded_before_upload(self):
+        """A build that isn't released doesn't become the next baseline"""
+        old = self.root / "example-1.0.0-py3-none-any.whl"
+        new = self.root / "example-1.1.0-py3-none-any.whl"
+        make_wheel(old, sized({"example/__init__.py": 10}), metadata="")
+        make_wheel(new, sized({"example/__init__.py": 11}), metadata="")
+        with mock.patch("builtins.print"):
+            found = check_dist_sizes(self.ctx, self.root, {"whl": new})
+        self.assertEqual(found["whl"]["example/__init__.py"], 11)
+        self.assertIsNone(sizes.baseline(self.ctx, "whl", old.name))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
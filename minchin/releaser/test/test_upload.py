@@ -0,0 +1,74 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from invoke import Config, Context
+
+from minchin.releaser.test.fake_index import FakeIndex
+from minchin.releaser.test.support import upload_wheel
+from minchin.releaser.upload import ALREADY_UPLOADED, upload_distributions
+
+
+class Test_Upload(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name)
+        self.files = [
+            upload_wheel(self.root, version="1.0.0"),
+            upload_wheel(self.root, version="1.0.1"),
+        ]
+        self.ctx = Context(Config(overrides={"releaser": {"upload_retries": 3}}))
+        env = {"TWINE_USERNAME": "test", "TWINE_PASSWORD": "test"}
+        self._env = mock.patch.dict(os.environ, env)
+        self._env.start()
+
+    def tearDown(self):
+        self._env.stop()
+        self._tempdir.cleanup()
+
+    def upload(self, index):
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = upload_distributions(
+                self.ctx,
+                "testpypi",
+                self.files,
+                index.upload_url,
+                assume_yes=True,
+                backoff=0.01,
+            )
+        self.assertEqual(sorted(results), sorted(f.name for f in self.files))
+        self.messages = [message for ok, message in results.values()]
+        return all(ok for ok, message in results.values())
+
+    def test_upload(self):
+        with FakeIndex() as index:
+            self.assertTrue(self.upload(index))
+            self.assertEqual(sorted(index.uploads), sorted(f.name for f in self.files))
+
+    def test_retry_server_errors(self):
+        with FakeIndex(upload_failures=[503, 502]) as index:
+            self.assertTrue(self.upload(index))
+            self.assertEqual(len(index.uploads), 2)
+
+    def test_give_up(self):
+        with FakeIndex(upload_failures=[503] * 6) as index:
+            self.assertFalse(self.upload(index))
+            self.assertEqual(index.uploads, [])
+
+    def test_already_uploaded(self):
+        with FakeIndex() as index:
+            self.upload(index)
+            self.assertFalse(self.upload(index))
+            self.assertEqual(self.messages, [ALREADY_UPLOADED] * 2)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
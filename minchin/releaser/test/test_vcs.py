@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from minchin.releaser.test.support import git
+from minchin.releaser.vcs import (
+    commits_since,
+    has_tag,
+    is_dirty_below,
+    latest_tag,
+    scan_status,
+    untracked_below,
+)
+
+
+class Test_Scan_Status(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name).resolve()
+        git(self.root, "init", "-q")
+        (self.root / "pkg_a").mkdir()
+        (self.root / "pkg_b").mkdir()
+        (self.root / "pkg_a" / "a.py").write_text("a = 1\n")
+        (self.root / "pkg_b" / "b.py").write_text("b = 1\n")
+        git(self.root, "add", "-A")
+        git(self.root, "commit", "-q", "-m", "initial")
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_clean(self):
+        state = scan_status(self.root / "pkg_a")
+        self.assertEqual(state["root"], self.root)
+        self.assertEqual(state["dirty_paths"], [])
+        self.assertFalse(is_dirty_below(state, self.root))
+        self.assertIsNotNone(state["commit"])
+
+    def test_dirty_and_untracked(self):
+        (self.root / "pkg_a" / "a.py").write_text("a = 2\n")
+        (self.root / "pkg_b" / "new.py").write_text("")
+        git(self.root, "mv", "pkg_b/b.py", "pkg_b/c.py")
+        state = scan_status(self.root)
+        self.assertIn("pkg_a/a.py", state["dirty_paths"])
+        self.assertIn("pkg_b/c.py", state["dirty_paths"])
+        self.assertIn("pkg_b/b.py", state["dirty_paths"])
+        self.assertTrue(is_dirty_below(state, self.root / "pkg_a"))
+        self.assertEqual(untracked_below(state, self.root / "pkg_a"), [])
+        self.assertEqual(untracked_below(state, self.root / "pkg_b"), ["pkg_b/new.py"])
+
+    def test_tags(self):
+        git(self.root, "tag", "1.0.0")
+        state = scan_status(self.root)
+        self.assertTrue(has_tag(state, "1.0.0"))
+        self.assertFalse(has_tag(state, "1.0.1"))
+        self.assertEqual(state["tags"], {"1.0.0": True, "1.0.1": False})
+
+    def test_latest_tag(self):
+        git(self.root, "tag", "core-1.0.0")
+        git(self.root, "commit", "-q", "--allow-empty", "-m", "second")
+        git(self.root, "tag", "cli-1.0.0")
+        state = scan_status(self.root)
+        self.assertEqual(latest_tag(state), "cli-1.0.0")
+        self.assertEqual(latest_tag(state, match="core-*"), "core-1.0.0")
+        self.assertIsNone(latest_tag(state, match="web-*"))
+
+    def test_commits_since(self):
+        git(self.root, "tag", "1.0.0")
+        (self.root / "pkg_b" / "b.py").write_text("b = 2\n")
+        git(self.root, "commit", "-q", "-am", "change b")
+        state = scan_status(self.root)
+        self.assertEqual(len(commits_since(state)), 2)
+        self.assertEqual(len(commits_since(state, "1.0.0")), 1)
+        self.assertEqual(len(commits_since(state, "1.0.0", self.root)), 1)
+        self.assertEqual(len(commits_since(state, "1.0.0", self.root / "pkg_b")), 1)
+        self.assertEqual(commits_since(state, "1.0.0", self.root / "pkg_a"), [])
+
+    def test_not_a_repo(self):
+        with tempfile.TemporaryDirectory() as other:
+            self.assertIsNone(scan_status(other))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
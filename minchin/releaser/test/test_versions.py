@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from invoke import Config, Context
+
+from minchin.releaser import versions
+
+CONSTANTS = '"""Constants."""\r\n__version__ = "1.2.3"\r\nname = "example"\r\n'
+PYPROJECT = '[project]\nname = "example"\nversion = "1.2.3"\n'
+CONF = "project = 'Example'\nversion = '1.2'\nrelease = '1.2.3'\n"
+
+
+class Test_Versions(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name)
+        for name, content in [
+            ("constants.py", CONSTANTS),
+            ("pyproject.toml", PYPROJECT),
+            ("conf.py", CONF),
+        ]:
+            with (self.root / name).open("w", newline="") as f:
+                f.write(content)
+        self.ctx = Context(
+            Config(
+                overrides={
+                    "releaser": {
+                        "here": str(self.root),
+                        "version": "constants.py",
+                        "version_files": [
+                            "pyproject.toml",
+                            {"path": "conf.py"},
+                            "constants.py",
+                        ],
+                    }
+                }
+            )
+        )
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_version_files(self):
+        files = versions.version_files(self.ctx, self.root)
+        self.assertEqual(
+            [path.name for path, pattern in files],
+            ["constants.py", "pyproject.toml", "conf.py"],
+        )
+        self.assertEqual(versions.read_version(*files[0]), "1.2.3")
+
+    def test_write(self):
+        files = versions.version_files(self.ctx, self.root)
+        os.chmod(str(self.root / "constants.py"), 0o644)
+        for path, pattern in files:
+            self.assertTrue(versions.write_version(path, pattern, "1.3.0"))
+        self.assertEqual(
+            (self.root / "constants.py").read_bytes(),
+            CONSTANTS.replace("1.2.3", "1.3.0").encode("utf-8"),
+        )
+        self.assertEqual(
+            os.stat(str(self.root / "constants.py")).st_mode & 0o777, 0o644
+        )
+        self.assertIn('version = "1.3.0"', (self.root / "pyproject.toml").read_text())
+        # only `release` is set
+        self.assertIn(
+            "version = '1.2'\nrelease = '1.3.0'", (self.root / "conf.py").read_text()
+        )
+
+    def test_unchanged(self):
+        path, pattern = versions.version_files(self.ctx, self.root)[1]
+        os.utime(str(path), (0, 0))
+        self.assertFalse(versions.write_version(path, pattern, "1.2.3"))
+        self.assertEqual(path.stat().st_mtime, 0)
+
+    def test_missing(self):
+        path, pattern = versions.version_files(self.ctx, self.root)[0]
+        path.write_text("name = 'example'\n")
+        self.assertIsNone(versions.read_version(path, pattern))
+        with self.assertRaises(ValueError):
+            versions.write_version(path, pattern, "1.3.0")
+
+    def test_update_all_or_nothing(self):
+        """A file missing its version stops any file being written"""
+        files = versions.version_files(self.ctx, self.root)
+        (self.root / "conf.py").write_text("project = 'Example'\n")
+        before = {path: path.read_bytes() for path, pattern in files}
+        with self.assertRaises(ValueError):
+            versions.update_versions(files, "1.3.0")
+        self.assertEqual({path: path.read_bytes() for path, pattern in files}, before)
+
+        (self.root / "conf.py").write_text(CONF)
+        changed = versions.update_versions(files, "1.3.0")
+        self.assertEqual([path.name for path in changed], [f.name for f, p in files])
+        self.assertEqual(versions.read_version(*files[0]), "1.3.0")
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import json
+import time
+from pathlib import Path
+
+from ._vendor import text
+
+
+class StageTimer:
+    """
+    Time each stage of a release.
+
+    Starting a stage prints its title, and ends the stage before it.
+    """
+
+    def __init__(self):
+        self.timings = []
+        self._current = None
+        self._start = None
+
+    def start(self, name):
+        """End the current stage (if any), and start timing `name`."""
+        self.stop()
+        text.subtitle(name)
+        self._current = name
+        self._start = time.perf_counter()
+
+    def stop(self):
+        """End the current stage."""
+        if self._current is not None:
+            self.timings.append((self._current, time.perf_counter() - self._start))
+            self._current = None
+
+    def total(self):
+        return sum(seconds for name, seconds in self.timings)
+
+    def report(self):
+        """Print how long each stage took."""
+        if not self.timings:
+            return
+        text.subtitle("Stage Timings")
+        width = max(len(name) for name, seconds in self.timings)
+        for name, seconds in self.timings:
+            print("{: <{}}  {: >8.2f}s".format(name, width, seconds))
+        print("{: <{}}  {: >8.2f}s".format("Total", width, self.total()))
+        print()
+
+    def save(self, filename):
+        """Save the timings as JSON, e.g. for benchmarking."""
+        Path(filename).write_text(
+            json.dumps(
+                {
+                    "stages": [
+                        {"name": name, "seconds": seconds}
+                        for name, seconds in self.timings
+                    ],
+                    "total": self.total(),
+                },
+                indent=2,
+            )
+        )
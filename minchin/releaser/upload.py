@@ -0,0 +1,118 @@
+import os
+import random
+import time
+
+from .constants import ERROR_COLOR, GOOD_COLOR, RESET_COLOR, WARNING_COLOR
+
+# how many times to try each upload, if not set by `releaser.upload_retries`
+UPLOAD_RETRIES = 5
+# the message for a file the server already has
+ALREADY_UPLOADED = "already uploaded"
+
+
+def _already_exists(response):
+    return response.status_code == 409 or (
+        response.status_code == 400
+        and "already exist" in (response.reason + response.text).lower()
+    )
+
+
+def upload_file(repository, package, retries=UPLOAD_RETRIES, backoff=1.0):
+    """
+    Upload one file, retrying if the server has trouble.
+
+    Server errors (5xx) and dropped connections are retried, after waiting
+    `backoff` seconds, doubled for each further try, with some jitter.
+    Anything else (including success) is final.
+
+    Returns
+    -------
+        tuple: (bool, str), whether the upload succeeded, and a description
+        of how it went.
+
+    """
+    import requests
+
+    for attempt in range(1, retries + 1):
+        try:
+            # `twine` makes `max_redirects` tries if the server errors (5xx);
+            # make just one, as we do our own retries, with a backoff
+            response = repository.upload(package, max_redirects=1)
+        except requests.ConnectionError as e:
+            problem = "connection failed ({})".format(e.__class__.__name__)
+        else:
+            if response.status_code == 200:
+                return True, "uploaded"
+            if _already_exists(response):
+                return False, ALREADY_UPLOADED
+            problem = "{} {}".format(response.status_code, response.reason)
+            if response.status_code < 500:
+                return False, problem
+        if attempt < retries:
+            time.sleep(backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+    return False, "{} (after {} tries)".format(problem, retries)
+
+
+def upload_distributions(
+    ctx, server, files, repository_url=None, assume_yes=False, backoff=1.0
+):
+    """
+    Upload `files` to `server`, all at once, over one connection pool.
+
+    Credentials come from ``TWINE_USERNAME`` and ``TWINE_PASSWORD``, your
+    ``.pypirc``, or your keyring, as for ``twine upload``. They're only asked
+    for (once, before anything is uploaded) if we're running interactively.
+
+    Args:
+        ctx (invoke.context):
+        server (str): the name of the server, as it appears in ``.pypirc``.
+        files (list): of Paths to upload.
+        repository_url (str): upload to this URL, rather than the one
+            ``.pypirc`` lists for `server`.
+        assume_yes (bool): whether ``--yes`` was given.
+        backoff (float): seconds to wait before retrying an upload.
+
+    Returns
+    -------
+        dict: of filename to a (bool, str) tuple: whether it uploaded, and
+        how it went (see `upload_file()`).
+
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from twine.package import PackageFile
+    from twine.settings import Settings
+
+    from .policy import is_interactive
+
+    settings = Settings(
+        repository_name=server,
+        repository_url=repository_url,
+        username=os.environ.get("TWINE_USERNAME", None),
+        password=os.environ.get("TWINE_PASSWORD", None),
+        non_interactive=not is_interactive(ctx, assume_yes),
+        disable_progress_bar=True,
+    )
+    retries = int(ctx.releaser.get("upload_retries", None) or UPLOAD_RETRIES)
+    packages = [PackageFile.from_filename(str(f), None) for f in files]
+
+    repository = settings.create_repository()
+    try:
+        with ThreadPoolExecutor(max_workers=max(len(packages), 1)) as executor:
+            results = list(
+                executor.map(
+                    lambda p: upload_file(repository, p, retries, backoff), packages
+                )
+            )
+    finally:
+        repository.close()
+
+    for package, (ok, message) in zip(packages, results):
+        if ok:
+            tag = "{}GOOD{}".format(GOOD_COLOR, RESET_COLOR)
+        elif message == ALREADY_UPLOADED:
+            tag = "{}WARN{}".format(WARNING_COLOR, RESET_COLOR)
+        else:
+            tag = "{}ERROR{}".format(ERROR_COLOR, RESET_COLOR)
+        print("[{}] {}: {}".format(tag, package.basefilename, message))
+    return {package.basefilename: result for package, result in zip(packages, results)}
@@ -1,4 +1,5 @@
 import os
+import re
 from pathlib import Path
 
 from .constants import ERROR_COLOR, RESET_COLOR, WARNING_COLOR
@@ -84,3 +85,8 @@ def check_existence(
                 "exist. For configuration key '{}', was "
                 "given: {}".format(ERROR_COLOR, RESET_COLOR, display_name, config_key, to_check)
             )
+
+
+def normalize_name(name):
+    """Normalize a package name, as per PEP 503."""
+    return re.sub(r"[-_.]+", "-", name).lower()
@@ -0,0 +1,289 @@
+import subprocess
+from pathlib import Path
+
+# Everything here talks to the `git` command line directly. It's faster than
+# building the equivalent GitPython objects, and means GitPython (which is
+# slow to import) is only loaded if we actually create a tag.
+
+
+def _git(directory, *args, config=(), stdin=None):
+    """Run a git command in `directory`, and return the CompletedProcess."""
+    cmd = ["git"]
+    for setting in config:
+        cmd.extend(["-c", setting])
+    cmd.extend(args)
+    return subprocess.run(
+        cmd, cwd=str(directory), input=stdin, capture_output=True, check=False
+    )
+
+
+def _speedups(root):
+    """
+    Determine which of git's status speed-ups to use.
+
+    The fsmonitor is used if the repo is configured for it (git does this on
+    its own). The untracked cache is turned on for this run, unless the repo
+    has explicitly turned it off.
+    """
+    result = _git(root, "config", "--get-regexp", r"^core\.(fsmonitor|untrackedcache)$")
+    settings = {}
+    for line in result.stdout.decode("utf-8", "replace").splitlines():
+        key, _, value = line.partition(" ")
+        settings[key.lower()] = value.strip().lower()
+
+    fsmonitor = settings.get("core.fsmonitor", "false") not in ["", "false", "0"]
+    config = []
+    untracked_cache = settings.get("core.untrackedcache", "true") not in [
+        "false",
+        "no",
+        "0",
+    ]
+    if untracked_cache and "core.untrackedcache" not in settings:
+        config.append("core.untrackedCache=true")
+    return fsmonitor, untracked_cache, config
+
+
+def scan_status(start_dir, untracked=True):
+    """
+    Scan the git repo containing `start_dir`, in one pass.
+
+    This collects everything later stages need to know about the repo (dirty
+    and untracked files, the current branch and commit), so the working tree
+    is only walked once. The result can be shared by everything released out
+    of the same repo. Tags are looked up as they are asked for (see
+    `has_tag()`), and the answers cached in the result.
+
+    Args:
+        start_dir (Path): any directory within the repo.
+        untracked (bool): also list untracked files.
+
+    Returns
+    -------
+        dict: with keys "root" (the repo's working tree, as a Path),
+        "dirty_paths" (tracked files with uncommitted changes, relative to
+        "root"), "untracked_paths", "branch" (None if detached), "commit",
+        "ahead", "behind", "fsmonitor", "untracked_cache", and "tags"; or None
+        if `start_dir` is not in a git repo (or git isn't installed).
+
+    """
+    try:
+        result = _git(start_dir, "rev-parse", "--show-toplevel")
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    if result.returncode != 0:
+        return None
+    root = Path(result.stdout.decode("utf-8").strip()).resolve()
+
+    fsmonitor, untracked_cache, config = _speedups(root)
+    result = _git(
+        root,
+        "status",
+        "--porcelain=v2",
+        "--branch",
+        "-z",
+        "--untracked-files={}".format("normal" if untracked else "no"),
+        config=config,
+    )
+    if result.returncode != 0:
+        return None
+
+    headers = {}
+    dirty_paths = []
+    untracked_paths = []
+    entries = iter(result.stdout.decode("utf-8", "surrogateescape").split("\0"))
+    for entry in entries:
+        if not entry:
+            continue
+        kind = entry[0]
+        if kind == "#":
+            key, _, value = entry[2:].partition(" ")
+            headers[key] = value
+        elif kind == "1":
+            dirty_paths.append(entry.split(" ", 8)[8])
+        elif kind == "2":
+            # renames and copies are followed by the original path
+            dirty_paths.append(entry.split(" ", 9)[9])
+            dirty_paths.append(next(entries, ""))
+        elif kind == "u":
+            dirty_paths.append(entry.split(" ", 10)[10])
+        elif kind == "?":
+            untracked_paths.append(entry[2:])
+
+    branch = headers.get("branch.head")
+    commit = headers.get("branch.oid")
+    ahead, behind = 0, 0
+    if "branch.ab" in headers:
+        ahead, behind = [abs(int(n)) for n in headers["branch.ab"].split()]
+
+    return {
+        "root": root,
+        "dirty_paths": dirty_paths,
+        "untracked_paths": untracked_paths,
+        "branch": None if branch == "(detached)" else branch,
+        "commit": None if commit == "(initial)" else commit,
+        "ahead": ahead,
+        "behind": behind,
+        "fsmonitor": fsmonitor,
+        "untracked_cache": untracked_cache,
+        "tags": {},
+    }
+
+
+def _below(paths, git_state, directory):
+    try:
+        relative = Path(directory).resolve().relative_to(git_state["root"])
+    except ValueError:
+        return []
+    prefix = relative.as_posix()
+    if prefix == ".":
+        return list(paths)
+    return [path for path in paths if path == prefix or path.startswith(prefix + "/")]
+
+
+def is_dirty_below(git_state, directory):
+    """Determine if any dirty path in `git_state` is within `directory`."""
+    return bool(_below(git_state["dirty_paths"], git_state, directory))
+
+
+def untracked_below(git_state, directory):
+    """Return the untracked paths in `git_state` within `directory`."""
+    return _below(git_state.get("untracked_paths", []), git_state, directory)
+
+
+def tracked_files(git_state, directories):
+    """
+    List the tracked files within `directories`, with git's hash of each.
+
+    The hashes are those of the files as staged; combine with
+    `git_state["dirty_paths"]` to find files that have changed since.
+
+    Returns
+    -------
+        dict: of paths (relative to the repo's root) to git's object hash.
+
+    """
+    pathspecs = []
+    for directory in directories:
+        try:
+            relative = Path(directory).resolve().relative_to(git_state["root"])
+        except ValueError:
+            continue
+        pathspecs.append(relative.as_posix())
+    if not pathspecs:
+        return {}
+
+    result = _git(git_state["root"], "ls-files", "--stage", "-z", "--", *pathspecs)
+    files = {}
+    for entry in result.stdout.decode("utf-8", "surrogateescape").split("\0"):
+        if not entry:
+            continue
+        info, _, path = entry.partition("\t")
+        files[path] = info.split(" ")[1]
+    return files
+
+
+def commit_timestamp(git_state):
+    """Return the time of the current commit (in seconds since the epoch), or None."""
+    if not git_state.get("commit"):
+        return None
+    result = _git(git_state["root"], "show", "-s", "--format=%ct", git_state["commit"])
+    if result.returncode != 0:
+        return None
+    return int(result.stdout.decode("utf-8").strip())
+
+
+def latest_tag(git_state, match=None):
+    """
+    Return the name of the most recent tag reachable from HEAD, or None.
+
+    If `match` (a glob pattern, e.g. "example-*") is given, only tags matching
+    it are considered.
+    """
+    args = ["describe", "--tags", "--abbrev=0"]
+    if match is not None:
+        args += ["--match", match]
+    result = _git(git_state["root"], *args, "HEAD")
+    if result.returncode != 0:
+        return None
+    return result.stdout.decode("utf-8").strip() or None
+
+
+def commits_since(git_state, tag=None, path=None):
+    """
+    List the commits since `tag` (or all of them, if `tag` is None).
+
+    Only the hashes are listed, which is quick even on long histories; use
+    `commit_messages()` to read the commits themselves. If `path` is below
+    the root of the repo (e.g. one package of several), only the commits
+    that change something in it are listed.
+
+    Returns
+    -------
+        list: of commit hashes, newest first. Merge commits are left out.
+
+    """
+    if not git_state.get("commit"):
+        return []
+    args = ["rev-list", "--no-merges", "{}..HEAD".format(tag) if tag else "HEAD"]
+    if path is not None:
+        path = Path(path).resolve()
+        if path != git_state["root"] and git_state["root"] in path.parents:
+            args += ["--", path.relative_to(git_state["root"]).as_posix()]
+    result = _git(git_state["root"], *args)
+    if result.returncode != 0:
+        return []
+    return result.stdout.decode("utf-8").split()
+
+
+def commit_messages(git_state, commits):
+    """
+    Read the messages of `commits`, in one call to git.
+
+    Returns
+    -------
+        dict: of commit hash to its (full) message.
+
+    """
+    if not commits:
+        return {}
+    result = _git(
+        git_state["root"],
+        "log",
+        "--no-walk=unsorted",
+        "--stdin",
+        "--format=%H%x00%B%x00",
+        stdin="\n".join(commits).encode("utf-8"),
+    )
+    fields = result.stdout.decode("utf-8", "replace").split("\0")
+    messages = {}
+    for sha, message in zip(fields[0::2], fields[1::2]):
+        messages[sha.strip()] = message.strip()
+    return messages
+
+
+def has_tag(git_state, name):
+    """
+    Determine if the tag `name` exists.
+
+    The tag's ref is looked up directly (rather than listing every tag), and
+    the answer is cached in `git_state`.
+    """
+    tags = git_state.setdefault("tags", {})
+    if name not in tags:
+        result = _git(
+            git_state["root"],
+            "rev-parse",
+            "--verify",
+            "--quiet",
+            "refs/tags/{}".format(name),
+        )
+        tags[name] = result.returncode == 0
+    return tags[name]
+
+
+def create_tag(git_state, name):
+    """Create the tag `name` at the current commit, and remember we did."""
+    import git  # packaged as 'gitpython'
+
+    git.Repo(str(git_state["root"])).create_tag(name)
+    git_state.setdefault("tags", {})[name] = True
@@ -77,6 +77,22 @@ def read_requirements(*parts):
     return requirements
 
 
+def merge_requirements(requirements, vendored_packages):
+    """
+    Combine requirements into a sorted list.
+
+    Duplicates are removed, as are the requirements for packages that are
+    vendorized themselves.
+
+    Args:
+        requirements (list): requirements, one per item.
+        vendored_packages (tuple): names of the vendorized packages.
+    """
+    return sorted(
+        i for i in set(requirements) if not i.startswith(tuple(vendored_packages))
+    )
+
+
 @task
 def vendorize(ctx, PACKAGES=None, dest_dir=None, internal_call=False):
     """Vendor-ize packages."""
@@ -178,9 +194,7 @@ def vendorize(ctx, PACKAGES=None, dest_dir=None, internal_call=False):
 
     text.subtitle("Building requirements-vendor.in")
     # remove vendorized items from requirements list
-    my_req_add = [i for i in set(my_req_add) if not i.startswith(PACKAGES)]
-    my_req_add.sort()
-    my_req.extend(my_req_add)
+    my_req.extend(merge_requirements(my_req_add, PACKAGES))
 
     # write out requirements file
     dst_req = here / "requirements-vendor.in"
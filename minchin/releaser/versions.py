@@ -0,0 +1,184 @@
+import re
+from pathlib import Path
+
+from .cache import replace_with
+from .constants import ERROR_COLOR, RESET_COLOR
+
+# The version number is read from `releaser.version` (the ``__version__ =
+# "..."`` line), and written there and to any other files listed under
+# `releaser.version_files`. Each file is read once, and (only if the version
+# in it changes) written once, to a temporary file that is then moved over
+# the original. Nothing is written until every file has been checked for its
+# version. Files already showing the new version aren't touched, so their
+# modification times (and anything cached on them) are left alone.
+
+# the version is the group named "version"
+PYTHON_PATTERN = r"^__version__ = [\"\']{1,3}(?P<version>[\.\dA-Za-z+-]*)[\"\']{1,3}"
+# default patterns, by file name (or, failing that, suffix)
+VERSION_PATTERNS = {
+    "setup.cfg": r"^version\s*=\s*(?P<version>\d[\.\dA-Za-z+-]*)\s*$",
+    "pyproject.toml": r"^version\s*=\s*[\"\'](?P<version>[\.\dA-Za-z+-]*)[\"\']",
+    "conf.py": r"^release\s*=\s*[\"\'](?P<version>[\.\dA-Za-z+-]*)[\"\']",
+    ".py": PYTHON_PATTERN,
+}
+
+
+def default_pattern(path):
+    """Return the default pattern for the file `path`, or None."""
+    path = Path(path)
+    return VERSION_PATTERNS.get(path.name, VERSION_PATTERNS.get(path.suffix, None))
+
+
+def version_files(ctx, here):
+    """
+    List the files to write the version number to, and how to find it.
+
+    This is `releaser.version`, and then each of `releaser.version_files`.
+    Each of the latter is a path (relative to `here`), or a mapping with the
+    keys "path" and (optionally) "pattern": a regular expression matching
+    the version, as the group named "version".
+
+    Returns
+    -------
+        list: of (Path, compiled pattern) tuples.
+
+    """
+    entries = [{"path": ctx.releaser.version, "pattern": PYTHON_PATTERN}]
+    extra = ctx.releaser.get("version_files", None) or []
+    if isinstance(extra, (str, dict)):
+        extra = [extra]
+    for entry in extra:
+        entries.append(entry if isinstance(entry, dict) else {"path": entry})
+
+    files = []
+    for entry in entries:
+        path = (here / entry["path"]).resolve()
+        pattern = entry.get("pattern", None) or default_pattern(path)
+        if pattern is None:
+            exit(
+                "[{}ERROR{}] no version pattern given for {} (under "
+                "'releaser.version_files').".format(ERROR_COLOR, RESET_COLOR, path)
+            )
+        pattern = re.compile(pattern, re.MULTILINE)
+        if "version" not in pattern.groupindex:
+            exit(
+                "[{}ERROR{}] the version pattern for {} needs a group named "
+                "'version'.".format(ERROR_COLOR, RESET_COLOR, path)
+            )
+        if path not in [f for f, p in files]:
+            files.append((path, pattern))
+    return files
+
+
+def read_text(path):
+    """Read `path`, keeping its line endings as they are."""
+    with Path(path).open(mode="r", encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def read_version(path, pattern, content=None):
+    """
+    Find the version string in the file `path`.
+
+    Args:
+        content (str): the text of `path`, if it has already been read.
+
+    Returns
+    -------
+        str: the version, as written, or None if `pattern` isn't found.
+
+    """
+    if content is None:
+        content = read_text(path)
+    match = pattern.search(content)
+    return match.group("version") if match else None
+
+
+def set_version(path, pattern, version, content=None):
+    """
+    Set the (first) version string in the text of `path` to `version`.
+
+    Nothing is written; see `write_version()` and `update_versions()`.
+
+    Args:
+        content (str): the text of `path`, if it has already been read.
+
+    Returns
+    -------
+        str: the new text, or None if it already shows `version`.
+
+    Raises
+    ------
+        ValueError: if `pattern` isn't found in the file.
+
+    """
+    if content is None:
+        content = read_text(path)
+    match = pattern.search(content)
+    if match is None:
+        raise ValueError("can't find the version in {}".format(path))
+    start, end = match.span("version")
+    if content[start:end] == str(version):
+        return None
+    return content[:start] + str(version) + content[end:]
+
+
+def _write(path, content):
+    def write(temp_name):
+        with open(temp_name, mode="w", encoding="utf-8", newline="") as f:
+            f.write(content)
+
+    replace_with(path, write)
+
+
+def write_version(path, pattern, version, content=None):
+    """
+    Set the (first) version string in `path` to `version`.
+
+    Returns
+    -------
+        bool: whether the file was changed. It isn't written to if it already
+        shows `version`.
+
+    Raises
+    ------
+        ValueError: if `pattern` isn't found in the file.
+
+    """
+    new_content = set_version(path, pattern, version, content)
+    if new_content is None:
+        return False
+    _write(path, new_content)
+    return True
+
+
+def update_versions(files, version, contents=None):
+    """
+    Set the version string in each of `files` to `version`.
+
+    Every file is checked (and its new text worked out) before any is
+    written, so a file missing its version leaves them all untouched.
+
+    Args:
+        files (list): of (Path, compiled pattern) tuples, as from
+            `version_files()`.
+        contents (dict): the text of any of the files already read, by path.
+
+    Returns
+    -------
+        list: of the paths that were changed.
+
+    Raises
+    ------
+        ValueError: if the version isn't found in one of the files.
+
+    """
+    contents = contents or {}
+    updates = []
+    for path, pattern in files:
+        new_content = set_version(path, pattern, version, contents.get(path, None))
+        if new_content is not None:
+            updates.append((path, new_content))
+    for path, new_content in updates:
+        _write(path, new_content)
+    return [path for path, new_content in updates]
@@ -49,7 +49,7 @@ INSTALL_REQUIRES = [
     "invoke >= 2.0.0",  # min. needed to support Python 3.11
     "isort >= 5",
     "semantic_version",
-    "twine >= 1.11.0",
+    "twine >= 3.0.0",
     "wheel >= 0.38.1",
     # for pyproject.toml projects (i.e. without a `setup.py`)
     "build",